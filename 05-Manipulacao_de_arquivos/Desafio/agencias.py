@@ -0,0 +1,291 @@
+"""
+Particionamento das contas por agência.
+
+Cada agência possui seu próprio repositório de contas, seu próprio alocador de
+números e seu próprio arquivo de snapshot. Assim, listagens e rotinas noturnas
+de uma agência tocam apenas os dados dela, e as agências podem ser processadas
+em paralelo, uma por processo.
+"""
+import json
+import os
+from pathlib import Path
+
+from alocador_contas import TAMANHO_BLOCO_PADRAO, AlocadorNumeroConta
+from fusos import definir_fuso_agencia, fuso_agencia
+
+ROOT_PATH = Path(__file__).parent
+DIRETORIO_AGENCIAS = ROOT_PATH / "agencias"
+# Versão do formato dos snapshots: a 2 grava o hash de cada transação; os
+# snapshots sem versão são anteriores à cadeia de hashes.
+VERSAO_SNAPSHOT = 2
+# Clientes do banco, gravados ao lado dos snapshots das agências.
+ARQUIVO_CLIENTES = "clientes.json"
+
+
+def codigo_agencia_valido(codigo):
+    """
+    Verifica se o código de agência possui exatamente quatro dígitos.
+
+    Args:
+        codigo (str): Código da agência.
+
+    Returns:
+        bool: True se o código for válido.
+    """
+    return len(codigo) == 4 and codigo.isdigit()
+
+
+class Agencia:
+    """
+    Repositório das contas de uma única agência.
+
+    Atributos:
+        codigo (str): Código da agência (quatro dígitos).
+        diretorio (Path): Diretório dos arquivos da agência.
+        alocador (AlocadorNumeroConta): Alocador de números da agência.
+        contas (dict): Contas da agência indexadas pelo número.
+        fuso (str): Fuso horário da agência (nome IANA), que define o dia
+        local do limite diário e do extrato.
+    """
+
+    def __init__(self, codigo, diretorio=DIRETORIO_AGENCIAS,
+                 tamanho_bloco=TAMANHO_BLOCO_PADRAO, fuso=None):
+        if not codigo_agencia_valido(codigo):
+            raise ValueError(f"Código de agência inválido: {codigo!r}")
+
+        self.codigo = codigo
+        self.diretorio = Path(diretorio)
+        self.diretorio.mkdir(parents=True, exist_ok=True)
+        self.alocador = AlocadorNumeroConta(
+            self.diretorio / f"{codigo}.dat", tamanho_bloco)
+        self.contas: dict = {}
+        if fuso:
+            definir_fuso_agencia(codigo, fuso)
+
+    @property
+    def fuso(self):
+        """
+        Retorna o fuso horário da agência.
+
+        Returns:
+            str: Nome IANA do fuso.
+        """
+        return fuso_agencia(self.codigo)
+
+    def __len__(self):
+        return len(self.contas)
+
+    def __iter__(self):
+        return iter(self.contas.values())
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__}: ('{self.codigo}', {len(self)})>"
+
+    @property
+    def caminho_snapshot(self):
+        """
+        Retorna o caminho do snapshot da agência.
+
+        Returns:
+            Path: Arquivo JSON com as contas da agência.
+        """
+        return self.diretorio / f"{self.codigo}.json"
+
+    def abrir_conta(self, cliente, classe_conta):
+        """
+        Abre uma nova conta na agência com o próximo número disponível.
+
+        Args:
+            cliente (Cliente): Titular da conta.
+            classe_conta (type): Classe da conta (por exemplo,
+            ContaCorrente).
+
+        Returns:
+            Conta: Conta criada e registrada na agência.
+        """
+        numero = self.alocador.proximo_numero()
+        conta = classe_conta.nova_conta(
+            cliente=cliente, numero=numero, agencia=self.codigo)
+        self.contas[numero] = conta
+        return conta
+
+    def buscar_conta(self, numero):
+        """
+        Localiza uma conta da agência pelo número.
+
+        Args:
+            numero (int): Número da conta.
+
+        Returns:
+            Conta | None: Conta encontrada ou None.
+        """
+        return self.contas.get(numero)
+
+    def snapshot(self):
+        """
+        Grava o estado de todas as contas da agência em disco.
+
+        Returns:
+            Path: Caminho do snapshot gravado.
+        """
+        dados = {
+            "versao": VERSAO_SNAPSHOT,
+            "agencia": self.codigo,
+            "fuso": self.fuso,
+            "contas": [conta.para_dict() for conta in self],
+        }
+        return _gravar_json(self.caminho_snapshot, dados)
+
+    @classmethod
+    def carregar(cls, codigo, clientes_por_cpf, classe_conta,
+                 diretorio=DIRETORIO_AGENCIAS):
+        """
+        Recria uma agência a partir do seu snapshot.
+
+        Args:
+            codigo (str): Código da agência.
+            clientes_por_cpf (dict): Clientes indexados pelo CPF.
+            classe_conta (type): Classe usada para recriar as contas.
+            diretorio (Path): Diretório dos arquivos das agências.
+
+        Returns:
+            Agencia: Agência com as contas restauradas.
+        """
+        dados = carregar_snapshot(Path(diretorio) / f"{codigo}.json")
+        agencia = cls(codigo, diretorio, fuso=dados.get("fuso"))
+        # Só os snapshots sem versão têm as transações encadeadas ao serem
+        # carregados; nos demais, um hash ausente é uma adulteração.
+        legado = dados.get("versao", 1) < VERSAO_SNAPSHOT
+
+        for dados_conta in dados["contas"]:
+            cliente = clientes_por_cpf[dados_conta["cpf"]]
+            conta = classe_conta.de_dict(dados_conta, cliente, legado)
+            agencia.contas[conta.numero] = conta
+            cliente.adicionar_conta(conta)
+
+        return agencia
+
+
+def _gravar_json(caminho, dados):
+    # Grava em um arquivo temporário e o renomeia: quem lê o arquivo nunca
+    # o encontra pela metade.
+    temporario = caminho.with_suffix(f".{os.getpid()}.tmp")
+    with open(temporario, "w", encoding="utf-8") as arquivo:
+        json.dump(dados, arquivo, ensure_ascii=False)
+    os.replace(temporario, caminho)
+    return caminho
+
+
+def gravar_clientes(clientes, diretorio=DIRETORIO_AGENCIAS):
+    """
+    Grava os dados dos clientes (as contas ficam nos snapshots das
+    agências).
+
+    Args:
+        clientes (iterable): Dados de cada cliente (dict).
+        diretorio (Path): Diretório dos arquivos das agências.
+
+    Returns:
+        Path: Caminho do arquivo gravado.
+    """
+    diretorio = Path(diretorio)
+    diretorio.mkdir(parents=True, exist_ok=True)
+    return _gravar_json(diretorio / ARQUIVO_CLIENTES, list(clientes))
+
+
+def carregar_clientes(diretorio=DIRETORIO_AGENCIAS):
+    """
+    Lê os dados dos clientes gravados por `gravar_clientes`.
+
+    Args:
+        diretorio (Path): Diretório dos arquivos das agências.
+
+    Returns:
+        list: Dados de cada cliente (dict); vazia se nada foi gravado.
+    """
+    caminho = Path(diretorio) / ARQUIVO_CLIENTES
+    if not caminho.exists():
+        return []
+    with open(caminho, "r", encoding="utf-8") as arquivo:
+        return json.load(arquivo)
+
+
+def codigos_gravados(diretorio=DIRETORIO_AGENCIAS):
+    """
+    Lista as agências que possuem snapshot.
+
+    Args:
+        diretorio (Path): Diretório dos arquivos das agências.
+
+    Returns:
+        list: Códigos das agências, em ordem crescente.
+    """
+    return sorted(caminho.stem for caminho in Path(diretorio).glob("*.json")
+                  if codigo_agencia_valido(caminho.stem))
+
+
+def carregar_snapshot(caminho):
+    """
+    Lê o snapshot de uma agência sem recriar os objetos de domínio.
+
+    Args:
+        caminho (Path): Arquivo JSON da agência.
+
+    Returns:
+        dict: Dados da agência, com a chave "contas".
+    """
+    with open(caminho, "r", encoding="utf-8") as arquivo:
+        return json.load(arquivo)
+
+
+def resumir_agencia(dados):
+    """
+    Rotina de exemplo: totaliza contas, saldos e transações de uma agência.
+
+    Args:
+        dados (dict): Snapshot da agência.
+
+    Returns:
+        dict: Resumo da agência.
+    """
+    return {
+        "agencia": dados["agencia"],
+        "contas": len(dados["contas"]),
+        "saldo_total": sum(conta["saldo"] for conta in dados["contas"]),
+        "transacoes": sum(
+            len(conta["transacoes"]) for conta in dados["contas"]),
+    }
+
+
+def _executar_em_agencia(funcao, caminho):
+    return funcao(carregar_snapshot(caminho))
+
+
+def processar_agencias(funcao, codigos, diretorio=DIRETORIO_AGENCIAS,
+                       max_workers=None):
+    """
+    Aplica uma rotina ao snapshot de cada agência, em processos separados.
+
+    Args:
+        funcao (function): Função de nível de módulo que recebe o snapshot de
+        uma agência (dict) e retorna o resultado da rotina.
+        codigos (list): Códigos das agências a processar.
+        diretorio (Path): Diretório dos snapshots.
+        max_workers (int, optional): Número de processos. Se None, usa o
+        número de núcleos disponíveis.
+
+    Returns:
+        dict: Resultado da rotina indexado pelo código da agência.
+    """
+    # Importado aqui: o pool de processos só é usado pelas rotinas em lote e
+    # pesa na inicialização do menu.
+    # pylint: disable-next=import-outside-toplevel
+    from concurrent.futures import ProcessPoolExecutor
+
+    diretorio = Path(diretorio)
+    caminhos = [diretorio / f"{codigo}.json" for codigo in codigos]
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        resultados = executor.map(
+            _executar_em_agencia, [funcao] * len(caminhos), caminhos)
+        return dict(zip(codigos, resultados))
@@ -0,0 +1,143 @@
+"""
+Alocador de números de conta.
+
+Substitui o cálculo ``len(contas) + 1`` por um contador monotônico
+persistido em disco (marca d'água). Cada processo reserva um bloco de números
+de uma só vez, de modo que vários processos criando contas em paralelo só
+disputam o arquivo de controle uma vez a cada ``tamanho_bloco`` contas.
+"""
+import os
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+ROOT_PATH = Path(__file__).parent
+
+TAMANHO_BLOCO_PADRAO = 100
+PESOS_MODULO_11 = (2, 3, 4, 5, 6, 7, 8, 9)
+
+
+def calcular_digito_verificador(valor):
+    """
+    Calcula o dígito verificador (módulo 11) de uma agência ou conta.
+
+    Os dígitos são multiplicados, da direita para a esquerda, pelos pesos
+    2 a 9 (repetindo o ciclo). O dígito é 11 menos o resto da soma por 11,
+    sendo 10 representado por "X" e 11 por "0".
+
+    Args:
+        valor (int | str): Número da agência ou da conta.
+
+    Returns:
+        str: Dígito verificador.
+    """
+    digitos = str(valor)
+    soma = 0
+    for posicao, digito in enumerate(reversed(digitos)):
+        soma += int(digito) * PESOS_MODULO_11[posicao % len(PESOS_MODULO_11)]
+
+    digito = 11 - soma % 11
+    if digito == 10:
+        return "X"
+    if digito == 11:
+        return "0"
+    return str(digito)
+
+
+@contextmanager
+def _trava_arquivo(caminho):
+    """
+    Trava exclusiva entre processos sobre o arquivo informado.
+    """
+    with open(caminho, "a+b") as arquivo:
+        if fcntl:
+            fcntl.flock(arquivo.fileno(), fcntl.LOCK_EX)
+        else:
+            arquivo.seek(0)
+            msvcrt.locking(arquivo.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(arquivo.fileno(), fcntl.LOCK_UN)
+            else:
+                arquivo.seek(0)
+                msvcrt.locking(arquivo.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class AlocadorNumeroConta:
+    """
+    Distribui números de conta únicos a partir de uma marca d'água persistida.
+
+    A marca d'água guarda o último número já reservado. Ao esgotar o bloco
+    local, o alocador trava o arquivo, avança a marca em ``tamanho_bloco`` e
+    passa a distribuir os números do novo bloco sem tocar no disco. Números
+    de um bloco não utilizado até o fim do processo são descartados: a
+    sequência pode ter lacunas, mas nunca repete um número.
+
+    Atributos:
+        caminho (Path): Arquivo onde a marca d'água é persistida.
+        tamanho_bloco (int): Quantidade de números reservados por vez.
+    """
+
+    def __init__(self, caminho=ROOT_PATH / "numero_conta.dat",
+                 tamanho_bloco=TAMANHO_BLOCO_PADRAO):
+        if tamanho_bloco < 1:
+            raise ValueError("O tamanho do bloco deve ser maior que zero.")
+
+        self.caminho = Path(caminho)
+        self.tamanho_bloco = tamanho_bloco
+        self._proximo = 0
+        self._limite = 0
+        self._pid = os.getpid()
+
+    @property
+    def marca_dagua(self):
+        """
+        Retorna o último número reservado por qualquer processo.
+
+        Returns:
+            int: Marca d'água persistida (0 se nenhuma conta foi criada).
+        """
+        try:
+            return int(self.caminho.read_text(encoding="utf-8").strip() or 0)
+        except FileNotFoundError:
+            return 0
+
+    def proximo_numero(self):
+        """
+        Retorna o próximo número de conta disponível.
+
+        Returns:
+            int: Número de conta ainda não distribuído.
+        """
+        if os.getpid() != self._pid:
+            # Processo filho (fork) não pode reaproveitar o bloco do pai.
+            self._pid = os.getpid()
+            self._proximo = self._limite = 0
+
+        if self._proximo >= self._limite:
+            self._reservar_bloco()
+
+        numero = self._proximo
+        self._proximo += 1
+        return numero
+
+    def _reservar_bloco(self):
+        """
+        Avança a marca d'água em disco e reserva o bloco para este processo.
+        """
+        with _trava_arquivo(self.caminho.with_suffix(".lock")):
+            marca = self.marca_dagua
+            nova_marca = marca + self.tamanho_bloco
+            temporario = self.caminho.with_suffix(f".{self._pid}.tmp")
+            temporario.write_text(str(nova_marca), encoding="utf-8")
+            os.replace(temporario, self.caminho)
+
+        self._proximo = marca + 1
+        self._limite = nova_marca + 1
@@ -0,0 +1,270 @@
+"""
+Barramento de eventos das transações registradas.
+
+`BarramentoEventos` é um observador de `Transacao.observadores_registro`:
+cada saque ou depósito registrado vira um `EventoTransacao`, entregue a
+todos os assinantes. Cada assinante tem sua própria thread e sua própria
+fila limitada; a publicação só acrescenta o evento às filas, de modo que um
+assinante lento não atrasa o registro das transações.
+
+Quando a fila de um assinante está cheia, vale a política escolhida por ele:
+
+    DESCARTAR_NOVOS    o evento publicado é descartado;
+    DESCARTAR_ANTIGOS  o evento mais antigo da fila é descartado;
+    BLOQUEAR           a publicação espera até `espera_maxima` segundos por
+                       espaço (contrapressão) e, esgotado o prazo, descarta
+                       o evento.
+
+Os descartes e as falhas de cada assinante são contados.
+
+Exemplo:
+
+    barramento = BarramentoEventos()
+    barramento.assinar("diario", gravar_evento, politica=DESCARTAR_ANTIGOS)
+    Transacao.observadores_registro.append(barramento)
+    ...
+    barramento.encerrar()
+"""
+import threading
+from collections import deque
+
+DESCARTAR_NOVOS = "descartar_novos"
+DESCARTAR_ANTIGOS = "descartar_antigos"
+BLOQUEAR = "bloquear"
+POLITICAS = (DESCARTAR_NOVOS, DESCARTAR_ANTIGOS, BLOQUEAR)
+
+CAPACIDADE_PADRAO = 1024
+ESPERA_MAXIMA_PADRAO = 0.05
+# Intervalo máximo de espera da thread do assinante com a fila vazia.
+INTERVALO_ESPERA_S = 0.5
+
+
+class EventoTransacao:
+    """
+    Transação registrada, publicada no barramento.
+
+    Atributos:
+        sequencia (int): Número do evento no barramento.
+        tipo (str): Nome da classe da transação ("Deposito" ou "Saque").
+        valor (float | int): Valor da transação.
+        agencia (str): Agência da conta.
+        numero (int): Número da conta.
+        instante (float): Instante UTC do registro.
+    """
+    __slots__ = ("sequencia", "tipo", "valor", "agencia", "numero",
+                 "instante")
+
+    def __init__(self, sequencia, tipo, valor, agencia, numero, instante):
+        self.sequencia = sequencia
+        self.tipo = tipo
+        self.valor = valor
+        self.agencia = agencia
+        self.numero = numero
+        self.instante = instante
+
+    def __repr__(self) -> str:
+        return (f"<{self.__class__.__name__}: ({self.sequencia}, "
+                f"'{self.tipo}', {self.valor}, '{self.agencia}', "
+                f"{self.numero}, {self.instante})>")
+
+
+class Assinante:
+    """
+    Assinante do barramento, com fila limitada e thread própria.
+
+    Atributos:
+        nome (str): Nome do assinante.
+        funcao (function): Função chamada com cada evento, na thread do
+        assinante.
+        capacidade (int): Tamanho máximo da fila.
+        politica (str): Política com a fila cheia (uma de POLITICAS).
+        espera_maxima (float): Espera máxima da política BLOQUEAR, em
+        segundos.
+        entregues (int): Eventos aceitos na fila.
+        processados (int): Eventos processados pela função.
+        descartados (int): Eventos descartados pela política.
+        falhas (int): Eventos cuja função levantou exceção.
+    """
+
+    def __init__(self, nome, funcao, capacidade=CAPACIDADE_PADRAO,
+                 politica=DESCARTAR_NOVOS,
+                 espera_maxima=ESPERA_MAXIMA_PADRAO):
+        if politica not in POLITICAS:
+            raise ValueError(f"Política inválida: {politica!r}")
+
+        self.nome = nome
+        self.funcao = funcao
+        self.capacidade = capacidade
+        self.politica = politica
+        self.espera_maxima = espera_maxima
+        self.entregues = 0
+        self.processados = 0
+        self.descartados = 0
+        self.falhas = 0
+
+        self._fila: deque = deque()
+        # Os sinais só são acionados quando o outro lado está esperando:
+        # no caso comum, publicar é apenas um append na fila.
+        self._evento_disponivel = threading.Event()
+        self._consumidor_esperando = False
+        self._espaco_disponivel = threading.Event()
+        self._produtor_esperando = False
+        self._encerrando = False
+        self._thread = threading.Thread(
+            target=self._consumir, name=f"assinante-{nome}", daemon=True)
+        self._thread.start()
+
+    def __repr__(self) -> str:
+        return (f"<{self.__class__.__name__}: ('{self.nome}', "
+                f"{len(self._fila)}/{self.capacidade})>")
+
+    def entregar(self, evento):
+        """
+        Acrescenta um evento à fila, aplicando a política se ela estiver
+        cheia.
+
+        Args:
+            evento (EventoTransacao): Evento publicado.
+
+        Returns:
+            bool: True se o evento entrou na fila.
+        """
+        fila = self._fila
+        if len(fila) >= self.capacidade and not self._abrir_espaco():
+            self.descartados += 1
+            return False
+
+        fila.append(evento)
+        self.entregues += 1
+        if self._consumidor_esperando:
+            self._evento_disponivel.set()
+        return True
+
+    def _abrir_espaco(self):
+        fila = self._fila
+        if self.politica == DESCARTAR_ANTIGOS:
+            try:
+                fila.popleft()
+            except IndexError:  # esvaziada pelo consumidor
+                pass
+            else:
+                self.descartados += 1
+            return True
+
+        if self.politica == BLOQUEAR:
+            self._produtor_esperando = True
+            self._espaco_disponivel.clear()
+            if len(fila) >= self.capacidade:
+                self._espaco_disponivel.wait(self.espera_maxima)
+            self._produtor_esperando = False
+            return len(fila) < self.capacidade
+
+        return False
+
+    def _consumir(self):
+        fila = self._fila
+        while True:
+            try:
+                evento = fila.popleft()
+            except IndexError:
+                if self._encerrando:
+                    return
+                self._consumidor_esperando = True
+                self._evento_disponivel.clear()
+                if not fila and not self._encerrando:
+                    self._evento_disponivel.wait(INTERVALO_ESPERA_S)
+                self._consumidor_esperando = False
+                continue
+
+            if self._produtor_esperando:
+                self._espaco_disponivel.set()
+            try:
+                self.funcao(evento)
+            except Exception:  # pylint: disable=broad-exception-caught
+                self.falhas += 1
+            self.processados += 1
+
+    def encerrar(self, timeout=None):
+        """
+        Processa os eventos restantes na fila e encerra a thread.
+
+        Args:
+            timeout (float, optional): Espera máxima, em segundos.
+        """
+        self._encerrando = True
+        self._evento_disponivel.set()
+        self._thread.join(timeout)
+
+    def estatisticas(self):
+        """
+        Retorna os contadores do assinante.
+
+        Returns:
+            dict: Eventos na fila, entregues, processados, descartados e
+            falhas.
+        """
+        return {
+            "na_fila": len(self._fila),
+            "entregues": self.entregues,
+            "processados": self.processados,
+            "descartados": self.descartados,
+            "falhas": self.falhas,
+        }
+
+
+class BarramentoEventos:
+    """
+    Publica as transações registradas para os assinantes.
+
+    Atributos:
+        assinantes (list): Assinantes registrados.
+        publicados (int): Eventos publicados.
+    """
+
+    def __init__(self):
+        self.assinantes: list = []
+        self.publicados = 0
+
+    def assinar(self, nome, funcao, **opcoes):
+        """
+        Registra um assinante.
+
+        Args:
+            nome (str): Nome do assinante.
+            funcao (function): Função chamada com cada evento, na thread do
+            assinante.
+            **opcoes: capacidade, politica e espera_maxima do Assinante.
+
+        Returns:
+            Assinante: Assinante registrado.
+        """
+        assinante = Assinante(nome, funcao, **opcoes)
+        self.assinantes.append(assinante)
+        return assinante
+
+    def publicar(self, evento):
+        """
+        Entrega um evento a todos os assinantes.
+
+        Args:
+            evento (EventoTransacao): Evento a publicar.
+        """
+        self.publicados += 1
+        for assinante in self.assinantes:
+            assinante.entregar(evento)
+
+    def __call__(self, conta, transacao, instante):
+        self.publicar(EventoTransacao(
+            self.publicados, transacao.__class__.__name__, transacao.valor,
+            conta.agencia, conta.numero, instante))
+
+    def encerrar(self, timeout=None):
+        """
+        Encerra todos os assinantes, depois de processarem as suas filas.
+
+        Args:
+            timeout (float, optional): Espera máxima por assinante, em
+            segundos.
+        """
+        for assinante in self.assinantes:
+            assinante.encerrar(timeout)
@@ -0,0 +1,226 @@
+"""
+Cadeia de hashes do histórico das contas, para auditoria.
+
+Cada transação do histórico guarda, em "hash", o SHA-256 (em hexadecimal)
+do hash da transação anterior, do tipo, do valor e do instante; a primeira
+transação encadeia a partir de HASH_INICIAL. O hash é calculado uma única
+vez, quando a transação é acrescentada (`Historico.adicionar_transacao`).
+Alterar, remover ou inserir uma transação quebra o elo dela e, sem refazer
+todos os hashes seguintes, a cadeia inteira.
+
+`verificar_contas` recalcula as cadeias de todas as contas: com o método
+"fork" disponível e o processo sem outras threads, as contas são divididas
+em blocos verificados em paralelo, um por processo. Para cada conta
+adulterada, é informado o primeiro elo quebrado.
+
+Exemplo:
+
+    resultado = verificar_contas(contas)
+    print(formatar_verificacao(resultado))
+
+Uso:
+    python cadeia_hash.py --clientes 10000 --transacoes 1000000
+"""
+import hashlib
+import struct
+import threading
+import time
+
+from colorama import Fore, Style  # type: ignore
+
+HASH_INICIAL = "0" * 64
+# Valor e instante, como doubles little-endian (exatos para os floats do
+# histórico e bem mais baratos que formatá-los em texto).
+VALOR_INSTANTE = struct.Struct("<dd")
+# Blocos de contas por processo: blocos menores equilibram melhor a carga
+# quando os históricos têm tamanhos muito diferentes.
+BLOCOS_POR_PROCESSO = 4
+
+# Contas em verificação, lidas pelos processos filhos (herdadas no fork).
+_contas: list = []
+
+
+def calcular_hash(anterior, tipo, valor, instante):
+    """
+    Calcula o hash de uma transação encadeada à anterior.
+
+    A mensagem é o hash anterior (64 caracteres hexadecimais), o tipo e o
+    valor e o instante em VALOR_INSTANTE; como o hash anterior e o final
+    têm tamanho fixo, as partes não se confundem.
+
+    Args:
+        anterior (str): Hash da transação anterior (ou HASH_INICIAL).
+        tipo (str): Tipo da transação.
+        valor (float | int): Valor da transação.
+        instante (float): Instante UTC da transação.
+
+    Returns:
+        str: SHA-256 em hexadecimal.
+    """
+    return hashlib.sha256(anterior.encode() + tipo.encode()
+                          + VALOR_INSTANTE.pack(valor, instante)).hexdigest()
+
+
+def primeiro_elo_quebrado(transacoes):
+    """
+    Recalcula a cadeia de um histórico.
+
+    Args:
+        transacoes (list): Transações do histórico, em ordem.
+
+    Returns:
+        int | None: Posição da primeira transação cujo hash não confere, ou
+        None se a cadeia estiver íntegra.
+    """
+    sha256 = hashlib.sha256
+    empacotar = VALOR_INSTANTE.pack
+    anterior = HASH_INICIAL
+    for posicao, transacao in enumerate(transacoes):
+        esperado = sha256(
+            anterior.encode() + transacao["tipo"].encode()
+            + empacotar(transacao["valor"], transacao["instante"])
+        ).hexdigest()
+        if transacao.get("hash") != esperado:
+            return posicao
+        anterior = esperado
+    return None
+
+
+def _verificar_bloco(inicio, fim):
+    quebras = []
+    entradas = 0
+    for indice in range(inicio, fim):
+        transacoes = _contas[indice].historico.transacoes
+        entradas += len(transacoes)
+        posicao = primeiro_elo_quebrado(transacoes)
+        if posicao is not None:
+            quebras.append((indice, posicao))
+    return quebras, entradas
+
+
+def verificar_contas(contas, max_workers=None, paralelo=True):
+    """
+    Verifica as cadeias de hashes dos históricos das contas.
+
+    Args:
+        contas (iterable): Contas a verificar.
+        max_workers (int, optional): Número de processos. Se None, usa o
+        número de núcleos disponíveis.
+        paralelo (bool): Se False, verifica no próprio processo (também o
+        caso quando há outras threads em execução).
+
+    Returns:
+        dict: "quebras" (primeiro elo quebrado de cada conta adulterada, na
+        ordem das contas), "entradas" verificadas, "segundos" e
+        "entradas_por_s".
+    """
+    # Importado aqui: o histórico usa `calcular_hash` a cada transação e
+    # este módulo é carregado na inicialização do menu.
+    # pylint: disable-next=import-outside-toplevel
+    import multiprocessing
+
+    _contas[:] = contas
+    processos = max_workers or multiprocessing.cpu_count()
+    tamanho = max(1, -(-len(_contas) // (processos * BLOCOS_POR_PROCESSO)))
+    inicios = list(range(0, len(_contas), tamanho))
+    fins = [min(inicio + tamanho, len(_contas)) for inicio in inicios]
+
+    inicio = time.perf_counter()
+    try:
+        # O fork só é seguro em um processo sem outras threads (como no
+        # fechamento do dia).
+        if (paralelo and len(inicios) > 1
+                and threading.active_count() == 1
+                and "fork" in multiprocessing.get_all_start_methods()):
+            # pylint: disable-next=import-outside-toplevel
+            from concurrent.futures import ProcessPoolExecutor
+
+            contexto = multiprocessing.get_context("fork")
+            with ProcessPoolExecutor(max_workers=max_workers,
+                                     mp_context=contexto) as executor:
+                resultados = list(executor.map(_verificar_bloco, inicios,
+                                               fins))
+        else:
+            resultados = list(map(_verificar_bloco, inicios, fins))
+        segundos = time.perf_counter() - inicio
+
+        quebras = []
+        for quebras_bloco, _ in resultados:
+            for indice, posicao in quebras_bloco:
+                conta = _contas[indice]
+                quebras.append({
+                    "agencia": conta.agencia,
+                    "numero": conta.numero,
+                    "posicao": posicao,
+                    "transacao": conta.historico.transacoes[posicao],
+                })
+    finally:
+        _contas.clear()
+
+    entradas = sum(entradas_bloco for _, entradas_bloco in resultados)
+    return {
+        "quebras": quebras,
+        "entradas": entradas,
+        "segundos": segundos,
+        "entradas_por_s": entradas / segundos if segundos else 0.0,
+    }
+
+
+def formatar_verificacao(resultado, limite=20):
+    """
+    Monta o relatório da verificação.
+
+    Args:
+        resultado (dict): Resultado de `verificar_contas`.
+        limite (int): Quantidade de contas listadas.
+
+    Returns:
+        str: Relatório em texto.
+    """
+    resumo = (f"{resultado['entradas']:,} transações verificadas em "
+              f"{resultado['segundos']:.2f} s "
+              f"({resultado['entradas_por_s']:,.0f}/s).")
+    quebras = resultado["quebras"]
+    if not quebras:
+        return (Fore.GREEN + "Históricos íntegros: " + resumo
+                + Style.RESET_ALL)
+
+    linhas = [Fore.RED + f"{len(quebras)} históricos adulterados: "
+              + resumo + Style.RESET_ALL,
+              f"{'agência':<8}{'conta':>10}{'elo':>8}  transação"]
+    for quebra in quebras[:limite]:
+        transacao = quebra["transacao"]
+        linhas.append(
+            f"{quebra['agencia']:<8}{quebra['numero']:>10}"
+            f"{quebra['posicao']:>8}  {transacao['tipo']} "
+            f"{transacao['valor']} em {transacao['instante']}")
+    return "\n".join(linhas)
+
+
+def main():
+    """
+    Verifica um banco populado com dados sintéticos (gerador_dados).
+    """
+    # pylint: disable-next=import-outside-toplevel
+    import argparse
+
+    # pylint: disable-next=import-outside-toplevel
+    from gerador_dados import GeradorDados, popular_banco
+
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clientes", type=int, default=10_000)
+    parser.add_argument("--transacoes", type=int, default=1_000_000)
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--processos", type=int)
+    argumentos = parser.parse_args()
+
+    _, contas = popular_banco(GeradorDados(argumentos.semente),
+                              argumentos.clientes, argumentos.transacoes)
+    print(formatar_verificacao(
+        verificar_contas(contas, max_workers=argumentos.processos)))
+
+
+if __name__ == "__main__":
+    main()
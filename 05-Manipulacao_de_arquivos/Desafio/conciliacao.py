@@ -0,0 +1,157 @@
+"""
+Conciliação dos saldos das contas com os seus históricos.
+
+O saldo (`Conta._saldo`) e o histórico são atualizados separadamente pelas
+transações; a conciliação confere se o saldo de cada conta é igual à soma
+com sinal (depósitos positivos, saques negativos) do seu histórico.
+
+Os históricos são carregados uma única vez em colunas NumPy (índice da conta
+e valor com sinal) e as somas por conta são obtidas com uma redução
+agrupada (`numpy.bincount` ponderado), sem laço Python por transação na
+comparação.
+
+O NumPy é importado apenas quando a conciliação é executada.
+
+Uso:
+    python conciliacao.py --clientes 10000 --transacoes 1000000
+"""
+import argparse
+
+from colorama import Fore, Style  # type: ignore
+
+# Diferença máxima, em reais, aceita entre o saldo e a soma do histórico
+# (absorve o arredondamento da soma de valores em ponto flutuante).
+TOLERANCIA_PADRAO = 0.005
+
+
+def colunas_historicos(contas):
+    """
+    Carrega os históricos das contas em colunas NumPy.
+
+    Args:
+        contas (list): Contas a conciliar.
+
+    Returns:
+        tuple: (indices, valores, saldos): índice da conta de cada transação
+        (intp), valor com sinal de cada transação (float64) e saldo de cada
+        conta (float64).
+    """
+    # pylint: disable-next=import-outside-toplevel
+    import numpy as np
+
+    historicos = [conta.historico.transacoes for conta in contas]
+    tamanhos = np.fromiter((len(transacoes) for transacoes in historicos),
+                           dtype=np.int64, count=len(historicos))
+    total = int(tamanhos.sum())
+
+    indices = np.repeat(np.arange(len(contas), dtype=np.intp), tamanhos)
+    valores = np.fromiter(
+        (-transacao["valor"] if transacao["tipo"] == "Saque"
+         else transacao["valor"]
+         for transacoes in historicos for transacao in transacoes),
+        dtype=np.float64, count=total)
+    saldos = np.fromiter((conta.saldo for conta in contas),
+                         dtype=np.float64, count=len(contas))
+    return indices, valores, saldos
+
+
+def conciliar(indices, valores, saldos, tolerancia=TOLERANCIA_PADRAO):
+    """
+    Compara os saldos com a soma com sinal das transações de cada conta.
+
+    Args:
+        indices (numpy.ndarray): Índice da conta de cada transação.
+        valores (numpy.ndarray): Valor com sinal de cada transação.
+        saldos (numpy.ndarray): Saldo registrado de cada conta.
+        tolerancia (float): Diferença máxima aceita.
+
+    Returns:
+        tuple: (divergentes, somas): índices das contas cujo saldo diverge
+        do histórico e a soma do histórico de cada conta.
+    """
+    # pylint: disable-next=import-outside-toplevel
+    import numpy as np
+
+    somas = np.bincount(indices, weights=valores, minlength=len(saldos))
+    divergentes = np.flatnonzero(np.abs(saldos - somas) > tolerancia)
+    return divergentes, somas
+
+
+def conciliar_contas(contas, tolerancia=TOLERANCIA_PADRAO):
+    """
+    Concilia os saldos das contas com os seus históricos.
+
+    Args:
+        contas (iterable): Contas a conciliar.
+        tolerancia (float): Diferença máxima aceita.
+
+    Returns:
+        list: Uma entrada por conta divergente, com agência, número, saldo,
+        soma do histórico e diferença.
+    """
+    contas = list(contas)
+    indices, valores, saldos = colunas_historicos(contas)
+    divergentes, somas = conciliar(indices, valores, saldos, tolerancia)
+    return [
+        {
+            "agencia": contas[indice].agencia,
+            "numero": contas[indice].numero,
+            "saldo": float(saldos[indice]),
+            "soma_historico": float(somas[indice]),
+            "diferenca": float(saldos[indice] - somas[indice]),
+        }
+        for indice in divergentes.tolist()
+    ]
+
+
+def formatar_divergencias(divergencias, limite=20):
+    """
+    Monta o relatório das divergências encontradas.
+
+    Args:
+        divergencias (list): Resultado de `conciliar_contas`.
+        limite (int): Quantidade de contas listadas.
+
+    Returns:
+        str: Relatório em texto.
+    """
+    if not divergencias:
+        return Fore.GREEN + "Saldos conciliados." + Style.RESET_ALL
+
+    linhas = [Fore.RED + f"{len(divergencias)} contas divergentes:"
+              + Style.RESET_ALL,
+              f"{'agência':<8}{'conta':>10}{'saldo':>16}{'histórico':>16}"
+              f"{'diferença':>14}"]
+    for divergencia in divergencias[:limite]:
+        linhas.append(
+            f"{divergencia['agencia']:<8}{divergencia['numero']:>10}"
+            f"{divergencia['saldo']:>16.2f}"
+            f"{divergencia['soma_historico']:>16.2f}"
+            f"{divergencia['diferenca']:>14.2f}")
+    return "\n".join(linhas)
+
+
+def main():
+    """
+    Concilia um banco populado com dados sintéticos (gerador_dados).
+    """
+    # pylint: disable-next=import-outside-toplevel
+    from gerador_dados import GeradorDados, popular_banco
+
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clientes", type=int, default=10_000)
+    parser.add_argument("--transacoes", type=int, default=1_000_000)
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--tolerancia", type=float, default=TOLERANCIA_PADRAO)
+    argumentos = parser.parse_args()
+
+    _, contas = popular_banco(GeradorDados(argumentos.semente),
+                              argumentos.clientes, argumentos.transacoes)
+    print(formatar_divergencias(
+        conciliar_contas(contas, argumentos.tolerancia)))
+
+
+if __name__ == "__main__":
+    main()
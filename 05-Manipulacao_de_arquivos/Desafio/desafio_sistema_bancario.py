@@ -8,14 +8,40 @@ Atualizar a implementação do sistema bancário, para armazenar os dados de
 clientes e contas bancárias em objetos ao invés de dicionários. O código deve
 seguir o modelo de classes UML a seguir:
 """
+import sys
 import textwrap
 from abc import ABC, abstractmethod
-from datetime import datetime
+from bisect import bisect_right
 from pathlib import Path
 
 from colorama import Fore, Style  # type: ignore
 
+from agencias import (DIRETORIO_AGENCIAS, Agencia, carregar_clientes,
+                      codigo_agencia_valido, codigos_gravados,
+                      gravar_clientes)
+from alocador_contas import calcular_digito_verificador
+from barramento_eventos import DESCARTAR_ANTIGOS, BarramentoEventos
+from cadeia_hash import HASH_INICIAL, calcular_hash
+from deteccao_fraude import DetectorFraude
+from exportador_metricas import (ALERTAS_FRAUDE, CLIENTES, CONTAS,
+                                 PORTA_PADRAO, TRANSACOES,
+                                 AcompanhamentoSaldos, ServidorEmSegundoPlano,
+                                 observar_transacao)
+from fonte_eventos import (DIRETORIO_EVENTOS, EXTENSAO, LogEventos,
+                           reconstruir_projecoes, restaurar_contas)
+from fusos import (FUSO_PADRAO, formatar_instante, fronteiras_agencia,
+                   fronteiras_fuso, fuso_agencia, instante_de_texto)
+from metricas import (imprimir_resumo, iniciar_resumo_periodico,
+                      medir_latencia)
+from perfilador import Perfilador
+from ranking_saldos import RankingSaldos
+from relogio import FORMATO_LOG, relogio_atual
+from saldos_compartilhados import NOME_PADRAO, TabelaSaldos
+
 ROOT_PATH = Path(__file__).parent
+AGENCIA_PADRAO = "0001"
+# Transações entre dois marcos de saldo do histórico.
+INTERVALO_MARCOS_SALDO = 256
 
 
 class ContaIterador:
@@ -45,8 +71,8 @@ class ContaIterador:
         try:
             conta = self.contas[self._index]
             return f"""\
-            Agência:\t{conta.agencia}
-            Número:\t\t{conta.numero}
+            Agência:\t{conta.agencia}-{conta.digito_agencia}
+            Número:\t\t{conta.numero}-{conta.digito}
             Titular:\t{conta.cliente.nome}
             Saldo:\t\tR$ {conta.saldo:.2f}
         """
@@ -56,6 +82,104 @@ class ContaIterador:
             self._index += 1
 
 
+class PosicaoConsolidada:
+    """
+    Posição consolidada de um cliente: saldo total das contas e depósitos,
+    saques e transações do dia, atualizados em O(1) a cada transação
+    registrada.
+
+    O estado fica em uma única tupla, trocada inteira a cada atualização:
+    uma leitura feita de outra thread vê sempre os valores de uma mesma
+    atualização, sem trava no caminho das transações.
+
+    Atributos:
+        fronteiras (FronteirasDia): Fronteiras do dia local da posição (o
+        fuso da agência da primeira conta do cliente).
+        _estado (tuple): (saldo, depósitos, saques, transações, início do
+        dia, fim do dia).
+    """
+    __slots__ = ("fronteiras", "_estado")
+
+    def __init__(self, fronteiras=None):
+        self.fronteiras = fronteiras or fronteiras_fuso(FUSO_PADRAO)
+        self._estado = (0, 0.0, 0.0, 0, 0.0, 0.0)
+
+    def registrar(self, tipo, valor, instante):
+        """
+        Contabiliza uma transação registrada em uma conta do cliente.
+
+        Args:
+            tipo (str): Nome da classe da transação ("Deposito" ou "Saque").
+            valor (float | int): Valor da transação.
+            instante (float): Instante UTC da transação.
+        """
+        saldo, depositos, saques, quantidade, inicio, fim = self._estado
+        if not inicio <= instante < fim:
+            inicio, fim = self.fronteiras.limites(instante)
+            depositos = saques = 0.0
+            quantidade = 0
+        if tipo == "Saque":
+            saldo -= valor
+            saques += valor
+        else:
+            saldo += valor
+            depositos += valor
+        self._estado = (saldo, depositos, saques, quantidade + 1, inicio, fim)
+
+    def somar_saldo(self, valor):
+        """
+        Soma ao saldo total o saldo de uma conta incluída no cliente.
+
+        Args:
+            valor (float | int): Saldo da conta.
+        """
+        saldo, *dia = self._estado
+        self._estado = (saldo + valor, *dia)
+
+    def recalcular(self, contas, instante=None):
+        """
+        Refaz a posição a partir das contas (por exemplo, depois de saldos
+        e históricos alterados diretamente, sem `Transacao.registrar`).
+
+        Args:
+            contas (list): Contas do cliente.
+            instante (float, optional): Instante UTC; por padrão, o atual.
+        """
+        if instante is None:
+            instante = relogio_atual().instante()
+        inicio, fim = self.fronteiras.limites(instante)
+        usos = [conta.historico.uso_do_dia(instante) for conta in contas]
+        self._estado = (
+            sum(conta.saldo for conta in contas),
+            sum(uso.depositos for uso in usos),
+            sum(uso.saques for uso in usos),
+            sum(uso.quantidade for uso in usos),
+            inicio, fim)
+
+    def ler(self, instante=None):
+        """
+        Retorna uma leitura consistente da posição.
+
+        Args:
+            instante (float, optional): Instante UTC; por padrão, o atual.
+
+        Returns:
+            dict: Saldo total e depósitos, saques e transações do dia.
+        """
+        saldo, depositos, saques, quantidade, inicio, fim = self._estado
+        if instante is None:
+            instante = relogio_atual().instante()
+        if not inicio <= instante < fim:
+            depositos = saques = 0.0
+            quantidade = 0
+        return {
+            "saldo_total": saldo,
+            "depositos_dia": depositos,
+            "saques_dia": saques,
+            "transacoes_dia": quantidade,
+        }
+
+
 class Cliente:
     """
     Classe que representa um cliente do banco.
@@ -63,13 +187,20 @@ class Cliente:
     Atributos:
         endereco (str): Endereço do cliente.
         contas (list): Lista de contas bancárias do cliente.
+        _indice_contas (dict): Contas do cliente indexadas por
+        (agência, número).
+        posicao (PosicaoConsolidada): Posição consolidada das contas do
+        cliente.
     """
 
     def __init__(self, endereco: str):
         self.endereco = endereco
         self.contas: list = []
+        self._indice_contas: dict = {}
         self.indice_conta = 0
+        self.posicao = PosicaoConsolidada()
 
+    @medir_latencia
     def realizar_transacao(self, conta, transacao):
         """
         Realiza uma transação na conta especificada.
@@ -77,13 +208,21 @@ class Cliente:
         Args:
             conta (Conta): Conta na qual a transação será realizada.
             transacao (Transacao): Transação a ser realizada.
+
+        Returns:
+            bool: True se a transação foi registrada, False caso contrário.
         """
-        if len(conta.historico.transacoes_do_dia()) >= 2:
+        # Uma única leitura do relógio por transação: o mesmo instante vale
+        # para o limite diário, as regras da conta e o histórico.
+        instante = relogio_atual().instante()
+        if conta.historico.uso_do_dia(instante).quantidade >= 2:
             print(Fore.RED + "Você excedeu o número de transações permitidos "
                   "para hoje!" + Style.RESET_ALL)
-            return
+            TRANSACOES.incrementar(tipo=transacao.__class__.__name__.lower(),
+                                   resultado="limite_diario")
+            return False
 
-        transacao.registrar(conta)
+        return transacao.registrar(conta, instante)
 
     def adicionar_conta(self, conta):
         """
@@ -92,7 +231,35 @@ class Cliente:
         Args:
             conta (Conta): Conta a ser adicionada.
         """
+        if not self.contas:
+            self.posicao.fronteiras = conta.historico.fronteiras
         self.contas.append(conta)
+        self._indice_contas[(conta.agencia, conta.numero)] = conta
+        self.posicao.somar_saldo(conta.saldo)
+
+    def posicao_consolidada(self):
+        """
+        Retorna a posição consolidada do cliente, sem percorrer as contas
+        nem os históricos.
+
+        Returns:
+            dict: Saldo total e depósitos, saques e transações do dia.
+        """
+        return self.posicao.ler()
+
+    def buscar_conta(self, agencia, numero):
+        """
+        Localiza uma conta do cliente pela agência e pelo número, sem
+        percorrer a lista de contas.
+
+        Args:
+            agencia (str): Agência da conta.
+            numero (int): Número da conta.
+
+        Returns:
+            Conta | None: Conta encontrada ou None.
+        """
+        return self._indice_contas.get((agencia, numero))
 
 
 class PessoaFisica(Cliente):
@@ -116,6 +283,35 @@ class PessoaFisica(Cliente):
     def __repr__(self) -> str:
         return f"<{self.__class__.__name__}: ('{self.nome}', '{self.cpf}')>"
 
+    @classmethod
+    def de_dict(cls, dados):
+        """
+        Recria um cliente a partir dos dados gerados por `para_dict`.
+
+        Args:
+            dados (dict): Dados do cliente.
+
+        Returns:
+            PessoaFisica: Cliente sem contas (as contas são recriadas a
+            partir dos snapshots das agências).
+        """
+        return cls(dados["nome"], dados["data_nascimento"], dados["cpf"],
+                   dados["endereco"])
+
+    def para_dict(self):
+        """
+        Converte o cliente em um dicionário serializável.
+
+        Returns:
+            dict: Nome, data de nascimento, CPF e endereço.
+        """
+        return {
+            "nome": self.nome,
+            "data_nascimento": self.data_nascimento,
+            "cpf": self.cpf,
+            "endereco": self.endereco,
+        }
+
 
 class Conta:
     """
@@ -127,28 +323,70 @@ class Conta:
         _agencia (str): Agência da conta.
         _cliente (str): Nome do cliente titular da conta.
         _historico (Historico): Histórico de transações da conta.
+        observadores_saldo (list): Funções chamadas com a conta sempre que
+        uma conta é criada ou tem o saldo alterado (atributo de classe).
     """
 
-    def __init__(self, numero: int, cliente: str):
+    observadores_saldo: list = []
+
+    def __init__(self, numero: int, cliente: str,
+                 agencia: str = AGENCIA_PADRAO):
         self._saldo: float | int = 0
         self._numero: int = numero
-        self._agencia: str = "0001"
+        self._agencia: str = agencia
         self._cliente: str = cliente
-        self._historico = Historico()
+        self._historico = Historico(fronteiras_agencia(agencia))
+        self._notificar_saldo()
 
     @classmethod
-    def nova_conta(cls, cliente, numero):
+    def nova_conta(cls, cliente, numero, agencia=AGENCIA_PADRAO):
         """
         Cria uma nova instância de conta bancária.
 
         Args:
             cliente (str): Nome do cliente titular da conta.
             numero (int): Número da conta.
+            agencia (str): Agência da conta.
 
         Returns:
             Conta: Nova instância de conta bancária.
         """
-        return cls(numero, cliente)
+        return cls(numero, cliente, agencia=agencia)
+
+    @classmethod
+    def de_dict(cls, dados, cliente, legado=None):
+        """
+        Recria uma conta a partir dos dados gerados por `para_dict`.
+
+        Args:
+            dados (dict): Dados da conta.
+            cliente (Cliente): Titular da conta.
+            legado (bool, optional): Se os dados são anteriores à cadeia de
+            hashes (ver `Historico.restaurar`).
+
+        Returns:
+            Conta: Conta com saldo e histórico restaurados.
+        """
+        conta = cls.nova_conta(cliente, dados["numero"], dados["agencia"])
+        conta._saldo = dados["saldo"]
+        conta.historico.restaurar(dados["transacoes"], legado)
+        conta._notificar_saldo()
+        return conta
+
+    def para_dict(self):
+        """
+        Converte a conta em um dicionário serializável.
+
+        Returns:
+            dict: Agência, número, CPF do titular, saldo e transações.
+        """
+        return {
+            "agencia": self._agencia,
+            "numero": self._numero,
+            "cpf": self._cliente.cpf,
+            "saldo": self._saldo,
+            "transacoes": self._historico.transacoes,
+        }
 
     @property
     def saldo(self):
@@ -160,6 +398,13 @@ class Conta:
         """
         return self._saldo
 
+    def _notificar_saldo(self):
+        """
+        Repassa a conta aos observadores de saldo registrados.
+        """
+        for observador in self.observadores_saldo:
+            observador(self)
+
     @property
     def numero(self):
         """
@@ -180,6 +425,26 @@ class Conta:
         """
         return self._agencia
 
+    @property
+    def digito(self):
+        """
+        Retorna o dígito verificador do número da conta.
+
+        Returns:
+            str: Dígito verificador (módulo 11).
+        """
+        return calcular_digito_verificador(self._numero)
+
+    @property
+    def digito_agencia(self):
+        """
+        Retorna o dígito verificador da agência.
+
+        Returns:
+            str: Dígito verificador (módulo 11).
+        """
+        return calcular_digito_verificador(self._agencia)
+
     @property
     def cliente(self):
         """
@@ -200,12 +465,15 @@ class Conta:
         """
         return self._historico
 
-    def sacar(self, valor):
+    # pylint: disable-next=unused-argument
+    def sacar(self, valor, instante=None):
         """
         Realiza um saque na conta.
 
         Args:
             valor (float | int): Valor a ser sacado.
+            instante (float, optional): Instante UTC do saque, usado pelas
+            regras diárias das subclasses; por padrão, o atual.
 
         Returns:
             bool: True se o saque foi realizado com sucesso, False caso
@@ -220,6 +488,7 @@ class Conta:
                   + Style.RESET_ALL)
         elif valor > 0:
             self._saldo -= valor
+            self._notificar_saldo()
             print(Fore.GREEN +
                   f"Saque de R$ {valor:.2f} realizado com sucesso!\n"
                   + Style.RESET_ALL)
@@ -244,6 +513,7 @@ class Conta:
         """
         if valor > 0:
             self._saldo += valor
+            self._notificar_saldo()
             print(Fore.GREEN +
                   f"Depósito de R$ {valor:.2f} realizado com sucesso!\n"
                   + Style.RESET_ALL)
@@ -265,19 +535,30 @@ class ContaCorrente(Conta):
         limite_saque (int): Limite diário de saques.
     """
 
-    def __init__(self, numero, cliente, limite=500, limite_saque=3):
-        super().__init__(numero, cliente)
+    def __init__(self, numero, cliente, limite=500, limite_saque=3,
+                 agencia=AGENCIA_PADRAO):
+        super().__init__(numero, cliente, agencia=agencia)
         self.limite = limite
         self.limite_saque = limite_saque
 
-    def sacar(self, valor):
-        numero_saques = len(
-            [transacao for transacao in self.historico.
-             transacoes if transacao["tipo"] == Saque.__name__]
-        )
-
+    @classmethod
+    def de_dict(cls, dados, cliente, legado=None):
+        conta = super().de_dict(dados, cliente, legado)
+        conta.limite = dados["limite"]
+        conta.limite_saque = dados["limite_saque"]
+        return conta
+
+    def para_dict(self):
+        dados = super().para_dict()
+        dados["limite"] = self.limite
+        dados["limite_saque"] = self.limite_saque
+        return dados
+
+    def sacar(self, valor, instante=None):
         excedeu_limite = valor > self.limite
-        excedeu_saques = numero_saques >= self.limite_saque
+        excedeu_saques = (
+            self.historico.uso_do_dia(instante).saques_quantidade
+            >= self.limite_saque)
 
         if excedeu_limite:
             print(Fore.RED +
@@ -289,7 +570,7 @@ class ContaCorrente(Conta):
                   "Número de saques diários excedido. Limite: "
                   f"{self.limite_saque} saques" + Style.RESET_ALL)
         else:
-            return super().sacar(valor)
+            return super().sacar(valor, instante)
 
         return False
 
@@ -299,22 +580,86 @@ class ContaCorrente(Conta):
 
     def __str__(self) -> str:
         return f"""\
-            Agência:\t{self.agencia}
-            C/C:\t{self.numero}
+            Agência:\t{self.agencia}-{self.digito_agencia}
+            C/C:\t{self.numero}-{self.digito}
             Titular:\t{self.cliente.nome}
             """
 
 
+class UsoDiario:
+    """
+    Contadores de uso de uma conta em um dia local.
+
+    Atributos:
+        inicio (float): Início do dia, em instante UTC.
+        fim (float): Fim do dia (exclusivo), em instante UTC.
+        posicao (int): Tamanho do histórico coberto pelos contadores.
+        quantidade (int): Transações do dia.
+        depositos (float): Total depositado no dia.
+        saques (float): Total sacado no dia.
+        saques_quantidade (int): Saques do dia.
+    """
+    __slots__ = ("inicio", "fim", "posicao", "quantidade", "depositos",
+                 "saques", "saques_quantidade")
+
+    def __init__(self, inicio, fim, posicao):
+        self.inicio = inicio
+        self.fim = fim
+        self.posicao = posicao
+        self.quantidade = 0
+        self.depositos = 0.0
+        self.saques = 0.0
+        self.saques_quantidade = 0
+
+    def somar(self, tipo, valor):
+        """
+        Contabiliza uma transação do dia.
+
+        Args:
+            tipo (str): Nome da classe da transação ("Deposito" ou "Saque").
+            valor (float | int): Valor da transação.
+        """
+        self.quantidade += 1
+        if tipo == "Saque":
+            self.saques += valor
+            self.saques_quantidade += 1
+        else:
+            self.depositos += valor
+
+
 class Historico:
     """
     Classe que representa o histórico de transações de uma conta.
 
+    As transações guardam o instante em UTC (segundos desde a época Unix);
+    o dia de cada uma é o dia local do fuso da agência da conta.
+
+    Cada transação guarda o hash encadeado à anterior (ver cadeia_hash),
+    calculado quando ela é acrescentada.
+
     Atributos:
         _transacoes (list): Lista de transações realizadas na conta.
+        fronteiras (FronteirasDia): Fronteiras do dia local no fuso da
+        agência da conta.
+        _uso (UsoDiario | None): Contadores do dia, mantidos a cada
+        transação e recalculados quando o dia muda ou o histórico é
+        alterado por fora de `adicionar_transacao`.
+        _marcos_instantes (list): Instante da última transação coberta por
+        cada marco de saldo (um marco a cada INTERVALO_MARCOS_SALDO
+        transações).
+        _marcos_saldos (list): Saldo acumulado em cada marco.
+        _posicao_marcos (int): Transações já somadas nos marcos.
+        _saldo_marcado (float | int): Saldo acumulado até `_posicao_marcos`.
     """
 
-    def __init__(self):
+    def __init__(self, fronteiras=None):
         self._transacoes = []
+        self.fronteiras = fronteiras or fronteiras_fuso(FUSO_PADRAO)
+        self._uso = None
+        self._marcos_instantes = []
+        self._marcos_saldos = []
+        self._posicao_marcos = 0
+        self._saldo_marcado = 0
 
     @property
     def transacoes(self):
@@ -326,19 +671,171 @@ class Historico:
         """
         return self._transacoes
 
-    def adicionar_transacao(self, transacao):
+    def adicionar_transacao(self, transacao, instante=None):
         """
         Adiciona uma transação ao histórico da conta.
 
         Args:
             transacao (Transacao): Transação a ser adicionada.
+            instante (float, optional): Instante UTC da transação; por
+            padrão, o atual.
+
+        Returns:
+            float: Instante UTC registrado para a transação.
         """
-        self._transacoes.append({
-            "tipo": transacao.__class__.__name__,
+        tipo = transacao.__class__.__name__
+        if instante is None:
+            instante = relogio_atual().instante()
+        transacoes = self._transacoes
+        anterior = (transacoes[-1].get("hash", HASH_INICIAL) if transacoes
+                    else HASH_INICIAL)
+        transacoes.append({
+            "tipo": tipo,
             "valor": transacao.valor,
-            "data": datetime.now().strftime("%d/%m/%Y %H:%M:%S")
+            "instante": instante,
+            "hash": calcular_hash(anterior, tipo, transacao.valor, instante),
         })
 
+        uso = self._uso
+        if (uso is not None and uso.posicao == len(self._transacoes) - 1
+                and uso.inicio <= instante < uso.fim):
+            uso.posicao += 1
+            uso.somar(tipo, transacao.valor)
+        return instante
+
+    def _contar_dia(self, instante):
+        inicio, fim = self.fronteiras.limites(instante)
+        uso = UsoDiario(inicio, fim, len(self._transacoes))
+        for transacao in reversed(self._transacoes):
+            if transacao["instante"] < inicio:
+                break
+            if transacao["instante"] < fim:
+                uso.somar(transacao["tipo"], transacao["valor"])
+        return uso
+
+    def uso_do_dia(self, instante=None):
+        """
+        Retorna os contadores do dia local que contém o instante.
+
+        Args:
+            instante (float, optional): Instante UTC; por padrão, o atual.
+
+        Returns:
+            UsoDiario: Quantidade e totais de depósitos e saques do dia.
+        """
+        if instante is None:
+            instante = relogio_atual().instante()
+        uso = self._uso
+        if (uso is None or not uso.inicio <= instante < uso.fim
+                or uso.posicao != len(self._transacoes)):
+            uso = self._uso = self._contar_dia(instante)
+        return uso
+
+    def definir_uso_do_dia(self, inicio, fim, totais):
+        """
+        Substitui os contadores do dia por totais calculados fora do
+        histórico (por exemplo, projetados do log de eventos).
+
+        Args:
+            inicio (float): Início do dia local, em instante UTC.
+            fim (float): Fim (exclusivo) do dia local, em instante UTC.
+            totais (dict): "quantidade", "depositos", "saques" e
+            "saques_quantidade" do dia.
+        """
+        uso = UsoDiario(inicio, fim, len(self._transacoes))
+        uso.quantidade = totais["quantidade"]
+        uso.depositos = totais["depositos"]
+        uso.saques = totais["saques"]
+        uso.saques_quantidade = totais["saques_quantidade"]
+        self._uso = uso
+
+    def _atualizar_marcos(self):
+        # Soma as transações acrescentadas desde a última consulta; cada
+        # transação é somada uma única vez na vida do histórico.
+        transacoes = self._transacoes
+        saldo = self._saldo_marcado
+        for posicao in range(self._posicao_marcos, len(transacoes)):
+            transacao = transacoes[posicao]
+            if transacao["tipo"] == "Saque":
+                saldo -= transacao["valor"]
+            else:
+                saldo += transacao["valor"]
+            if (posicao + 1) % INTERVALO_MARCOS_SALDO == 0:
+                self._marcos_instantes.append(transacao["instante"])
+                self._marcos_saldos.append(saldo)
+        self._posicao_marcos = len(transacoes)
+        self._saldo_marcado = saldo
+
+    def saldo_em(self, instante):
+        """
+        Retorna o saldo da conta em um instante, considerando as transações
+        feitas até ele (inclusive).
+
+        O saldo é obtido por busca binária no último marco de saldo anterior
+        ao instante, seguida das no máximo INTERVALO_MARCOS_SALDO transações
+        posteriores a ele, sem percorrer o histórico inteiro.
+
+        Args:
+            instante (float): Instante UTC, em segundos.
+
+        Returns:
+            float | int: Saldo no instante.
+        """
+        self._atualizar_marcos()
+        marco = bisect_right(self._marcos_instantes, instante)
+        if marco:
+            saldo = self._marcos_saldos[marco - 1]
+        else:
+            saldo = 0
+        transacoes = self._transacoes
+        for posicao in range(marco * INTERVALO_MARCOS_SALDO,
+                             len(transacoes)):
+            transacao = transacoes[posicao]
+            if transacao["instante"] > instante:
+                break
+            if transacao["tipo"] == "Saque":
+                saldo -= transacao["valor"]
+            else:
+                saldo += transacao["valor"]
+        return saldo
+
+    def restaurar(self, transacoes, legado=None):
+        """
+        Acrescenta transações gravadas (por exemplo, em um snapshot),
+        convertendo as do formato antigo, com a data local em texto, para
+        instantes UTC.
+
+        As transações gravadas são mantidas como estão, para que a
+        verificação da cadeia acuse alterações no arquivo: uma transação sem
+        hash fica sem hash e aparece como elo quebrado. Só uma gravação
+        anterior à cadeia (`legado`) é encadeada ao ser restaurada.
+
+        Args:
+            transacoes (iterable): Transações gravadas, em ordem cronológica.
+            legado (bool, optional): Se a gravação é anterior à cadeia de
+            hashes. Se None, é considerada anterior quando nenhuma das
+            transações tem hash.
+        """
+        transacoes = list(transacoes)
+        if legado is None:
+            legado = not any("hash" in transacao for transacao in transacoes)
+        destino = self._transacoes
+        for transacao in transacoes:
+            if "instante" not in transacao:
+                transacao = {
+                    "tipo": transacao["tipo"],
+                    "valor": transacao["valor"],
+                    "instante": instante_de_texto(transacao["data"],
+                                                  self.fronteiras.nome),
+                }
+            if legado:
+                anterior = (destino[-1].get("hash", HASH_INICIAL) if destino
+                            else HASH_INICIAL)
+                transacao["hash"] = calcular_hash(
+                    anterior, transacao["tipo"], transacao["valor"],
+                    transacao["instante"])
+            destino.append(transacao)
+
     def gerar_relatorio(self, tipo_transacao=None):
         """
         Gera um iterador para percorrer as transações filtradas por tipo.
@@ -361,7 +858,8 @@ class Historico:
 
     def transacoes_do_dia(self):
         """
-        Retorna uma lista com todas as transações realizadas no dia atual.
+        Retorna uma lista com todas as transações realizadas no dia atual,
+        no fuso da agência da conta.
 
         Returns:
             list: Uma lista contendo dicionários que representam as transações
@@ -369,14 +867,16 @@ class Historico:
                 Cada dicionário possui atributos como 'conta', 'valor' e
                 'tipo'.
         """
-        data_atual = datetime.now().date()
+        # O histórico está em ordem cronológica: basta percorrer, do fim para
+        # o início, as transações a partir da meia-noite local (pré-calculada
+        # como instante UTC).
+        inicio_dia, _ = self.fronteiras.limites(relogio_atual().instante())
         transacoes = []
-        for transacao in self._transacoes:
-            data_transacao = datetime.strptime(
-                transacao["data"], "%d/%m/%Y %H:%M:%S"
-            ).date()
-            if data_atual == data_transacao:
-                transacoes.append(transacao)
+        for transacao in reversed(self._transacoes):
+            if transacao["instante"] < inicio_dia:
+                break
+            transacoes.append(transacao)
+        transacoes.reverse()
         return transacoes
 
 
@@ -386,7 +886,13 @@ class Transacao(ABC):
 
     Atributos:
     valor (float | int): Valor da transação.
+    observadores_registro (list): Funções chamadas com a conta, a transação
+    e o instante sempre que uma transação é registrada (atributo de
+    classe).
     """
+
+    observadores_registro: list = []
+
     @property
     @abstractmethod
     def valor(self):
@@ -399,14 +905,26 @@ class Transacao(ABC):
 
     @classmethod
     @abstractmethod
-    def registrar(cls, conta):
+    def registrar(cls, conta, instante=None):
         """
         Registra a transação na conta especificada.
 
         Args:
             conta (Conta): Conta na qual a transação será registrada.
+            instante (float, optional): Instante UTC da transação; por
+            padrão, o atual.
+
+        Returns:
+            bool: True se a transação foi registrada, False caso contrário.
         """
 
+    def _notificar_registro(self, conta, instante):
+        """
+        Repassa a transação registrada aos observadores de registro.
+        """
+        for observador in self.observadores_registro:
+            observador(conta, self, instante)
+
 
 class Saque(Transacao):
     """
@@ -423,17 +941,31 @@ class Saque(Transacao):
     def valor(self):
         return self._valor
 
-    def registrar(self, conta):
+    @medir_latencia
+    @observar_transacao
+    def registrar(self, conta, instante=None):
         """
         Registra o saque na conta especificada.
 
         Args:
             conta (Conta): Conta na qual o saque será registrado.
+            instante (float, optional): Instante UTC do saque; por padrão, o
+            atual.
+
+        Returns:
+            bool: True se o saque foi registrado, False caso contrário.
         """
-        sucesso_transacao = conta.sacar(self.valor)
+        if instante is None:
+            instante = relogio_atual().instante()
+        sucesso_transacao = conta.sacar(self.valor, instante)
 
         if sucesso_transacao:
-            conta.historico.adicionar_transacao(self)
+            conta.historico.adicionar_transacao(self, instante)
+            conta.cliente.posicao.registrar(
+                self.__class__.__name__, self.valor, instante)
+            self._notificar_registro(conta, instante)
+
+        return sucesso_transacao
 
 
 class Deposito(Transacao):
@@ -451,17 +983,29 @@ class Deposito(Transacao):
     def valor(self):
         return self._valor
 
-    def registrar(self, conta):
+    @medir_latencia
+    @observar_transacao
+    def registrar(self, conta, instante=None):
         """
         Registra o depósito na conta especificada.
 
         Args:
             conta (Conta): Conta na qual o depósito será registrado.
+            instante (float, optional): Instante UTC do depósito; por padrão, o
+            atual.
+
+        Returns:
+            bool: True se o depósito foi registrado, False caso contrário.
         """
         sucesso_transacao = conta.depositar(self.valor)
 
         if sucesso_transacao:
-            conta.historico.adicionar_transacao(self)
+            instante = conta.historico.adicionar_transacao(self, instante)
+            conta.cliente.posicao.registrar(
+                self.__class__.__name__, self.valor, instante)
+            self._notificar_registro(conta, instante)
+
+        return sucesso_transacao
 
 
 def log_transacao(func):
@@ -486,7 +1030,7 @@ def log_transacao(func):
     """
     def envelope(*args, **kwargs):
         resultado = func(*args, **kwargs)
-        data_hora = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        data_hora = relogio_atual().carimbo(FORMATO_LOG)
         with open(ROOT_PATH / "log.txt", "a", encoding="utf-8") as arquivo:
             arquivo.write(
                 f"[{data_hora}] Função '{func.__name__}' executada com "
@@ -513,6 +1057,11 @@ def menu():
 [nc]\tNova Conta
 [lc]\tListar Contas
 [nu]\tNovo Usuário
+[pc]\tPosição Consolidada
+[r]\tRanking de Saldos
+[f]\tFechar Dia
+[a]\tAuditar Históricos
+[m]\tMétricas
 [q]\tSair
 =====================================
 => Digite a opção desejada: """
@@ -521,6 +1070,7 @@ def menu():
         Fore.YELLOW + menu_opcao + Style.RESET_ALL)).lower()
 
 
+@medir_latencia
 def filtrar_cliente(cpf, clientes):
     """
     Filtra o cliente com base no CPF.
@@ -530,9 +1080,35 @@ def filtrar_cliente(cpf, clientes):
     return clientes_filtrados[0] if clientes_filtrados else None
 
 
+def resolver_conta(cliente, identificacao):
+    """
+    Resolve a conta do cliente a partir da identificação informada.
+
+    Args:
+        cliente: Objeto do cliente.
+        identificacao (str): Conta no formato "agência/número" ou apenas o
+        número (para a agência padrão).
+
+    Returns:
+        Conta do cliente ou None.
+    """
+    agencia, _, numero = identificacao.strip().rpartition("/")
+
+    try:
+        numero = int(numero)
+    except ValueError:
+        return None
+
+    return cliente.buscar_conta(agencia or AGENCIA_PADRAO, numero)
+
+
 def recuperar_conta_cliente(cliente):
     """
-    Obtém a primeira conta bancária do cliente (se existir).
+    Obtém a conta bancária do cliente sobre a qual a operação será feita.
+
+    Se o cliente possuir uma única conta, ela é utilizada diretamente. Caso
+    contrário, o usuário escolhe a conta, que é localizada pelo índice do
+    cliente.
 
     Args:
         cliente: Objeto do cliente.
@@ -544,8 +1120,19 @@ def recuperar_conta_cliente(cliente):
         print("\nCliente não possui conta!")
         return
 
-    # Não permite cliente escolher a conta
-    return cliente.contas[0]
+    if len(cliente.contas) == 1:
+        return cliente.contas[0]
+
+    identificacao = input(Fore.YELLOW +
+                          f"Cliente possui {len(cliente.contas)} contas. "
+                          "Informe a conta (agência/número): "
+                          + Style.RESET_ALL)
+    conta = resolver_conta(cliente, identificacao)
+
+    if not conta:
+        print(Fore.RED + "\nConta não encontrada!" + Style.RESET_ALL)
+
+    return conta
 
 
 @log_transacao
@@ -660,10 +1247,12 @@ def exibir_extrato(clientes):
           + Style.RESET_ALL)
     extrato = ""
     tem_transacao = False
+    fuso = conta.historico.fronteiras.nome
     for transacao in conta.historico.gerar_relatorio():
         tem_transacao = True
+        data = formatar_instante(transacao["instante"], fuso)
         extrato += (Fore.YELLOW +
-                    f"\n{transacao['data']}\n{transacao['tipo']}:\n\tR$ "
+                    f"\n{data}\n{transacao['tipo']}:\n\tR$ "
                     f"{transacao['valor']:.2f}" + Style.RESET_ALL)
 
     if not tem_transacao:
@@ -675,6 +1264,41 @@ def exibir_extrato(clientes):
           + Style.RESET_ALL)
 
 
+@log_transacao
+def exibir_posicao(clientes):
+    """
+    Exibe a posição consolidada de um cliente.
+
+    Args:
+        clientes (lista de Cliente): Lista de objetos Cliente.
+
+    Retorna:
+        None
+
+    Observações:
+        * A função solicita ao usuário o CPF do cliente.
+        * A posição é lida de `Cliente.posicao_consolidada`, mantida a cada
+        transação, sem percorrer as contas nem os históricos.
+    """
+    cpf = input(
+        Fore.YELLOW + "Informe o CPF do clientes: " + Style.RESET_ALL)
+    cliente = filtrar_cliente(cpf, clientes)
+
+    if not cliente:
+        print(Fore.RED + "\nCliente não encontrado!" + Style.RESET_ALL)
+        return
+
+    posicao = cliente.posicao_consolidada()
+    print(Fore.YELLOW + textwrap.dedent(f"""
+        ========== POSIÇÃO CONSOLIDADA ==========
+        Contas:\t\t\t{len(cliente.contas)}
+        Saldo total:\t\tR$ {posicao['saldo_total']:.2f}
+        Depósitos hoje:\t\tR$ {posicao['depositos_dia']:.2f}
+        Saques hoje:\t\tR$ {posicao['saques_dia']:.2f}
+        Transações hoje:\t{posicao['transacoes_dia']}
+        =========================================""") + Style.RESET_ALL)
+
+
 @log_transacao
 def criar_cliente(clientes):
     """
@@ -721,15 +1345,13 @@ def criar_cliente(clientes):
 
 
 @log_transacao
-def criar_conta(numero_conta, clientes, contas):
+def criar_conta(agencia, clientes):
     """
-    Cria uma nova conta corrente para um cliente e a adiciona à lista de
-    contas.
+    Cria uma nova conta corrente para um cliente na agência informada.
 
     Args:
-        numero_conta (str): Número da conta corrente.
+        agencia (Agencia): Agência onde a conta será aberta.
         clientes (lista de Cliente): Lista de objetos Cliente.
-        contas (lista de ContaCorrente): Lista de objetos ContaCorrente.
 
     Retorna:
         None
@@ -739,11 +1361,9 @@ def criar_conta(numero_conta, clientes, contas):
         * Utiliza a função `filtrar_cliente` para obter o objeto `Cliente`
         correspondente ao CPF informado.
         * Se o cliente não for encontrado, retorna uma mensagem de erro.
-        * Cria um novo objeto `ContaCorrente` usando o método `nova_conta` da
-        classe `ContaCorrente`, passando o cliente e o número da conta como
-        argumentos.
-        * Adiciona a nova conta à lista de contas e à lista de contas do
-        cliente.
+        * Abre uma nova `ContaCorrente` na agência, que atribui o número da
+        conta a partir do seu próprio alocador.
+        * Adiciona a nova conta à lista de contas do cliente.
         * Imprime uma mensagem de sucesso após a criação da conta.
     """
     cpf = input(
@@ -754,9 +1374,8 @@ def criar_conta(numero_conta, clientes, contas):
         print(Fore.RED + "\nCliente não encontrado!" + Style.RESET_ALL)
         return
 
-    conta = ContaCorrente.nova_conta(cliente=cliente, numero=numero_conta)
-    contas.append(conta)
-    cliente.contas.append(conta)
+    conta = agencia.abrir_conta(cliente, ContaCorrente)
+    cliente.adicionar_conta(conta)
 
     print(Fore.GREEN + "\nConta criada com sucesso!" + Style.RESET_ALL)
 
@@ -784,12 +1403,163 @@ def listar_contas(contas):
         print(textwrap.dedent(str(conta)))
 
 
+def exibir_ranking(ranking):
+    """
+    Exibe as contas de maiores e de menores saldos.
+
+    Args:
+        ranking (RankingSaldos): Ranking mantido pelos observadores de saldo.
+
+    Returns:
+        None
+    """
+    texto = input(Fore.YELLOW + "Informe a quantidade de contas "
+                  "(Enter para 5): " + Style.RESET_ALL).strip()
+    if texto and not texto.isdigit():
+        print(Fore.RED + "\nQuantidade inválida!" + Style.RESET_ALL)
+        return
+    quantidade = int(texto) if texto else 5
+
+    for titulo, contas in (("Maiores saldos", ranking.maiores(quantidade)),
+                           ("Menores saldos", ranking.menores(quantidade))):
+        print(f"\n{titulo}:")
+        for conta in contas:
+            print(f"{conta.agencia}\t{conta.numero}\t{conta.cliente.nome:<30}"
+                  f"R$ {conta.saldo:>12.2f}")
+
+
+def alertar_fraude(alerta):
+    """
+    Conta e exibe um alerta do detector de fraude.
+
+    Args:
+        alerta (dict): Alerta emitido pelo DetectorFraude.
+    """
+    ALERTAS_FRAUDE.incrementar(regra=alerta["regra"])
+    print(Fore.LIGHTRED_EX + f"\nAlerta de fraude ({alerta['regra']}) na "
+          f"conta {alerta['agencia']}/{alerta['numero']}: "
+          f"{alerta['detalhe']}." + Style.RESET_ALL)
+
+
+def solicitar_agencia(mensagem):
+    """
+    Solicita ao usuário o código de uma agência.
+
+    Args:
+        mensagem (str): Texto exibido ao usuário.
+
+    Returns:
+        str | None: Código informado (vazio se o usuário apenas pressionar
+        Enter) ou None se o código for inválido.
+    """
+    codigo = input(Fore.YELLOW + mensagem + Style.RESET_ALL).strip()
+
+    if codigo and not codigo_agencia_valido(codigo):
+        print(Fore.RED + "\nAgência inválida! Informe quatro dígitos."
+              + Style.RESET_ALL)
+        return None
+
+    return codigo
+
+
+def gravar_banco(clientes, agencias, diretorio=DIRETORIO_AGENCIAS):
+    """
+    Grava os clientes e o snapshot de cada agência.
+
+    Args:
+        clientes (list): Clientes do banco.
+        agencias (dict): Agências indexadas pelo código.
+        diretorio (Path): Diretório dos arquivos das agências.
+    """
+    gravar_clientes([cliente.para_dict() for cliente in clientes],
+                    diretorio)
+    for agencia in agencias.values():
+        agencia.snapshot()
+
+
+def carregar_banco(diretorio=DIRETORIO_AGENCIAS,
+                   diretorio_eventos=DIRETORIO_EVENTOS):
+    """
+    Recria os clientes e as agências gravados por `gravar_banco`.
+
+    Os snapshots trazem as contas e os históricos; o log de eventos, se
+    existir, é a fonte da verdade dos saldos e dos contadores do dia, que
+    são reconstruídos a partir dele (inclusive as transações registradas
+    depois do último snapshot). A reconstrução roda no próprio processo.
+
+    Args:
+        diretorio (Path): Diretório dos arquivos das agências.
+        diretorio_eventos (Path): Diretório do log de eventos.
+
+    Returns:
+        tuple: (clientes, agencias): lista de clientes e dict de agências
+        indexadas pelo código.
+    """
+    clientes = [PessoaFisica.de_dict(dados)
+                for dados in carregar_clientes(diretorio)]
+    clientes_por_cpf = {cliente.cpf: cliente for cliente in clientes}
+    agencias = {codigo: Agencia.carregar(codigo, clientes_por_cpf,
+                                         ContaCorrente, diretorio)
+                for codigo in codigos_gravados(diretorio)}
+    if agencias and any(Path(diretorio_eventos).glob(f"*{EXTENSAO}")):
+        restaurar_contas(agencias.values(), reconstruir_projecoes(
+            diretorio_eventos, paralelo=False))
+    return clientes, agencias
+
+
 def main():
     """
     Função principal do sistema bancário.
     """
-    clientes = []
-    contas = []
+    Conta.observadores_saldo.append(AcompanhamentoSaldos())
+    ranking = RankingSaldos()
+    Conta.observadores_saldo.append(ranking)
+    # Saldos espelhados em memória compartilhada, para consultas de outros
+    # processos (python saldos_compartilhados.py).
+    try:
+        tabela_saldos = TabelaSaldos(nome=NOME_PADRAO, substituir=True)
+    except OSError as erro:
+        tabela_saldos = None
+        print(Fore.RED + f"\nTabela de saldos compartilhada indisponível: "
+              f"{erro}" + Style.RESET_ALL)
+    else:
+        Conta.observadores_saldo.append(tabela_saldos.publicar)
+    # Clientes e contas gravados na execução anterior, com saldos e
+    # contadores do dia reconstruídos do log de eventos antes de iniciar as
+    # threads de fundo.
+    clientes, agencias = carregar_banco()
+    parar_resumo = iniciar_resumo_periodico(ROOT_PATH / "metricas.log")
+
+    CLIENTES.definir_funcao(lambda: len(clientes))
+    CONTAS.definir_funcao(
+        lambda: sum(len(agencia) for agencia in list(agencias.values())))
+    Transacao.observadores_registro.append(DetectorFraude(
+        ao_alertar=alertar_fraude))
+    # Log de eventos: lido por `carregar_banco` na próxima execução.
+    log_eventos = LogEventos()
+    Transacao.observadores_registro.append(log_eventos)
+    # Consumidores das transações registradas, fora do caminho das
+    # transações: o diário grava cada transação em sua própria thread.
+    barramento = BarramentoEventos()
+    Transacao.observadores_registro.append(barramento)
+    diario = open(  # pylint: disable=consider-using-with
+        ROOT_PATH / "transacoes.log", "a", encoding="utf-8")
+    barramento.assinar("diario", lambda evento: diario.write(
+        formatar_instante(evento.instante, fuso_agencia(evento.agencia))
+        + f" {evento.agencia}/{evento.numero} {evento.tipo} "
+        f"{evento.valor:.2f}\n"), politica=DESCARTAR_ANTIGOS)
+    servidor_metricas = ServidorEmSegundoPlano(
+        porta=PORTA_PADRAO,
+        ao_falhar=lambda erro: print(
+            Fore.RED + f"\nMétricas indisponíveis na porta {PORTA_PADRAO}: "
+            f"{erro}" + Style.RESET_ALL))
+
+    # Perfilamento sob demanda: SIGUSR1 ou o comando oculto "p".
+    perfilador = Perfilador()
+    perfilador.instalar_sinal()
+    # Diagnóstico de memória: comando oculto "mem" (tracemalloc só é
+    # importado no primeiro uso).
+    diagnostico_memoria = None
 
     while True:
         opcao = menu()
@@ -809,18 +1579,96 @@ def main():
         elif opcao == "nu":
             # Criar Usuário
             criar_cliente(clientes)
+            gravar_clientes([cliente.para_dict() for cliente in clientes])
 
         elif opcao == "nc":
             # Nova Conta
-            numero_conta = len(contas) + 1
-            criar_conta(numero_conta, clientes, contas)
+            codigo = solicitar_agencia(
+                f"Informe a agência (Enter para {AGENCIA_PADRAO}): ")
+            if codigo is not None:
+                codigo = codigo or AGENCIA_PADRAO
+                if codigo not in agencias:
+                    agencias[codigo] = Agencia(codigo)
+                criar_conta(agencias[codigo], clientes)
+                agencias[codigo].snapshot()
 
         elif opcao == "lc":
             # Listar Contas
-            listar_contas(contas)
+            codigo = solicitar_agencia(
+                "Informe a agência (Enter para todas): ")
+            if codigo:
+                listar_contas(agencias.get(codigo, []))
+            elif codigo is not None:
+                for agencia in agencias.values():
+                    listar_contas(agencia)
+
+        elif opcao == "pc":
+            # Posição consolidada
+            exibir_posicao(clientes)
+
+        elif opcao == "r":
+            # Ranking de saldos
+            exibir_ranking(ranking)
+
+        elif opcao == "f":
+            # Fechamento do dia
+            # pylint: disable-next=import-outside-toplevel
+            from fechamento_dia import fechar_dia
+            # No próprio processo: as threads de fundo tornam o fork
+            # inseguro.
+            fechamentos = fechar_dia(agencias.values(), paralelo=False)
+            if not fechamentos:
+                print(Fore.RED + "\nNão há contas para fechar o dia."
+                      + Style.RESET_ALL)
+            for totais in fechamentos.values():
+                print(Fore.GREEN + f"\nAgência {totais['agencia']} fechada "
+                      f"em {totais['dia']}: {totais['contas']} contas, "
+                      f"saldo total R$ {totais['saldo_total']:.2f}, "
+                      f"{totais['transacoes']} transações no dia."
+                      + Style.RESET_ALL)
+
+        elif opcao == "a":
+            # Auditoria da cadeia de hashes dos históricos
+            # pylint: disable-next=import-outside-toplevel
+            from cadeia_hash import formatar_verificacao, verificar_contas
+            print("\n" + formatar_verificacao(verificar_contas(
+                [conta for agencia in agencias.values() for conta in agencia],
+                paralelo=False)))
+
+        elif opcao == "m":
+            # Métricas
+            imprimir_resumo()
+
+        elif opcao == "p":
+            # Perfilamento (comando oculto)
+            arquivos = perfilador.alternar()
+            if arquivos:
+                print(Fore.GREEN + "\nPerfil gravado em "
+                      f"{arquivos[0]} e {arquivos[1]}" + Style.RESET_ALL)
+            else:
+                print(Fore.GREEN + "\nPerfilamento iniciado."
+                      + Style.RESET_ALL)
+
+        elif opcao == "mem":
+            # Diagnóstico de memória (comando oculto)
+            if diagnostico_memoria is None:
+                # pylint: disable-next=import-outside-toplevel
+                from memoria import DiagnosticoMemoria
+                diagnostico_memoria = DiagnosticoMemoria(
+                    [sys.modules[__name__]])
+            print(diagnostico_memoria.executar(clientes))
 
         elif opcao == "q":
             # Sair
+            perfilador.parar()
+            gravar_banco(clientes, agencias)
+            parar_resumo.set()
+            servidor_metricas.encerrar()
+            barramento.encerrar()
+            diario.close()
+            log_eventos.fechar()
+            if tabela_saldos is not None:
+                tabela_saldos.fechar()
             print("Saindo do sistema...")
             break
 
@@ -0,0 +1,152 @@
+"""
+Detecção de fraude em fluxo: velocidade de saques e valores atípicos.
+
+`DetectorFraude` é um observador de `Transacao.observadores_registro`,
+chamado a cada saque ou depósito registrado. Para cada conta, guarda um
+estado de tamanho fixo:
+
+    * os instantes dos últimos `max_saques` saques (janela deslizante): se
+      todos couberem em `janela` segundos, a conta está sacando rápido
+      demais;
+    * média e variância do logaritmo dos valores, com decaimento
+      exponencial no tempo (meia-vida `meia_vida` segundos): um valor
+      muitos desvios acima da média da conta é atípico (com limiar mais
+      largo enquanto a conta tem poucas transações). Valores monetários
+      têm cauda longa; em escala logarítmica a distribuição fica próxima da
+      normal e os desvios-padrão passam a ser comparáveis entre contas.
+
+Cada transação custa O(1), sem percorrer o histórico da conta. Os alertas
+são guardados nos `alertas` mais recentes e repassados a `ao_alertar`.
+
+Exemplo:
+
+    detector = DetectorFraude(ao_alertar=print)
+    Transacao.observadores_registro.append(detector)
+"""
+from collections import deque
+from math import exp, log, sqrt
+
+# Saques que, dentro da janela, caracterizam velocidade suspeita.
+MAX_SAQUES_JANELA = 3
+JANELA_SAQUES_S = 600.0
+# Meia-vida das estatísticas de valor de cada conta (30 dias).
+MEIA_VIDA_S = 30 * 86400.0
+# Desvios-padrão (do logaritmo do valor) acima da média a partir dos quais
+# um valor é atípico.
+LIMIAR_DESVIOS = 5.0
+# Peso mínimo (transações recentes) para avaliar valores atípicos.
+PESO_MINIMO = 5.0
+# Alarga o limiar enquanto a conta tem poucas transações, em que a variância
+# estimada é ruidosa: LIMIAR_DESVIOS * (1 + PESO_CONFIANCA / peso), ou 15
+# desvios com peso 5, 7,5 com peso 20 e ~5,5 com peso 100.
+PESO_CONFIANCA = 10.0
+# Variância mínima do logaritmo (desvio-padrão de ~5%): contas com valores
+# sempre iguais não alertam por qualquer centavo a mais.
+VARIANCIA_MINIMA = 0.05 ** 2
+ALERTAS_GUARDADOS = 1000
+# Tipos de transação observados; um tipo fora do mapa (uma subclasse ou um
+# tipo renomeado) interrompe o registro com KeyError em vez de escapar da
+# regra de velocidade.
+SAQUE_POR_TIPO = {"Deposito": False, "Saque": True}
+
+
+class EstadoConta:
+    """
+    Estado do detector para uma conta, de tamanho fixo.
+
+    Atributos:
+        saques (deque): Instantes dos últimos saques.
+        peso (float): Soma dos pesos (decaídos) das transações vistas.
+        media (float): Média ponderada do logaritmo dos valores.
+        dispersao (float): Soma ponderada dos quadrados dos desvios.
+        ultimo (float): Instante da última transação vista.
+    """
+    __slots__ = ("saques", "peso", "media", "dispersao", "ultimo")
+
+    def __init__(self, max_saques):
+        self.saques = deque(maxlen=max_saques)
+        self.peso = 0.0
+        self.media = 0.0
+        self.dispersao = 0.0
+        self.ultimo = 0.0
+
+
+class DetectorFraude:
+    """
+    Observador de registro de transações que emite alertas de fraude.
+
+    Atributos:
+        estados (dict): EstadoConta de cada conta, indexado por
+        (agência, número).
+        alertas (deque): Alertas mais recentes.
+        ao_alertar (function | None): Função chamada com cada alerta.
+    """
+
+    def __init__(self, ao_alertar=None, max_saques=MAX_SAQUES_JANELA,
+                 janela=JANELA_SAQUES_S, meia_vida=MEIA_VIDA_S,
+                 limiar_desvios=LIMIAR_DESVIOS):
+        self.estados: dict = {}
+        self.alertas: deque = deque(maxlen=ALERTAS_GUARDADOS)
+        self.ao_alertar = ao_alertar
+        self.max_saques = max_saques
+        self.janela = janela
+        self.meia_vida = meia_vida
+        self.limiar_desvios = limiar_desvios
+
+    def __call__(self, conta, transacao, instante):
+        chave = (conta.agencia, conta.numero)
+        estado = self.estados.get(chave)
+        if estado is None:
+            estado = self.estados[chave] = EstadoConta(self.max_saques)
+        valor = transacao.valor
+        if valor <= 0:
+            return
+
+        if SAQUE_POR_TIPO[transacao.__class__.__name__]:
+            saques = estado.saques
+            saques.append(instante)
+            if (len(saques) == self.max_saques
+                    and instante - saques[0] <= self.janela):
+                self._alertar("velocidade_saques", chave, valor, instante,
+                              f"{self.max_saques} saques em "
+                              f"{instante - saques[0]:.0f} s")
+
+        # Média e variância ponderadas, com os pesos anteriores decaídos
+        # pelo tempo desde a última transação da conta.
+        amostra = log(valor)
+        peso = estado.peso
+        if peso:
+            peso *= 2.0 ** ((estado.ultimo - instante) / self.meia_vida)
+            desvio = amostra - estado.media
+            if peso >= PESO_MINIMO and desvio > 0:
+                variancia = max(estado.dispersao / estado.peso,
+                                VARIANCIA_MINIMA)
+                limiar = self.limiar_desvios * (1.0 + PESO_CONFIANCA / peso)
+                if desvio * desvio > limiar * limiar * variancia:
+                    self._alertar(
+                        "valor_atipico", chave, valor, instante,
+                        f"valor típico R$ {exp(estado.media):.2f}, "
+                        f"{desvio / sqrt(variancia):.1f} desvios acima")
+            fator = peso / estado.peso
+            novo_peso = peso + 1.0
+            estado.media += desvio / novo_peso
+            estado.dispersao = (estado.dispersao * fator
+                                + desvio * (amostra - estado.media))
+            estado.peso = novo_peso
+        else:
+            estado.peso = 1.0
+            estado.media = amostra
+        estado.ultimo = instante
+
+    def _alertar(self, regra, chave, valor, instante, detalhe):
+        alerta = {
+            "regra": regra,
+            "agencia": chave[0],
+            "numero": chave[1],
+            "valor": valor,
+            "instante": instante,
+            "detalhe": detalhe,
+        }
+        self.alertas.append(alerta)
+        if self.ao_alertar is not None:
+            self.ao_alertar(alerta)
@@ -0,0 +1,455 @@
+"""
+Exportação das métricas do banco no formato texto do Prometheus.
+
+O registro mantém contadores, medidores (gauges) e histogramas em memória.
+`iniciar_servidor` publica o registro em http://127.0.0.1:<porta>/metrics
+a partir de uma thread daemon, sem dependências externas.
+
+Métricas do sistema bancário:
+
+    banco_transacoes_total{tipo, resultado}       contador
+    banco_clientes                                medidor
+    banco_contas                                  medidor
+    banco_depositos_mantidos                      medidor (soma dos saldos)
+    banco_operacao_duracao_segundos{operacao}     histograma
+    banco_alertas_fraude_total{regra}             contador
+
+O histograma de latência não mede nada por conta própria: a cada coleta, é
+calculado a partir das latências que `metricas.medir_latencia` já registra,
+de modo que cada operação é cronometrada uma única vez. O rótulo `operacao`
+é o nome qualificado da função medida; operações aninhadas têm séries
+distintas (a de `Cliente.realizar_transacao` inclui a do `registrar` do
+saque ou do depósito, que aparece também em `Saque.registrar` ou
+`Deposito.registrar`).
+
+Exemplo:
+
+    servidor = iniciar_servidor(porta=9464)
+    ...
+    servidor.shutdown()
+"""
+import functools
+import threading
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+
+from metricas import estatisticas, limite_superior_faixa
+
+PORTA_PADRAO = 9464
+TIPO_CONTEUDO = "text/plain; version=0.0.4; charset=utf-8"
+# Limites (em segundos) das faixas dos histogramas de latência.
+FAIXAS_PADRAO = (0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005,
+                 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1)
+
+
+def _formatar_rotulos(nomes, valores, extra=""):
+    pares = [f'{nome}="{valor}"' for nome, valor in zip(nomes, valores)]
+    if extra:
+        pares.append(extra)
+    return "{" + ",".join(pares) + "}" if pares else ""
+
+
+def _formatar_numero(valor):
+    if valor == float("inf"):
+        return "+Inf"
+    return repr(float(valor)) if isinstance(valor, float) else str(valor)
+
+
+class Metrica(ABC):
+    """
+    Base das métricas do registro. Cada combinação de valores de rótulos
+    tem sua própria série.
+
+    Atributos:
+        nome (str): Nome da métrica.
+        descricao (str): Texto do HELP.
+        rotulos (tuple): Nomes dos rótulos.
+        series (dict): Valor de cada série, indexado pelos valores dos
+        rótulos.
+    """
+    tipo = ""
+
+    def __init__(self, nome, descricao, rotulos=()):
+        self.nome = nome
+        self.descricao = descricao
+        self.rotulos = tuple(rotulos)
+        self.series: dict = {}
+        self._trava = threading.Lock()
+
+    def _chave(self, valores_rotulos):
+        if len(valores_rotulos) != len(self.rotulos):
+            raise ValueError(
+                f"{self.nome} espera os rótulos {self.rotulos}.")
+        return tuple(valores_rotulos[nome] for nome in self.rotulos)
+
+    @abstractmethod
+    def _linhas_series(self):
+        """
+        Gera as linhas das séries da métrica no formato de exposição.
+        """
+
+    def exportar(self):
+        """
+        Formata a métrica no formato texto do Prometheus.
+
+        Returns:
+            str: Linhas HELP, TYPE e uma linha por série.
+        """
+        linhas = [f"# HELP {self.nome} {self.descricao}",
+                  f"# TYPE {self.nome} {self.tipo}"]
+        with self._trava:
+            linhas.extend(self._linhas_series())
+        return "\n".join(linhas)
+
+
+class Contador(Metrica):
+    """
+    Contador monotônico.
+    """
+    tipo = "counter"
+
+    def incrementar(self, quantidade=1, **valores_rotulos):
+        """
+        Soma `quantidade` à série dos rótulos informados.
+
+        Args:
+            quantidade (int | float): Valor a somar.
+            **valores_rotulos: Valor de cada rótulo da métrica.
+        """
+        chave = self._chave(valores_rotulos)
+        with self._trava:
+            self.series[chave] = self.series.get(chave, 0) + quantidade
+
+    def _linhas_series(self):
+        for chave, valor in self.series.items():
+            yield (f"{self.nome}{_formatar_rotulos(self.rotulos, chave)} "
+                   f"{_formatar_numero(valor)}")
+
+
+class Medidor(Metrica):
+    """
+    Medidor (gauge): valor que sobe e desce. Uma série pode ter o valor
+    calculado por uma função no momento da coleta.
+    """
+    tipo = "gauge"
+
+    def definir(self, valor, **valores_rotulos):
+        """
+        Define o valor da série dos rótulos informados.
+
+        Args:
+            valor (int | float): Novo valor.
+            **valores_rotulos: Valor de cada rótulo da métrica.
+        """
+        chave = self._chave(valores_rotulos)
+        with self._trava:
+            self.series[chave] = valor
+
+    def incrementar(self, quantidade=1, **valores_rotulos):
+        """
+        Soma `quantidade` (que pode ser negativa) à série dos rótulos
+        informados.
+
+        Args:
+            quantidade (int | float): Valor a somar.
+            **valores_rotulos: Valor de cada rótulo da métrica.
+        """
+        chave = self._chave(valores_rotulos)
+        with self._trava:
+            self.series[chave] = self.series.get(chave, 0) + quantidade
+
+    def definir_funcao(self, funcao, **valores_rotulos):
+        """
+        Calcula o valor da série chamando `funcao` a cada coleta.
+
+        Args:
+            funcao (function): Função sem argumentos que retorna o valor.
+            **valores_rotulos: Valor de cada rótulo da métrica.
+        """
+        chave = self._chave(valores_rotulos)
+        with self._trava:
+            self.series[chave] = funcao
+
+    def _linhas_series(self):
+        for chave, valor in self.series.items():
+            if callable(valor):
+                valor = valor()
+            yield (f"{self.nome}{_formatar_rotulos(self.rotulos, chave)} "
+                   f"{_formatar_numero(valor)}")
+
+
+class Histograma(Metrica):
+    """
+    Histograma com faixas cumulativas no estilo do Prometheus.
+
+    Atributos:
+        faixas (tuple): Limites superiores das faixas, em ordem crescente.
+    """
+    tipo = "histogram"
+
+    def __init__(self, nome, descricao, rotulos=(), faixas=FAIXAS_PADRAO):
+        super().__init__(nome, descricao, rotulos)
+        self.faixas = tuple(faixas)
+
+    def observar(self, valor, **valores_rotulos):
+        """
+        Registra uma observação na série dos rótulos informados.
+
+        Args:
+            valor (float): Valor observado.
+            **valores_rotulos: Valor de cada rótulo da métrica.
+        """
+        chave = self._chave(valores_rotulos)
+        with self._trava:
+            serie = self.series.get(chave)
+            if serie is None:
+                # Contagem por faixa (a última é +Inf) e soma.
+                serie = self.series[chave] = [[0] * (len(self.faixas) + 1), 0]
+            serie[0][bisect_left(self.faixas, valor)] += 1
+            serie[1] += valor
+
+    def _linhas_series(self):
+        limites = self.faixas + (float("inf"),)
+        for chave, (contagens, soma) in self.series.items():
+            acumulado = 0
+            for limite, contagem in zip(limites, contagens):
+                acumulado += contagem
+                rotulos = _formatar_rotulos(
+                    self.rotulos, chave, f'le="{_formatar_numero(limite)}"')
+                yield f"{self.nome}_bucket{rotulos} {acumulado}"
+            rotulos = _formatar_rotulos(self.rotulos, chave)
+            yield f"{self.nome}_sum{rotulos} {_formatar_numero(soma)}"
+            yield f"{self.nome}_count{rotulos} {acumulado}"
+
+
+class HistogramaFuncoes(Histograma):
+    """
+    Histograma das funções medidas por `metricas.medir_latencia`, calculado
+    a cada coleta a partir dos histogramas delas, sem um segundo relógio no
+    caminho das operações. Cada faixa log-linear é contada na primeira faixa
+    do Prometheus que contém o seu limite superior (erro relativo abaixo de
+    ~6%, o das faixas log-lineares).
+    """
+
+    def __init__(self, nome, descricao, faixas=FAIXAS_PADRAO):
+        super().__init__(nome, descricao, ("operacao",), faixas)
+
+    def _linhas_series(self):
+        limites_ns = [faixa * 1e9 for faixa in self.faixas]
+        series = {}
+        for nome, metricas in list(estatisticas.items()):
+            contagens = [0] * (len(self.faixas) + 1)
+            for indice, contagem in enumerate(metricas.histograma.contagens):
+                if contagem:
+                    contagens[bisect_left(
+                        limites_ns, limite_superior_faixa(indice))] += contagem
+            series[(nome,)] = [contagens, metricas.soma_ns / 1e9]
+        self.series = series
+        return super()._linhas_series()
+
+
+class RegistroMetricas:
+    """
+    Conjunto de métricas exportadas por um processo.
+
+    Atributos:
+        metricas (dict): Métricas registradas, indexadas pelo nome.
+    """
+
+    def __init__(self):
+        self.metricas: dict = {}
+
+    def registrar(self, metrica):
+        """
+        Adiciona uma métrica ao registro.
+
+        Args:
+            metrica (Metrica): Métrica a registrar.
+
+        Returns:
+            Metrica: A própria métrica.
+        """
+        if metrica.nome in self.metricas:
+            raise ValueError(f"Métrica {metrica.nome} já registrada.")
+        self.metricas[metrica.nome] = metrica
+        return metrica
+
+    def exportar(self):
+        """
+        Formata todas as métricas no formato texto do Prometheus.
+
+        Returns:
+            str: Conteúdo servido em /metrics.
+        """
+        return "\n".join(metrica.exportar()
+                         for metrica in self.metricas.values()) + "\n"
+
+
+# Registro padrão e métricas do sistema bancário.
+registro = RegistroMetricas()
+TRANSACOES = registro.registrar(Contador(
+    "banco_transacoes_total", "Transações por tipo e resultado.",
+    ("tipo", "resultado")))
+CLIENTES = registro.registrar(Medidor(
+    "banco_clientes", "Clientes cadastrados."))
+CONTAS = registro.registrar(Medidor(
+    "banco_contas", "Contas abertas."))
+DEPOSITOS_MANTIDOS = registro.registrar(Medidor(
+    "banco_depositos_mantidos", "Soma dos saldos de todas as contas."))
+DURACAO_OPERACOES = registro.registrar(HistogramaFuncoes(
+    "banco_operacao_duracao_segundos",
+    "Latência das operações, em segundos."))
+ALERTAS_FRAUDE = registro.registrar(Contador(
+    "banco_alertas_fraude_total", "Alertas do detector de fraude por regra.",
+    ("regra",)))
+
+
+def observar_transacao(func):
+    """
+    Decorator para `Transacao.registrar`: conta a transação pelo tipo e
+    pelo resultado (aceita ou recusada). A latência vem de
+    `metricas.medir_latencia`.
+
+    Args:
+        func (function): O método `registrar` de uma transação.
+
+    Returns:
+        function: O método envolvido.
+    """
+
+    @functools.wraps(func)
+    def envelope(transacao, conta, instante=None):
+        sucesso = func(transacao, conta, instante)
+        TRANSACOES.incrementar(
+            tipo=transacao.__class__.__name__.lower(),
+            resultado="aceita" if sucesso else "recusada")
+        return sucesso
+
+    return envelope
+
+
+class AcompanhamentoSaldos:
+    """
+    Observador de saldo que mantém `banco_depositos_mantidos` atualizado em
+    O(1) por alteração, guardando o último saldo visto de cada conta.
+    Deve ser registrado em `Conta.observadores_saldo`.
+
+    Atributos:
+        saldos (dict): Último saldo de cada conta, indexado por
+        (agência, número).
+    """
+
+    def __init__(self, medidor=DEPOSITOS_MANTIDOS):
+        self.medidor = medidor
+        self.saldos: dict = {}
+
+    def __call__(self, conta):
+        chave = (conta.agencia, conta.numero)
+        anterior = self.saldos.get(chave, 0)
+        self.saldos[chave] = conta.saldo
+        self.medidor.incrementar(conta.saldo - anterior)
+
+
+def _criar_manipulador(registro_metricas):
+    # http.server é importado só quando o servidor sobe: o módulo pesa na
+    # inicialização do menu.
+    # pylint: disable-next=import-outside-toplevel
+    from http.server import BaseHTTPRequestHandler
+
+    class ManipuladorMetricas(BaseHTTPRequestHandler):
+        """
+        Responde /metrics com o conteúdo do registro.
+        """
+
+        def do_GET(self):  # pylint: disable=invalid-name
+            """
+            Responde /metrics com o conteúdo do registro.
+            """
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+
+            corpo = registro_metricas.exportar().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", TIPO_CONTEUDO)
+            self.send_header("Content-Length", str(len(corpo)))
+            self.end_headers()
+            self.wfile.write(corpo)
+
+        def log_message(self, format, *args):  # pylint: disable=W0622
+            """
+            Não imprime as requisições no terminal do menu.
+            """
+
+    return ManipuladorMetricas
+
+
+def iniciar_servidor(registro_metricas=registro, porta=PORTA_PADRAO,
+                     endereco="127.0.0.1"):
+    """
+    Serve o registro em http://<endereco>:<porta>/metrics a partir de uma
+    thread daemon.
+
+    Args:
+        registro_metricas (RegistroMetricas): Registro a publicar.
+        porta (int): Porta HTTP (0 escolhe uma porta livre).
+        endereco (str): Endereço de escuta.
+
+    Returns:
+        ThreadingHTTPServer: Servidor em execução (`shutdown()` encerra).
+
+    Raises:
+        OSError: Se a porta não puder ser aberta.
+    """
+    # pylint: disable-next=import-outside-toplevel
+    from http.server import ThreadingHTTPServer
+
+    servidor = ThreadingHTTPServer((endereco, porta),
+                                   _criar_manipulador(registro_metricas))
+    servidor.daemon_threads = True
+    threading.Thread(target=servidor.serve_forever, name="servidor-metricas",
+                     daemon=True).start()
+    return servidor
+
+
+class ServidorEmSegundoPlano:
+    """
+    Sobe o servidor de métricas em uma thread, sem atrasar o primeiro
+    prompt do menu.
+
+    Atributos:
+        servidor (ThreadingHTTPServer | None): Servidor, depois de no ar.
+        erro (OSError | None): Erro ao abrir a porta, se houver.
+    """
+
+    def __init__(self, ao_falhar=None, **opcoes):
+        """
+        Args:
+            ao_falhar (function, optional): Chamada com o OSError se a porta
+            não puder ser aberta.
+            **opcoes: Argumentos de `iniciar_servidor`.
+        """
+        self.servidor = None
+        self.erro = None
+        self._ao_falhar = ao_falhar
+        self._thread = threading.Thread(
+            target=self._iniciar, kwargs=opcoes,
+            name="inicio-servidor-metricas", daemon=True)
+        self._thread.start()
+
+    def _iniciar(self, **opcoes):
+        try:
+            self.servidor = iniciar_servidor(**opcoes)
+        except OSError as erro:
+            self.erro = erro
+            if self._ao_falhar:
+                self._ao_falhar(erro)
+
+    def encerrar(self):
+        """
+        Aguarda a inicialização terminar e encerra o servidor.
+        """
+        self._thread.join()
+        if self.servidor:
+            self.servidor.shutdown()
+            self.servidor.server_close()
@@ -0,0 +1,276 @@
+"""
+Fechamento do dia: saldos de fechamento e totais diários das contas.
+
+O fechamento percorre uma única vez as contas correntes de cada agência e
+grava, em uma tabela colunar compacta (`array.array`, sem um dict por
+conta), o saldo de fechamento e os totais do dia de cada conta. Os totais
+vêm dos contadores diários do histórico (`Historico.uso_do_dia`), mantidos a
+cada transação, e o saldo é o do fim do dia fechado (`Historico.saldo_em`,
+a partir dos marcos de saldo), de modo que nenhuma conta tem o histórico
+percorrido e fechar um dia passado, ou depois de novas transações, grava os
+valores daquele dia.
+
+Cada agência é uma partição: com o método "fork" disponível e o processo sem
+outras threads, as agências são fechadas em paralelo, uma por processo, e
+cada processo grava a tabela da sua agência em
+`fechamentos/<dia>/<agencia>.fch`.
+
+O fechamento não altera as contas: os contadores diários passam para o dia
+seguinte sozinhos, na virada do dia local do fuso da agência
+(`Historico.uso_do_dia` recomeça a contagem ao receber um instante fora do
+dia contado), com ou sem fechamento.
+
+Exemplo:
+
+    resumos = fechar_dia(agencias.values())
+"""
+import math
+import multiprocessing
+import struct
+import sys
+import threading
+from array import array
+from datetime import date
+from pathlib import Path
+
+from relogio import relogio_atual
+
+ROOT_PATH = Path(__file__).parent
+DIRETORIO_FECHAMENTOS = ROOT_PATH / "fechamentos"
+
+COLUNAS = (
+    ("numero", "q"),
+    ("saldo", "d"),
+    ("depositos", "d"),
+    ("saques", "d"),
+    ("transacoes", "I"),
+)
+# Identificador, código da agência, ordinal do dia e número de linhas.
+CABECALHO = struct.Struct("<4s4sIQ")
+IDENTIFICADOR = b"FCH1"
+
+# Contas das agências sendo fechadas, herdadas pelos processos filhos no fork
+# (as contas não são serializadas para os processos).
+_particoes: dict = {}
+
+
+class TabelaFechamento:
+    """
+    Saldos de fechamento e totais do dia das contas de uma agência,
+    armazenados por coluna.
+
+    Atributos:
+        agencia (str): Código da agência.
+        dia (date): Dia local fechado.
+        colunas (dict): `array.array` de cada coluna, indexados pelo nome.
+    """
+
+    def __init__(self, agencia, dia):
+        self.agencia = agencia
+        self.dia = dia
+        self.colunas = {nome: array(tipo) for nome, tipo in COLUNAS}
+
+    def __len__(self):
+        return len(self.colunas["numero"])
+
+    def __repr__(self) -> str:
+        return (f"<{self.__class__.__name__}: ('{self.agencia}', "
+                f"{self.dia.isoformat()}, {len(self)})>")
+
+    def adicionar(self, numero, saldo, uso):
+        """
+        Acrescenta a linha de uma conta.
+
+        Args:
+            numero (int): Número da conta.
+            saldo (float): Saldo de fechamento.
+            uso (UsoDiario): Contadores do dia da conta.
+        """
+        colunas = self.colunas
+        colunas["numero"].append(numero)
+        colunas["saldo"].append(saldo)
+        colunas["depositos"].append(uso.depositos)
+        colunas["saques"].append(uso.saques)
+        colunas["transacoes"].append(uso.quantidade)
+
+    def linhas(self):
+        """
+        Percorre as linhas da tabela.
+
+        Returns:
+            iterator: Tuplas (numero, saldo, depositos, saques, transacoes).
+        """
+        return zip(*(self.colunas[nome] for nome, _ in COLUNAS))
+
+    def totais(self):
+        """
+        Totaliza a tabela.
+
+        Returns:
+            dict: Contas, saldo total, depósitos, saques e transações do dia.
+        """
+        return {
+            "agencia": self.agencia,
+            "dia": self.dia.isoformat(),
+            "contas": len(self),
+            "saldo_total": sum(self.colunas["saldo"]),
+            "depositos": sum(self.colunas["depositos"]),
+            "saques": sum(self.colunas["saques"]),
+            "transacoes": sum(self.colunas["transacoes"]),
+        }
+
+    def gravar(self, caminho):
+        """
+        Grava a tabela em formato binário (cabeçalho seguido das colunas em
+        little-endian).
+
+        Args:
+            caminho (Path): Arquivo de destino.
+
+        Returns:
+            Path: Caminho gravado.
+        """
+        caminho = Path(caminho)
+        caminho.parent.mkdir(parents=True, exist_ok=True)
+        with open(caminho, "wb") as arquivo:
+            arquivo.write(CABECALHO.pack(
+                IDENTIFICADOR, self.agencia.encode("ascii"),
+                self.dia.toordinal(), len(self)))
+            for nome, _ in COLUNAS:
+                coluna = self.colunas[nome]
+                if sys.byteorder != "little":
+                    coluna = array(coluna.typecode, coluna)
+                    coluna.byteswap()
+                coluna.tofile(arquivo)
+        return caminho
+
+    @classmethod
+    def carregar(cls, caminho):
+        """
+        Lê uma tabela gravada por `gravar`.
+
+        Args:
+            caminho (Path): Arquivo da tabela.
+
+        Returns:
+            TabelaFechamento: Tabela lida.
+
+        Raises:
+            ValueError: Se o arquivo não for uma tabela de fechamento.
+        """
+        with open(caminho, "rb") as arquivo:
+            identificador, agencia, ordinal, linhas = CABECALHO.unpack(
+                arquivo.read(CABECALHO.size))
+            if identificador != IDENTIFICADOR:
+                raise ValueError(
+                    f"Arquivo de fechamento inválido: {caminho}")
+            tabela = cls(agencia.decode("ascii"), date.fromordinal(ordinal))
+            for nome, _ in COLUNAS:
+                coluna = tabela.colunas[nome]
+                coluna.fromfile(arquivo, linhas)
+                if sys.byteorder != "little":
+                    coluna.byteswap()
+        return tabela
+
+
+def fechar_contas(codigo, contas, instante):
+    """
+    Monta a tabela de fechamento de uma agência, sem alterar as contas.
+
+    Args:
+        codigo (str): Código da agência.
+        contas (iterable): Contas correntes da agência.
+        instante (float): Instante UTC dentro do dia a fechar.
+
+    Returns:
+        TabelaFechamento | None: Tabela do dia, ou None se não houver contas.
+    """
+    tabela = None
+    for conta in contas:
+        historico = conta.historico
+        if tabela is None:
+            tabela = TabelaFechamento(
+                codigo, historico.fronteiras.dia(instante))
+            # Último instante do dia: `saldo_em` inclui o próprio instante,
+            # e o fim do dia já pertence ao dia seguinte.
+            _, fim = historico.fronteiras.limites(instante)
+            ultimo_instante = math.nextafter(fim, -math.inf)
+        tabela.adicionar(conta.numero, historico.saldo_em(ultimo_instante),
+                         historico.uso_do_dia(instante))
+    return tabela
+
+
+def caminho_fechamento(codigo, dia, diretorio=DIRETORIO_FECHAMENTOS):
+    """
+    Retorna o arquivo da tabela de fechamento de uma agência em um dia.
+
+    Args:
+        codigo (str): Código da agência.
+        dia (date): Dia local fechado.
+        diretorio (Path): Diretório dos fechamentos.
+
+    Returns:
+        Path: Caminho da tabela.
+    """
+    return Path(diretorio) / dia.isoformat() / f"{codigo}.fch"
+
+
+def _fechar_particao(codigo, instante, diretorio):
+    tabela = fechar_contas(codigo, _particoes[codigo], instante)
+    if tabela is None:
+        return None
+    tabela.gravar(caminho_fechamento(codigo, tabela.dia, diretorio))
+    return tabela.totais()
+
+
+def fechar_dia(agencias, instante=None, diretorio=DIRETORIO_FECHAMENTOS,
+               max_workers=None, paralelo=True):
+    """
+    Fecha o dia de todas as agências: grava a tabela de fechamento de cada
+    uma.
+
+    Args:
+        agencias (iterable): Agências a fechar.
+        instante (float, optional): Instante UTC dentro do dia a fechar; por
+        padrão, o atual.
+        diretorio (Path): Diretório dos fechamentos.
+        max_workers (int, optional): Número de processos. Se None, usa o
+        número de núcleos disponíveis.
+        paralelo (bool): Se False, fecha as agências no próprio processo
+        (também o caso quando há outras threads em execução).
+
+    Returns:
+        dict: Totais de cada agência fechada, indexados pelo código.
+    """
+    if instante is None:
+        instante = relogio_atual().instante()
+    agencias = [agencia for agencia in agencias if len(agencia)]
+    _particoes.update(
+        (agencia.codigo, list(agencia)) for agencia in agencias)
+    codigos = [agencia.codigo for agencia in agencias]
+
+    try:
+        # O fork só é seguro em um processo sem outras threads (no menu, já
+        # rodam o servidor de métricas, o resumo periódico e os assinantes
+        # do barramento): caso contrário, fecha no próprio processo.
+        if (paralelo and len(codigos) > 1
+                and threading.active_count() == 1
+                and "fork" in multiprocessing.get_all_start_methods()):
+            # Importado aqui: o pool de processos só é usado pelas rotinas em
+            # lote e pesa na inicialização do menu.
+            # pylint: disable-next=import-outside-toplevel
+            from concurrent.futures import ProcessPoolExecutor
+
+            contexto = multiprocessing.get_context("fork")
+            with ProcessPoolExecutor(max_workers=max_workers,
+                                     mp_context=contexto) as executor:
+                resultados = list(executor.map(
+                    _fechar_particao, codigos, [instante] * len(codigos),
+                    [diretorio] * len(codigos)))
+        else:
+            resultados = [_fechar_particao(codigo, instante, diretorio)
+                          for codigo in codigos]
+    finally:
+        _particoes.clear()
+
+    return dict(zip(codigos, resultados))
@@ -0,0 +1,370 @@
+"""
+Log de eventos das transações e projeções reconstruídas a partir dele.
+
+`LogEventos` é um observador de `Transacao.observadores_registro`: cada
+saque ou depósito registrado é acrescentado, em registro binário de tamanho
+fixo, ao log da agência da conta (`eventos/<agencia>.evt`). O log só recebe
+acréscimos e é a fonte da verdade do estado das contas; saldos, contadores
+do dia e posições por cliente são projeções calculadas a partir dele.
+
+Cada agência é uma partição: `reconstruir_projecoes` lê os logs em
+paralelo, um por processo, e reduz cada um com NumPy (`numpy.bincount` por
+número de conta). O processo principal junta as partições e agrega as
+contas por cliente.
+
+O NumPy é importado apenas quando as projeções são reconstruídas.
+
+Exemplo:
+
+    log = LogEventos()
+    Transacao.observadores_registro.append(log)
+    ...
+    log.fechar()
+    projecoes = reconstruir_projecoes()
+    projecoes.saldo("0001", 42)
+    restaurar_contas(agencias.values(), projecoes)
+"""
+import struct
+from pathlib import Path
+
+from fusos import fronteiras_agencia
+from relogio import relogio_atual
+
+ROOT_PATH = Path(__file__).parent
+DIRETORIO_EVENTOS = ROOT_PATH / "eventos"
+EXTENSAO = ".evt"
+
+# tipo (0 depósito, 1 saque), número da conta, CPF do titular, valor e
+# instante UTC; little-endian, sem alinhamento.
+REGISTRO = struct.Struct("<Bqqdd")
+CAMPOS_REGISTRO = (("tipo", "u1"), ("numero", "<i8"), ("cpf", "<i8"),
+                   ("valor", "<f8"), ("instante", "<f8"))
+CODIGOS_TIPO = {"Deposito": 0, "Saque": 1}
+# Bytes acumulados por agência antes de gravar no arquivo (0 grava cada
+# evento imediatamente).
+TAMANHO_BUFFER_PADRAO = 0
+
+
+class LogEventos:
+    """
+    Log de eventos das transações, um arquivo por agência.
+
+    Atributos:
+        diretorio (Path): Diretório dos logs.
+        tamanho_buffer (int): Bytes acumulados por agência antes de gravar.
+        _arquivos (dict): Arquivo aberto de cada agência.
+        _buffers (dict): Registros ainda não gravados de cada agência.
+        _cpfs (dict): CPF numérico de cada CPF informado (cache).
+    """
+
+    def __init__(self, diretorio=DIRETORIO_EVENTOS,
+                 tamanho_buffer=TAMANHO_BUFFER_PADRAO):
+        self.diretorio = Path(diretorio)
+        self.tamanho_buffer = tamanho_buffer
+        self._arquivos: dict = {}
+        self._buffers: dict = {}
+        self._cpfs: dict = {}
+
+    def __call__(self, conta, transacao, instante):
+        cpf = conta.cliente.cpf
+        cpf_numerico = self._cpfs.get(cpf)
+        if cpf_numerico is None:
+            cpf_numerico = self._cpfs[cpf] = int(
+                "".join(filter(str.isdigit, cpf)) or 0)
+
+        agencia = conta.agencia
+        buffer = self._buffers.get(agencia)
+        if buffer is None:
+            buffer = self._buffers[agencia] = bytearray()
+        buffer += REGISTRO.pack(CODIGOS_TIPO[transacao.__class__.__name__],
+                                conta.numero, cpf_numerico, transacao.valor,
+                                instante)
+        if len(buffer) > self.tamanho_buffer:
+            self._gravar(agencia, buffer)
+
+    def caminho(self, agencia):
+        """
+        Retorna o arquivo do log de uma agência.
+
+        Args:
+            agencia (str): Código da agência.
+
+        Returns:
+            Path: Arquivo do log.
+        """
+        return self.diretorio / f"{agencia}{EXTENSAO}"
+
+    def _gravar(self, agencia, buffer):
+        arquivo = self._arquivos.get(agencia)
+        if arquivo is None:
+            self.diretorio.mkdir(parents=True, exist_ok=True)
+            arquivo = self._arquivos[agencia] = open(  # pylint: disable=R1732
+                self.caminho(agencia), "ab")
+        arquivo.write(buffer)
+        arquivo.flush()
+        buffer.clear()
+
+    def descarregar(self):
+        """
+        Grava os registros acumulados de todas as agências.
+        """
+        for agencia, buffer in self._buffers.items():
+            if buffer:
+                self._gravar(agencia, buffer)
+
+    def fechar(self):
+        """
+        Grava os registros acumulados e fecha os arquivos.
+        """
+        self.descarregar()
+        for arquivo in self._arquivos.values():
+            arquivo.close()
+        self._arquivos.clear()
+
+
+def tipo_registro():
+    """
+    Retorna o tipo NumPy estruturado equivalente a REGISTRO.
+
+    Returns:
+        numpy.dtype: Tipo de um registro do log.
+    """
+    # pylint: disable-next=import-outside-toplevel
+    import numpy as np
+
+    return np.dtype(list(CAMPOS_REGISTRO))
+
+
+def projetar_particao(caminho, inicio_dia, fim_dia):
+    """
+    Reduz o log de uma agência às projeções das suas contas.
+
+    Args:
+        caminho (Path): Arquivo do log da agência.
+        inicio_dia (float): Início do dia local das contagens, em UTC.
+        fim_dia (float): Fim (exclusivo) do dia local, em UTC.
+
+    Returns:
+        dict: Arrays alinhados pelas contas com eventos: "numero", "cpf",
+        "saldo", "depositos_dia", "saques_dia", "transacoes_dia" e
+        "saques_quantidade_dia".
+    """
+    # pylint: disable-next=import-outside-toplevel
+    import numpy as np
+
+    eventos = np.fromfile(caminho, dtype=tipo_registro())
+    numeros = eventos["numero"]
+    tamanho = int(numeros.max()) + 1 if len(eventos) else 0
+    saque = eventos["tipo"] == CODIGOS_TIPO["Saque"]
+    valores = eventos["valor"]
+
+    quantidades = np.bincount(numeros, minlength=tamanho)
+    saldos = np.bincount(numeros, weights=np.where(saque, -valores, valores),
+                         minlength=tamanho)
+    cpfs = np.zeros(tamanho, dtype=np.int64)
+    cpfs[numeros] = eventos["cpf"]
+
+    hoje = ((eventos["instante"] >= inicio_dia)
+            & (eventos["instante"] < fim_dia))
+    numeros_hoje = numeros[hoje]
+    saques_hoje = saque[hoje]
+    valores_hoje = valores[hoje]
+    transacoes_dia = np.bincount(numeros_hoje, minlength=tamanho)
+    saques_quantidade_dia = np.bincount(numeros_hoje[saques_hoje],
+                                        minlength=tamanho)
+    saques_dia = np.bincount(numeros_hoje,
+                             weights=np.where(saques_hoje, valores_hoje, 0.0),
+                             minlength=tamanho)
+    depositos_dia = np.bincount(
+        numeros_hoje, weights=np.where(saques_hoje, 0.0, valores_hoje),
+        minlength=tamanho)
+
+    contas = np.flatnonzero(quantidades)
+    return {
+        "numero": contas,
+        "cpf": cpfs[contas],
+        "saldo": saldos[contas],
+        "depositos_dia": depositos_dia[contas],
+        "saques_dia": saques_dia[contas],
+        "transacoes_dia": transacoes_dia[contas],
+        "saques_quantidade_dia": saques_quantidade_dia[contas],
+    }
+
+
+class Projecoes:
+    """
+    Projeções reconstruídas do log de eventos.
+
+    Atributos:
+        contas (dict): Projeção das contas de cada agência (resultado de
+        `projetar_particao`), indexada pelo código.
+        limites (dict): Início e fim (UTC) do dia local das contagens
+        diárias de cada agência.
+        clientes (dict): Arrays alinhados pelos clientes: "cpf", "saldo",
+        "depositos_dia", "saques_dia" e "transacoes_dia".
+    """
+
+    def __init__(self, contas, limites):
+        # pylint: disable-next=import-outside-toplevel
+        import numpy as np
+
+        self.contas = contas
+        self.limites = limites
+        campos = ("saldo", "depositos_dia", "saques_dia", "transacoes_dia")
+        todas = {campo: np.concatenate(
+            [particao[campo] for particao in contas.values()]
+            or [np.zeros(0)]) for campo in ("cpf", *campos)}
+        cpfs, grupos = np.unique(todas["cpf"].astype(np.int64),
+                                 return_inverse=True)
+        self.clientes = {"cpf": cpfs} | {
+            campo: np.bincount(grupos, weights=todas[campo],
+                               minlength=len(cpfs))
+            for campo in campos}
+
+    def _posicao(self, arrays, chave, valor):
+        # pylint: disable-next=import-outside-toplevel
+        import numpy as np
+
+        posicao = int(np.searchsorted(arrays[chave], valor))
+        if posicao < len(arrays[chave]) and arrays[chave][posicao] == valor:
+            return posicao
+        return None
+
+    def saldo(self, agencia, numero):
+        """
+        Retorna o saldo projetado de uma conta.
+
+        Args:
+            agencia (str): Código da agência.
+            numero (int): Número da conta.
+
+        Returns:
+            float: Saldo (0 se a conta não tiver eventos).
+        """
+        particao = self.contas.get(agencia)
+        if particao is None:
+            return 0.0
+        posicao = self._posicao(particao, "numero", numero)
+        return 0.0 if posicao is None else float(particao["saldo"][posicao])
+
+    def uso_do_dia(self, agencia, numero):
+        """
+        Retorna os contadores do dia projetados de uma conta.
+
+        Args:
+            agencia (str): Código da agência.
+            numero (int): Número da conta.
+
+        Returns:
+            dict: "quantidade", "depositos", "saques" e "saques_quantidade"
+            do dia (zerados se a conta não tiver eventos).
+        """
+        particao = self.contas.get(agencia)
+        posicao = (None if particao is None
+                   else self._posicao(particao, "numero", numero))
+        if posicao is None:
+            return {"quantidade": 0, "depositos": 0.0, "saques": 0.0,
+                    "saques_quantidade": 0}
+        return {
+            "quantidade": int(particao["transacoes_dia"][posicao]),
+            "depositos": float(particao["depositos_dia"][posicao]),
+            "saques": float(particao["saques_dia"][posicao]),
+            "saques_quantidade": int(
+                particao["saques_quantidade_dia"][posicao]),
+        }
+
+    def posicao_cliente(self, cpf):
+        """
+        Retorna a posição projetada de um cliente.
+
+        Args:
+            cpf (int): CPF numérico do cliente.
+
+        Returns:
+            dict | None: Saldo total e depósitos, saques e transações do
+            dia, ou None se o cliente não tiver eventos.
+        """
+        posicao = self._posicao(self.clientes, "cpf", cpf)
+        if posicao is None:
+            return None
+        return {
+            "saldo_total": float(self.clientes["saldo"][posicao]),
+            "depositos_dia": float(self.clientes["depositos_dia"][posicao]),
+            "saques_dia": float(self.clientes["saques_dia"][posicao]),
+            "transacoes_dia": int(self.clientes["transacoes_dia"][posicao]),
+        }
+
+
+def reconstruir_projecoes(diretorio=DIRETORIO_EVENTOS, instante=None,
+                          max_workers=None, paralelo=True):
+    """
+    Reconstrói as projeções a partir dos logs de todas as agências.
+
+    Args:
+        diretorio (Path): Diretório dos logs.
+        instante (float, optional): Instante UTC que define o dia das
+        contagens diárias; por padrão, o atual.
+        max_workers (int, optional): Número de processos. Se None, usa o
+        número de núcleos disponíveis.
+        paralelo (bool): Se False, reduz as partições no próprio processo.
+
+    Returns:
+        Projecoes: Projeções das contas e dos clientes.
+    """
+    if instante is None:
+        instante = relogio_atual().instante()
+    caminhos = sorted(Path(diretorio).glob(f"*{EXTENSAO}"))
+    codigos = [caminho.stem for caminho in caminhos]
+    limites = [fronteiras_agencia(codigo).limites(instante)
+               for codigo in codigos]
+    inicios = [inicio for inicio, _ in limites]
+    fins = [fim for _, fim in limites]
+
+    if paralelo and len(caminhos) > 1:
+        # Importado aqui: o pool de processos só é usado pelas rotinas em
+        # lote e pesa na inicialização do menu.
+        # pylint: disable-next=import-outside-toplevel
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            particoes = list(executor.map(projetar_particao, caminhos,
+                                          inicios, fins))
+    else:
+        particoes = list(map(projetar_particao, caminhos, inicios, fins))
+
+    return Projecoes(dict(zip(codigos, particoes)),
+                     dict(zip(codigos, limites)))
+
+
+def restaurar_contas(agencias, projecoes):
+    """
+    Restaura o estado das contas a partir das projeções (o log de eventos é
+    a fonte da verdade): saldo, contadores do dia e, em seguida, a posição
+    consolidada dos titulares.
+
+    Args:
+        agencias (iterable): Agências cujas contas serão restauradas.
+        projecoes (Projecoes): Projeções reconstruídas.
+
+    Returns:
+        int: Quantidade de contas cujo saldo foi alterado.
+    """
+    alteradas = 0
+    clientes = {}
+    for agencia in agencias:
+        limites = projecoes.limites.get(agencia.codigo)
+        for conta in agencia:
+            saldo = projecoes.saldo(agencia.codigo, conta.numero)
+            if saldo != conta.saldo:
+                conta._saldo = saldo  # pylint: disable=protected-access
+                conta._notificar_saldo()  # pylint: disable=protected-access
+                alteradas += 1
+            if limites is not None:
+                conta.historico.definir_uso_do_dia(
+                    *limites, projecoes.uso_do_dia(agencia.codigo,
+                                                   conta.numero))
+            clientes[id(conta.cliente)] = conta.cliente
+
+    for cliente in clientes.values():
+        cliente.posicao.recalcular(cliente.contas)
+    return alteradas
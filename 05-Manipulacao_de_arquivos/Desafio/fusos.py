@@ -0,0 +1,191 @@
+"""
+Fusos horários das agências e fronteiras do dia local.
+
+As transações são gravadas como instantes UTC (segundos desde a época Unix).
+O "dia" de uma transação, usado no limite diário e no extrato, é o dia local
+do fuso da agência da conta.
+
+Para que o caminho crítico nunca monte datetimes com fuso, `FronteirasDia`
+pré-calcula as meias-noites locais de um fuso, em instantes UTC, para uma
+janela de dias. Descobrir o início do dia de um instante é então uma busca
+binária em uma lista de floats; a janela só é recalculada quando o instante
+sai dela.
+
+Exemplo:
+
+    definir_fuso_agencia("0002", "America/Manaus")
+    inicio, fim = fronteiras_agencia("0002").limites(time.time())
+"""
+import functools
+from bisect import bisect_right
+from datetime import date, datetime, timedelta
+from zoneinfo import ZoneInfo
+
+FUSO_PADRAO = "America/Sao_Paulo"
+# Dias pré-calculados antes e depois do instante que motivou o cálculo.
+DIAS_ANTES = 31
+DIAS_DEPOIS = 400
+
+_fusos_agencias: dict = {}
+
+
+@functools.lru_cache(maxsize=None)
+def zona(nome):
+    """
+    Retorna o fuso horário pelo nome IANA, consultando a base de fusos uma
+    única vez por nome.
+
+    Args:
+        nome (str): Nome do fuso (por exemplo, "America/Sao_Paulo").
+
+    Returns:
+        ZoneInfo: Fuso horário.
+    """
+    return ZoneInfo(nome)
+
+
+def definir_fuso_agencia(codigo, nome):
+    """
+    Associa um fuso horário a uma agência.
+
+    Args:
+        codigo (str): Código da agência.
+        nome (str): Nome IANA do fuso.
+
+    Raises:
+        zoneinfo.ZoneInfoNotFoundError: Se o fuso não existir.
+    """
+    zona(nome)
+    _fusos_agencias[codigo] = nome
+
+
+def fuso_agencia(codigo):
+    """
+    Retorna o nome do fuso horário de uma agência.
+
+    Args:
+        codigo (str): Código da agência.
+
+    Returns:
+        str: Nome IANA do fuso (FUSO_PADRAO se não houver um definido).
+    """
+    return _fusos_agencias.get(codigo, FUSO_PADRAO)
+
+
+class FronteirasDia:
+    """
+    Meias-noites locais de um fuso, pré-calculadas como instantes UTC.
+
+    Atributos:
+        nome (str): Nome IANA do fuso.
+    """
+
+    def __init__(self, nome):
+        self.nome = nome
+        # (ordinal do primeiro dia da janela, meias-noites em instantes UTC)
+        self._janela = (0, [])
+
+    def _calcular_janela(self, instante):
+        fuso = zona(self.nome)
+        centro = datetime.fromtimestamp(instante, fuso).date()
+        primeiro = centro - timedelta(days=DIAS_ANTES)
+        meias_noites = [
+            datetime.combine(primeiro + timedelta(days=deslocamento),
+                             datetime.min.time(), fuso).timestamp()
+            for deslocamento in range(DIAS_ANTES + DIAS_DEPOIS + 1)
+        ]
+        self._janela = (primeiro.toordinal(), meias_noites)
+        return self._janela
+
+    def _posicao(self, instante):
+        primeiro, meias_noites = self._janela
+        posicao = bisect_right(meias_noites, instante) - 1
+        if not 0 <= posicao < len(meias_noites) - 1:
+            primeiro, meias_noites = self._calcular_janela(instante)
+            posicao = bisect_right(meias_noites, instante) - 1
+        return primeiro, meias_noites, posicao
+
+    def limites(self, instante):
+        """
+        Retorna o início e o fim do dia local que contém o instante.
+
+        Args:
+            instante (float): Instante UTC, em segundos.
+
+        Returns:
+            tuple: (início, fim) do dia, em instantes UTC; o fim é exclusivo.
+        """
+        _, meias_noites, posicao = self._posicao(instante)
+        return meias_noites[posicao], meias_noites[posicao + 1]
+
+    def dia(self, instante):
+        """
+        Retorna a data local de um instante.
+
+        Args:
+            instante (float): Instante UTC, em segundos.
+
+        Returns:
+            date: Data no fuso.
+        """
+        primeiro, _, posicao = self._posicao(instante)
+        return date.fromordinal(primeiro + posicao)
+
+
+@functools.lru_cache(maxsize=None)
+def fronteiras_fuso(nome):
+    """
+    Retorna as fronteiras de dia compartilhadas de um fuso.
+
+    Args:
+        nome (str): Nome IANA do fuso.
+
+    Returns:
+        FronteirasDia: Fronteiras do fuso.
+    """
+    return FronteirasDia(nome)
+
+
+def fronteiras_agencia(codigo):
+    """
+    Retorna as fronteiras de dia do fuso de uma agência.
+
+    Args:
+        codigo (str): Código da agência.
+
+    Returns:
+        FronteirasDia: Fronteiras do fuso da agência.
+    """
+    return fronteiras_fuso(fuso_agencia(codigo))
+
+
+def formatar_instante(instante, nome_fuso, formato="%d/%m/%Y %H:%M:%S"):
+    """
+    Formata um instante UTC na hora local de um fuso (para exibição).
+
+    Args:
+        instante (float): Instante UTC, em segundos.
+        nome_fuso (str): Nome IANA do fuso.
+        formato (str): Formato do strftime.
+
+    Returns:
+        str: Data e hora locais formatadas.
+    """
+    return datetime.fromtimestamp(instante, zona(nome_fuso)).strftime(formato)
+
+
+def instante_de_texto(texto, nome_fuso, formato="%d/%m/%Y %H:%M:%S"):
+    """
+    Converte uma data e hora locais em texto para instante UTC (usado para
+    ler históricos gravados no formato antigo).
+
+    Args:
+        texto (str): Data e hora locais.
+        nome_fuso (str): Nome IANA do fuso.
+        formato (str): Formato do strptime.
+
+    Returns:
+        float: Instante UTC, em segundos.
+    """
+    return datetime.strptime(texto, formato).replace(
+        tzinfo=zona(nome_fuso)).timestamp()
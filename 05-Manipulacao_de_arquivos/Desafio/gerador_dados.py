@@ -0,0 +1,384 @@
+"""
+Gerador determinístico de dados sintéticos para testes de carga.
+
+A partir de uma semente, gera clientes (CPF válido, nome, data de nascimento e
+endereço), contas e um fluxo de transações com distribuição de Zipf entre as
+contas (poucas contas concentram a maior parte do movimento) e horários
+realistas (picos em horário comercial, menos movimento nos fins de semana).
+
+Tudo é produzido por geradores: o fluxo de transações ocupa memória
+proporcional ao número de contas e ao movimento de um único dia, e não ao
+total de transações, o que permite gerar dezenas de milhões de registros.
+
+Uso:
+    python gerador_dados.py --clientes 100000 --transacoes 10000000 \\
+        --formato csv --saida dados/
+"""
+import argparse
+import csv
+import itertools
+import json
+import random
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+from desafio_sistema_bancario import ContaCorrente, PessoaFisica
+from fusos import fuso_agencia, zona
+
+NOMES = (
+    "Ana", "Bruno", "Carla", "Daniel", "Eduarda", "Felipe", "Gabriela",
+    "Henrique", "Isabela", "João", "Larissa", "Lucas", "Mariana", "Mateus",
+    "Natália", "Otávio", "Paula", "Rafael", "Sofia", "Thiago", "Vitória",
+)
+SOBRENOMES = (
+    "Almeida", "Barbosa", "Cardoso", "Costa", "Ferreira", "Gomes", "Lima",
+    "Martins", "Oliveira", "Pereira", "Ribeiro", "Rodrigues", "Santos",
+    "Silva", "Souza",
+)
+LOGRADOUROS = (
+    "Rua das Flores", "Avenida Brasil", "Rua XV de Novembro",
+    "Rua dos Girassóis", "Avenida Paulista", "Rua Sete de Setembro",
+)
+BAIRROS = ("Centro", "Jardim América", "Vila Nova", "Boa Vista", "Liberdade")
+CIDADES = (
+    ("São Paulo", "SP"), ("Rio de Janeiro", "RJ"), ("Belo Horizonte", "MG"),
+    ("Curitiba", "PR"), ("Salvador", "BA"), ("Recife", "PE"),
+)
+
+# Peso relativo de cada hora do dia (0h a 23h).
+PERFIL_HORARIO = (
+    1, 1, 1, 1, 1, 2, 4, 8, 14, 18, 20, 19,
+    16, 17, 18, 18, 16, 13, 10, 8, 6, 4, 2, 1,
+)
+# Peso relativo de cada dia da semana (segunda a domingo).
+PERFIL_SEMANAL = (10, 9, 9, 9, 12, 6, 3)
+
+# Bases de CPF com todos os dígitos iguais (000000000, 111111111, ...), cujos
+# CPFs são rejeitados por `cpf_valido`.
+BASES_REPETIDAS = tuple(int(str(digito) * 9) for digito in range(10))
+BASES_CPF = 10**9 - len(BASES_REPETIDAS)
+# Multiplicador coprimo com BASES_CPF: percorre todas as bases válidas sem
+# repetir.
+MULTIPLICADOR_CPF = 282_475_249
+# Último dia padrão do período das transações: fixo, para que a mesma
+# semente gere os mesmos dados em qualquer dia.
+FIM_PADRAO = date(2024, 12, 31)
+
+
+def digitos_cpf(base):
+    """
+    Calcula os dois dígitos verificadores de um CPF.
+
+    Args:
+        base (str): Os nove primeiros dígitos do CPF.
+
+    Returns:
+        str: Os dois dígitos verificadores.
+    """
+    digitos = [int(digito) for digito in base]
+    for tamanho in (9, 10):
+        soma = sum(digito * peso for digito, peso in
+                   zip(digitos, range(tamanho + 1, 1, -1)))
+        resto = soma * 10 % 11
+        digitos.append(0 if resto == 10 else resto)
+    return f"{digitos[9]}{digitos[10]}"
+
+
+def cpf_valido(cpf):
+    """
+    Verifica os dígitos verificadores de um CPF (somente números).
+
+    Args:
+        cpf (str): CPF com 11 dígitos.
+
+    Returns:
+        bool: True se o CPF for válido.
+    """
+    return (len(cpf) == 11 and cpf.isdigit() and len(set(cpf)) > 1
+            and digitos_cpf(cpf[:9]) == cpf[9:])
+
+
+class GeradorDados:
+    """
+    Gerador semeado de clientes, contas e transações.
+
+    Atributos:
+        semente (int): Semente do gerador pseudoaleatório.
+        agencias (tuple): Agências em que as contas são abertas.
+        contas_por_cliente (tuple): Mínimo e máximo de contas por cliente.
+        expoente_zipf (float): Concentração do movimento entre as contas.
+        fim (date): Último dia do período das transações (FIM_PADRAO se
+        não informado).
+        dias (int): Duração do período das transações, em dias.
+    """
+
+    def __init__(self, semente=42, agencias=("0001",),
+                 contas_por_cliente=(1, 1), expoente_zipf=1.1, fim=None,
+                 dias=30):
+        self.semente = semente
+        self.agencias = agencias
+        self.contas_por_cliente = contas_por_cliente
+        self.expoente_zipf = expoente_zipf
+        self.fim = fim or FIM_PADRAO
+        self.dias = dias
+        self._aleatorio = random.Random(semente)
+
+    def gerar_cpf(self, indice):
+        """
+        Gera o CPF válido de número `indice`. Índices diferentes (menores
+        que BASES_CPF) geram CPFs diferentes.
+
+        Returns:
+            str: CPF com 11 dígitos, sem formatação.
+        """
+        # Posição entre as BASES_CPF bases válidas, convertida na base
+        # pulando as de dígitos repetidos (em ordem crescente).
+        valor = (indice * MULTIPLICADOR_CPF + self.semente) % BASES_CPF
+        for repetida in BASES_REPETIDAS:
+            if valor >= repetida:
+                valor += 1
+        base = f"{valor:09d}"
+        return base + digitos_cpf(base)
+
+    def gerar_clientes(self, quantidade):
+        """
+        Gera os dados dos clientes.
+
+        Yields:
+            dict: cpf, nome, data_nascimento (dd-mm-aaaa) e endereco.
+        """
+        aleatorio = self._aleatorio
+        hoje = self.fim
+        for indice in range(quantidade):
+            nascimento = hoje - timedelta(
+                days=aleatorio.randrange(18 * 365, 90 * 365))
+            cidade, estado = aleatorio.choice(CIDADES)
+            yield {
+                "cpf": self.gerar_cpf(indice),
+                "nome": (f"{aleatorio.choice(NOMES)} "
+                         f"{aleatorio.choice(SOBRENOMES)} "
+                         f"{aleatorio.choice(SOBRENOMES)}"),
+                "data_nascimento": nascimento.strftime("%d-%m-%Y"),
+                "endereco": (f"{aleatorio.choice(LOGRADOUROS)}, "
+                             f"{aleatorio.randrange(1, 3000)} - "
+                             f"{aleatorio.choice(BAIRROS)} - "
+                             f"{cidade}/{estado}"),
+            }
+
+    def gerar_contas(self, clientes):
+        """
+        Gera as contas dos clientes, numeradas em sequência por agência.
+
+        Yields:
+            dict: agencia, numero e cpf do titular.
+        """
+        aleatorio = self._aleatorio
+        proximo_numero = dict.fromkeys(self.agencias, 1)
+        for cliente in clientes:
+            for _ in range(aleatorio.randint(*self.contas_por_cliente)):
+                agencia = aleatorio.choice(self.agencias)
+                yield {"agencia": agencia,
+                       "numero": proximo_numero[agencia],
+                       "cpf": cliente["cpf"]}
+                proximo_numero[agencia] += 1
+
+    def _transacoes_por_dia(self, quantidade):
+        """
+        Distribui o total de transações entre os dias do período.
+        """
+        inicio = self.fim - timedelta(days=self.dias - 1)
+        dias = [inicio + timedelta(days=deslocamento)
+                for deslocamento in range(self.dias)]
+        pesos = [PERFIL_SEMANAL[dia.weekday()] for dia in dias]
+        total_pesos = sum(pesos)
+
+        acumulado_pesos = distribuidas = 0
+        for dia, peso in zip(dias, pesos):
+            acumulado_pesos += peso
+            total_ate_dia = quantidade * acumulado_pesos // total_pesos
+            yield dia, total_ate_dia - distribuidas
+            distribuidas = total_ate_dia
+
+    def gerar_transacoes(self, contas, quantidade):
+        """
+        Gera o fluxo de transações em ordem cronológica.
+
+        A conta de cada transação segue uma distribuição de Zipf; saques só
+        são gerados quando o saldo acumulado da conta os cobre (limitados a
+        R$ 500,00), caso contrário a transação vira um depósito.
+
+        Args:
+            contas (list): Contas geradas por `gerar_contas`.
+            quantidade (int): Total de transações.
+
+        Yields:
+            dict: agencia, numero, tipo ("Deposito" ou "Saque"), valor e
+            instante (UTC, em segundos desde a época Unix, no dia local do
+            fuso da agência).
+        """
+        aleatorio = self._aleatorio
+        ordem = list(range(len(contas)))
+        aleatorio.shuffle(ordem)
+        pesos_acumulados = list(itertools.accumulate(
+            1 / posto ** self.expoente_zipf
+            for posto in range(1, len(contas) + 1)))
+        saldos = [0.0] * len(contas)
+        horas = range(24)
+
+        for dia, quantidade_dia in self._transacoes_por_dia(quantidade):
+            # Calcula a meia-noite local de cada agência uma vez por dia; o
+            # horário é somado à mão.
+            meia_noite = {
+                agencia: datetime.combine(
+                    dia, datetime.min.time(),
+                    zona(fuso_agencia(agencia))).timestamp()
+                for agencia in self.agencias}
+            sorteadas = aleatorio.choices(
+                ordem, cum_weights=pesos_acumulados, k=quantidade_dia)
+            segundos = sorted(
+                hora * 3600 + aleatorio.randrange(3600) for hora in
+                aleatorio.choices(horas, PERFIL_HORARIO, k=quantidade_dia))
+
+            for indice, segundo in zip(sorteadas, segundos):
+                conta = contas[indice]
+                valor = round(min(500.0, aleatorio.lognormvariate(4.5, 0.8)),
+                              2)
+                if aleatorio.random() < 0.45 and saldos[indice] >= valor:
+                    tipo = "Saque"
+                    saldos[indice] -= valor
+                else:
+                    tipo = "Deposito"
+                    valor = round(aleatorio.lognormvariate(5, 1), 2)
+                    saldos[indice] += valor
+
+                yield {
+                    "agencia": conta["agencia"],
+                    "numero": conta["numero"],
+                    "tipo": tipo,
+                    "valor": valor,
+                    "instante": meia_noite[conta["agencia"]] + segundo,
+                }
+
+
+def gravar_csv(registros, caminho):
+    """
+    Grava registros (dicionários) em CSV, em fluxo.
+
+    Returns:
+        int: Quantidade de registros gravados.
+    """
+    quantidade = 0
+    with open(caminho, "w", newline="", encoding="utf-8") as arquivo:
+        escritor = None
+        for registro in registros:
+            if escritor is None:
+                escritor = csv.DictWriter(arquivo, fieldnames=list(registro))
+                escritor.writeheader()
+            escritor.writerow(registro)
+            quantidade += 1
+    return quantidade
+
+
+def gravar_jsonl(registros, caminho):
+    """
+    Grava registros (dicionários) em JSON Lines, em fluxo.
+
+    Returns:
+        int: Quantidade de registros gravados.
+    """
+    quantidade = 0
+    with open(caminho, "w", encoding="utf-8") as arquivo:
+        for registro in registros:
+            arquivo.write(json.dumps(registro, ensure_ascii=False) + "\n")
+            quantidade += 1
+    return quantidade
+
+
+def popular_banco(gerador, numero_clientes, numero_transacoes):
+    """
+    Cria os objetos de domínio do sistema bancário com dados sintéticos.
+
+    As transações são gravadas diretamente no histórico (encadeadas pelo
+    hash, ver cadeia_hash) e no saldo das contas, sem passar pelas regras
+    de limite.
+
+    Args:
+        gerador (GeradorDados): Gerador semeado.
+        numero_clientes (int): Quantidade de clientes.
+        numero_transacoes (int): Total de transações nos históricos.
+
+    Returns:
+        tuple: (clientes, contas) como listas de PessoaFisica e
+        ContaCorrente.
+    """
+    clientes_por_cpf = {}
+    for dados in gerador.gerar_clientes(numero_clientes):
+        clientes_por_cpf[dados["cpf"]] = PessoaFisica(**dados)
+
+    dados_contas = list(gerador.gerar_contas(
+        {"cpf": cpf} for cpf in clientes_por_cpf))
+    contas = []
+    for dados in dados_contas:
+        cliente = clientes_por_cpf[dados["cpf"]]
+        conta = ContaCorrente.nova_conta(
+            cliente, dados["numero"], dados["agencia"])
+        cliente.adicionar_conta(conta)
+        contas.append(conta)
+
+    contas_por_chave = {(conta.agencia, conta.numero): conta
+                        for conta in contas}
+    for transacao in gerador.gerar_transacoes(dados_contas, numero_transacoes):
+        conta = contas_por_chave[(transacao.pop("agencia"),
+                                  transacao.pop("numero"))]
+        conta.historico.restaurar((transacao,))
+        # pylint: disable-next=protected-access
+        conta._saldo += (transacao["valor"] if transacao["tipo"] == "Deposito"
+                         else -transacao["valor"])
+
+    for cliente in clientes_por_cpf.values():
+        cliente.posicao.recalcular(cliente.contas)
+
+    return list(clientes_por_cpf.values()), contas
+
+
+def main():
+    """
+    Gera os arquivos de clientes, contas e transações.
+    """
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clientes", type=int, default=1000)
+    parser.add_argument("--transacoes", type=int, default=100_000)
+    parser.add_argument("--dias", type=int, default=30)
+    parser.add_argument("--fim", type=date.fromisoformat, default=FIM_PADRAO,
+                        help="último dia do período (aaaa-mm-dd)")
+    parser.add_argument("--agencias", default="0001",
+                        help="códigos separados por vírgula")
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--formato", choices=("csv", "jsonl"), default="csv")
+    parser.add_argument("--saida", default=".")
+    argumentos = parser.parse_args()
+
+    gerador = GeradorDados(
+        semente=argumentos.semente, dias=argumentos.dias, fim=argumentos.fim,
+        agencias=tuple(argumentos.agencias.split(",")),
+        contas_por_cliente=(1, 3))
+    gravar = gravar_csv if argumentos.formato == "csv" else gravar_jsonl
+    saida = Path(argumentos.saida)
+    saida.mkdir(parents=True, exist_ok=True)
+
+    clientes = list(gerador.gerar_clientes(argumentos.clientes))
+    contas = list(gerador.gerar_contas(clientes))
+    gravar(clientes, saida / f"clientes.{argumentos.formato}")
+    gravar(contas, saida / f"contas.{argumentos.formato}")
+    quantidade = gravar(
+        gerador.gerar_transacoes(contas, argumentos.transacoes),
+        saida / f"transacoes.{argumentos.formato}")
+
+    print(f"{len(clientes)} clientes, {len(contas)} contas e {quantidade} "
+          f"transações gravados em {saida}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,260 @@
+"""
+Modo de execução particionado do sistema bancário.
+
+Clientes e contas são distribuídos entre processos (partições) pelo hash do
+CPF do titular. Cada partição mantém seus próprios objetos de domínio e
+processa as operações recebidas em sequência, sem disputar o GIL com as
+demais. O roteador envia cada depósito ou saque à partição dona da conta e
+coordena as transferências entre partições diferentes.
+
+Exemplo:
+
+    with LivroParticionado(numero_particoes=4) as livro:
+        livro.criar_cliente("12345678901", "Ana", "01-01-1990", "Rua A, 1")
+        livro.abrir_conta("12345678901", "0001", 1)
+        livro.executar([("deposito", "12345678901", "0001", 1, 100)])
+"""
+import multiprocessing
+import os
+import sys
+import zlib
+
+from desafio_sistema_bancario import (ContaCorrente, Deposito, PessoaFisica,
+                                      Saque)
+
+
+def indice_particao(cpf, numero_particoes):
+    """
+    Calcula a partição dona de um CPF.
+
+    Usa CRC32 em vez de `hash()`, cujo resultado muda a cada processo.
+
+    Args:
+        cpf (str): CPF do cliente.
+        numero_particoes (int): Quantidade de partições.
+
+    Returns:
+        int: Índice da partição (0 a numero_particoes - 1).
+    """
+    return zlib.crc32(cpf.encode()) % numero_particoes
+
+
+def _aplicar(clientes, contas, operacao):
+    """
+    Aplica uma operação sobre os objetos de domínio de uma partição.
+
+    Returns:
+        O resultado da operação, ou None se o cliente ou a conta não
+        pertencerem à partição.
+    """
+    tipo, cpf, *argumentos = operacao
+
+    if tipo == "cliente":
+        if cpf in clientes:
+            return False
+        nome, data_nascimento, endereco = argumentos
+        clientes[cpf] = PessoaFisica(nome, data_nascimento, cpf, endereco)
+        return True
+
+    cliente = clientes.get(cpf)
+    if not cliente:
+        return None
+
+    if tipo == "conta":
+        agencia, numero = argumentos
+        conta = ContaCorrente.nova_conta(cliente, numero, agencia)
+        contas[(agencia, numero)] = conta
+        cliente.adicionar_conta(conta)
+        return True
+
+    agencia, numero, *valor = argumentos
+    conta = cliente.buscar_conta(agencia, numero)
+    if not conta:
+        return None
+
+    if tipo == "deposito":
+        return cliente.realizar_transacao(conta, Deposito(*valor))
+    if tipo == "saque":
+        return cliente.realizar_transacao(conta, Saque(*valor))
+    if tipo == "saldo":
+        return conta.saldo
+    if tipo in ("creditar", "estornar"):
+        # Créditos de transferência não contam no limite diário do titular.
+        return Deposito(*valor).registrar(conta)
+    if tipo == "existe":
+        return True
+
+    raise ValueError(f"Operação desconhecida: {tipo!r}")
+
+
+def _executar_particao(conexao):
+    """
+    Laço principal de um processo de partição.
+
+    Recebe lotes de operações pela conexão e devolve a lista de resultados,
+    até receber None.
+    """
+    # As partições não têm terminal: descarta as mensagens do domínio.
+    sys.stdout = open(os.devnull, "w", encoding="utf-8")
+    clientes: dict = {}
+    contas: dict = {}
+
+    while True:
+        lote = conexao.recv()
+        if lote is None:
+            break
+        conexao.send([_aplicar(clientes, contas, operacao)
+                      for operacao in lote])
+
+    conexao.close()
+
+
+class LivroParticionado:
+    """
+    Roteador das operações bancárias entre processos de partição.
+
+    As operações são tuplas ``(tipo, cpf, ...)``:
+
+        ("deposito", cpf, agencia, numero, valor)
+        ("saque", cpf, agencia, numero, valor)
+        ("saldo", cpf, agencia, numero)
+
+    O roteador não é seguro para uso por várias threads ao mesmo tempo.
+
+    Atributos:
+        numero_particoes (int): Quantidade de processos de partição.
+    """
+
+    def __init__(self, numero_particoes=None):
+        self.numero_particoes = numero_particoes or os.cpu_count() or 1
+        self._conexoes: list = []
+        self._processos: list = []
+
+    def __enter__(self):
+        self.iniciar()
+        return self
+
+    def __exit__(self, *exc):
+        self.encerrar()
+
+    def iniciar(self):
+        """
+        Inicia os processos de partição.
+        """
+        for _ in range(self.numero_particoes):
+            conexao, conexao_filho = multiprocessing.Pipe()
+            processo = multiprocessing.Process(
+                target=_executar_particao, args=(conexao_filho,), daemon=True)
+            processo.start()
+            conexao_filho.close()
+            self._conexoes.append(conexao)
+            self._processos.append(processo)
+
+    def encerrar(self):
+        """
+        Encerra os processos de partição.
+        """
+        for conexao in self._conexoes:
+            conexao.send(None)
+            conexao.close()
+        for processo in self._processos:
+            processo.join()
+        self._conexoes.clear()
+        self._processos.clear()
+
+    def executar(self, operacoes):
+        """
+        Executa um lote de operações, em paralelo entre as partições.
+
+        A ordem das operações é preservada dentro de cada partição, e os
+        resultados são devolvidos na mesma ordem do lote.
+
+        Args:
+            operacoes (list): Operações no formato ``(tipo, cpf, ...)``.
+
+        Returns:
+            list: Resultado de cada operação.
+        """
+        lotes: list = [[] for _ in range(self.numero_particoes)]
+        posicoes: list = [[] for _ in range(self.numero_particoes)]
+
+        for posicao, operacao in enumerate(operacoes):
+            particao = indice_particao(operacao[1], self.numero_particoes)
+            lotes[particao].append(operacao)
+            posicoes[particao].append(posicao)
+
+        for particao, lote in enumerate(lotes):
+            if lote:
+                self._conexoes[particao].send(lote)
+
+        resultados: list = [None] * len(operacoes)
+        for particao, lote in enumerate(lotes):
+            if lote:
+                for posicao, resultado in zip(
+                        posicoes[particao], self._conexoes[particao].recv()):
+                    resultados[posicao] = resultado
+
+        return resultados
+
+    def _executar_um(self, operacao):
+        return self.executar([operacao])[0]
+
+    def criar_cliente(self, cpf, nome, data_nascimento, endereco):
+        """
+        Cria um cliente na partição dona do CPF.
+
+        Returns:
+            bool: False se o CPF já estiver cadastrado.
+        """
+        return self._executar_um(
+            ("cliente", cpf, nome, data_nascimento, endereco))
+
+    def abrir_conta(self, cpf, agencia, numero):
+        """
+        Abre uma conta corrente na partição do titular.
+
+        O número deve vir de um `AlocadorNumeroConta`, que é seguro entre
+        processos.
+
+        Returns:
+            bool | None: None se o cliente não existir.
+        """
+        return self._executar_um(("conta", cpf, agencia, numero))
+
+    def saldo(self, cpf, agencia, numero):
+        """
+        Consulta o saldo de uma conta.
+
+        Returns:
+            float | int | None: Saldo, ou None se a conta não existir.
+        """
+        return self._executar_um(("saldo", cpf, agencia, numero))
+
+    def transferir(self, origem, destino, valor):
+        """
+        Transfere um valor entre duas contas, possivelmente em partições
+        diferentes.
+
+        A transferência é coordenada em três passos: confirma que a conta de
+        destino existe, debita a origem com as regras de saque e credita o
+        destino. Se o crédito falhar, o valor é estornado na origem.
+
+        Args:
+            origem (tuple): (cpf, agencia, numero) da conta de origem.
+            destino (tuple): (cpf, agencia, numero) da conta de destino.
+            valor (float | int): Valor a transferir.
+
+        Returns:
+            bool: True se a transferência foi concluída.
+        """
+        if not self._executar_um(("existe", *destino)):
+            return False
+
+        if not self._executar_um(("saque", *origem, valor)):
+            return False
+
+        if self._executar_um(("creditar", *destino, valor)):
+            return True
+
+        self._executar_um(("estornar", *origem, valor))
+        return False
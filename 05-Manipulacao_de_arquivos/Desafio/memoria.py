@@ -0,0 +1,323 @@
+"""
+Contabilidade de memória do sistema bancário com tracemalloc.
+
+As alocações de um instantâneo do tracemalloc são agrupadas por domínio (a
+classe ou função de topo do sistema que fez a alocação, como `Historico`,
+`PessoaFisica` ou `log_transacao`) ou por módulo, e o relatório mostra o
+total de bytes por cliente e por transação. Um censo dos objetos alcançáveis
+a partir dos clientes complementa o relatório com o tamanho de cada tipo de
+objeto do domínio (dicionários de transação, instantes etc.).
+
+Dois instantâneos podem ser comparados para encontrar o que cresceu durante
+uma sessão longa. No menu, o comando oculto `mem` liga o rastreamento (se
+necessário), grava um instantâneo em `memoria/` e imprime o relatório e a
+diferença em relação ao instantâneo anterior. Para ver as alocações desde o
+início do processo, execute com `PYTHONTRACEMALLOC=5`.
+
+Uso (comparação de instantâneos gravados):
+    python memoria.py anterior.tracemalloc atual.tracemalloc
+"""
+import sys
+import tracemalloc
+from bisect import bisect_right
+from datetime import datetime
+from pathlib import Path
+
+ROOT_PATH = Path(__file__).parent
+DIRETORIO_INSTANTANEOS = ROOT_PATH / "memoria"
+QUADROS_PADRAO = 5
+FILTROS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+def mapear_dominios(modulos):
+    """
+    Mapeia as linhas de código de cada módulo para a classe ou função de
+    topo que as contém.
+
+    Args:
+        modulos (iterable): Módulos do sistema.
+
+    Returns:
+        dict: Por arquivo, a lista ordenada de (início, fim, nome).
+    """
+    # pylint: disable-next=import-outside-toplevel
+    import inspect
+
+    mapa: dict = {}
+    for modulo in modulos:
+        for nome, objeto in vars(modulo).items():
+            if not (inspect.isclass(objeto) or inspect.isfunction(objeto)):
+                continue
+            # Envelopes de decoradores sem functools.wraps apontariam para o
+            # código do decorador: ficam com o domínio do próprio decorador.
+            if (getattr(objeto, "__module__", None) != modulo.__name__
+                    or objeto.__qualname__ != nome):
+                continue
+            try:
+                linhas, inicio = inspect.getsourcelines(objeto)
+            except (OSError, TypeError):
+                continue
+            mapa.setdefault(modulo.__file__, []).append(
+                (inicio, inicio + len(linhas) - 1, nome))
+
+    for intervalos in mapa.values():
+        intervalos.sort()
+    return mapa
+
+
+def _dominio(traceback, mapa):
+    # Os quadros vão do mais antigo ao mais recente: o domínio é o do quadro
+    # mais recente que pertence a um módulo do sistema.
+    for quadro in reversed(traceback):
+        intervalos = mapa.get(quadro.filename)
+        if not intervalos:
+            continue
+        posicao = bisect_right(intervalos, (quadro.lineno, float("inf"))) - 1
+        if posicao >= 0:
+            inicio, fim, nome = intervalos[posicao]
+            if inicio <= quadro.lineno <= fim:
+                return nome
+        return Path(quadro.filename).stem
+    nome = Path(traceback[-1].filename).name
+    return nome if nome.startswith("<") else f"<{nome}>"
+
+
+def _modulo(traceback, _mapa):
+    return Path(traceback[-1].filename).name
+
+
+AGRUPAMENTOS = {"dominio": _dominio, "modulo": _modulo}
+
+
+def agrupar(instantaneo, mapa, chave="dominio"):
+    """
+    Soma as alocações de um instantâneo por domínio ou por módulo.
+
+    Args:
+        instantaneo (tracemalloc.Snapshot): Instantâneo a agrupar.
+        mapa (dict): Resultado de `mapear_dominios`.
+        chave (str): "dominio" ou "modulo".
+
+    Returns:
+        dict: (bytes, blocos) de cada grupo.
+    """
+    agrupador = AGRUPAMENTOS[chave]
+    grupos: dict = {}
+    for estatistica in instantaneo.statistics("traceback"):
+        grupo = agrupador(estatistica.traceback, mapa)
+        tamanho, blocos = grupos.get(grupo, (0, 0))
+        grupos[grupo] = (tamanho + estatistica.size,
+                         blocos + estatistica.count)
+    return grupos
+
+
+def comparar(anterior, atual, mapa, chave="dominio"):
+    """
+    Calcula o crescimento de cada grupo entre dois instantâneos.
+
+    Args:
+        anterior (tracemalloc.Snapshot): Instantâneo mais antigo.
+        atual (tracemalloc.Snapshot): Instantâneo mais recente.
+        mapa (dict): Resultado de `mapear_dominios`.
+        chave (str): "dominio" ou "modulo".
+
+    Returns:
+        dict: (diferença de bytes, diferença de blocos) de cada grupo.
+    """
+    agrupador = AGRUPAMENTOS[chave]
+    grupos: dict = {}
+    for diferenca in atual.compare_to(anterior, "traceback"):
+        grupo = agrupador(diferenca.traceback, mapa)
+        tamanho, blocos = grupos.get(grupo, (0, 0))
+        grupos[grupo] = (tamanho + diferenca.size_diff,
+                         blocos + diferenca.count_diff)
+    return grupos
+
+
+def _tamanho_atributos(objeto):
+    atributos = vars(objeto)
+    return (sys.getsizeof(objeto) + sys.getsizeof(atributos)
+            + sum(sys.getsizeof(valor) for valor in atributos.values()
+                  if isinstance(valor, str)))
+
+
+def censo_dominio(clientes):
+    """
+    Mede os objetos alcançáveis a partir dos clientes, por tipo.
+
+    Args:
+        clientes (list): Clientes do banco.
+
+    Returns:
+        dict: (bytes, quantidade) de cada tipo de objeto do domínio.
+    """
+    censo: dict = {}
+
+    def somar(categoria, tamanho):
+        total, quantidade = censo.get(categoria, (0, 0))
+        censo[categoria] = (total + tamanho, quantidade + 1)
+
+    for cliente in clientes:
+        somar(cliente.__class__.__name__, _tamanho_atributos(cliente))
+        for conta in cliente.contas:
+            somar(conta.__class__.__name__, _tamanho_atributos(conta))
+            transacoes = conta.historico.transacoes
+            somar("Historico", sys.getsizeof(conta.historico)
+                  + sys.getsizeof(transacoes))
+            for transacao in transacoes:
+                somar("transação (dict)", sys.getsizeof(transacao))
+                somar("instante (float)",
+                      sys.getsizeof(transacao["instante"]))
+    return censo
+
+
+def _formatar_tabela(titulo, grupos, limite, sinal=False):
+    sinal = "+" if sinal else ""
+    linhas = [titulo, f"{'grupo':<36}{'bytes':>14}{'blocos':>12}"]
+    ordenados = sorted(grupos.items(), key=lambda item: abs(item[1][0]),
+                       reverse=True)
+    for grupo, (tamanho, blocos) in ordenados[:limite]:
+        linhas.append(f"{grupo:<36}{tamanho:>{sinal}14,}"
+                      f"{blocos:>{sinal}12,}")
+    return "\n".join(linhas)
+
+
+def relatorio(instantaneo, clientes, mapa, limite=15):
+    """
+    Monta o relatório de memória de um instantâneo.
+
+    Args:
+        instantaneo (tracemalloc.Snapshot): Instantâneo a relatar.
+        clientes (list): Clientes do banco.
+        mapa (dict): Resultado de `mapear_dominios`.
+        limite (int): Quantidade de grupos exibidos em cada tabela.
+
+    Returns:
+        str: Relatório em texto.
+    """
+    total = sum(estatistica.size
+                for estatistica in instantaneo.statistics("filename"))
+    numero_clientes = len(clientes)
+    numero_transacoes = sum(len(conta.historico.transacoes)
+                            for cliente in clientes
+                            for conta in cliente.contas)
+
+    linhas = [
+        f"Memória rastreada: {total:,} bytes",
+        f"Clientes: {numero_clientes:,} "
+        f"({total / max(numero_clientes, 1):,.0f} bytes/cliente)",
+        f"Transações: {numero_transacoes:,} "
+        f"({total / max(numero_transacoes, 1):,.0f} bytes/transação)",
+        "",
+        _formatar_tabela("Por domínio:", agrupar(instantaneo, mapa),
+                         limite),
+        "",
+        _formatar_tabela("Por módulo:",
+                         agrupar(instantaneo, mapa, "modulo"), limite),
+        "",
+        _formatar_tabela("Objetos do domínio (censo):",
+                         censo_dominio(clientes), limite),
+    ]
+    return "\n".join(linhas)
+
+
+def capturar():
+    """
+    Tira um instantâneo das alocações rastreadas, sem as do próprio
+    tracemalloc e do mecanismo de importação.
+
+    Returns:
+        tracemalloc.Snapshot: Instantâneo filtrado.
+    """
+    return tracemalloc.take_snapshot().filter_traces(FILTROS)
+
+
+class DiagnosticoMemoria:
+    """
+    Comando de diagnóstico de memória de uma sessão.
+
+    Atributos:
+        modulos (list): Módulos cujas classes e funções formam os domínios.
+        diretorio (Path): Onde os instantâneos são gravados.
+        anterior (tracemalloc.Snapshot | None): Último instantâneo tirado.
+    """
+
+    def __init__(self, modulos, diretorio=DIRETORIO_INSTANTANEOS):
+        self.modulos = list(modulos)
+        self._mapa = None
+        self.diretorio = Path(diretorio)
+        self.anterior = None
+
+    @property
+    def mapa(self):
+        """
+        Linhas de código de cada domínio, calculadas no primeiro uso para não
+        pesar na inicialização do menu.
+
+        Returns:
+            dict: Resultado de `mapear_dominios`.
+        """
+        if self._mapa is None:
+            self._mapa = mapear_dominios(self.modulos)
+        return self._mapa
+
+    def executar(self, clientes):
+        """
+        Liga o rastreamento, se necessário; senão grava um instantâneo e
+        monta o relatório e a diferença em relação ao anterior.
+
+        Args:
+            clientes (list): Clientes do banco.
+
+        Returns:
+            str: Texto a exibir.
+        """
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(QUADROS_PADRAO)
+            return ("Rastreamento de memória iniciado: repita o comando "
+                    "para gerar o relatório.")
+
+        atual = capturar()
+        self.diretorio.mkdir(parents=True, exist_ok=True)
+        caminho = self.diretorio / (
+            f"instantaneo-{datetime.now().strftime('%Y%m%d-%H%M%S-%f')}"
+            ".tracemalloc")
+        atual.dump(str(caminho))
+
+        texto = [relatorio(atual, clientes, self.mapa)]
+        if self.anterior is not None:
+            texto += ["", _formatar_tabela(
+                "Crescimento desde o instantâneo anterior:",
+                comparar(self.anterior, atual, self.mapa), 15, sinal=True)]
+        texto += ["", f"Instantâneo gravado em {caminho}"]
+        self.anterior = atual
+        return "\n".join(texto)
+
+
+def main():
+    """
+    Compara dois instantâneos gravados pelo comando `mem`.
+    """
+    if len(sys.argv) != 3:
+        print(__doc__)
+        sys.exit(1)
+
+    import desafio_sistema_bancario  # pylint: disable=import-outside-toplevel
+
+    mapa = mapear_dominios([desafio_sistema_bancario])
+    anterior, atual = (tracemalloc.Snapshot.load(caminho)
+                       for caminho in sys.argv[1:])
+    for chave, titulo in (("dominio", "Por domínio:"),
+                          ("modulo", "Por módulo:")):
+        print(_formatar_tabela(titulo, comparar(anterior, atual, mapa, chave),
+                               20, sinal=True))
+        print()
+
+
+if __name__ == "__main__":
+    main()
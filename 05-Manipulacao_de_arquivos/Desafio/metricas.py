@@ -0,0 +1,316 @@
+"""
+Métricas de latência das operações bancárias.
+
+O decorador `medir_latencia` conta as chamadas e os erros de cada função e
+registra a duração de cada chamada em um histograma no estilo HDR: os valores
+(em nanossegundos) são agrupados em faixas logarítmicas, cada uma dividida em
+16 sub-faixas lineares, o que mantém o erro relativo dos percentis abaixo de
+~6% com memória fixa e registro O(1).
+
+Exemplo:
+
+    @medir_latencia
+    def sacar(conta, valor):
+        ...
+
+    imprimir_resumo()   # p50/p90/p99/p999 de cada função medida
+"""
+import functools
+import threading
+import time
+from datetime import datetime
+
+BITS_SUB_FAIXA = 4
+LIMITE_LINEAR = 1 << BITS_SUB_FAIXA
+# Expoente (bit_length) a partir do qual os valores caem na última faixa:
+# cerca de 2**41 ns, ou 36 minutos.
+EXPOENTE_MAXIMO = 42
+NUMERO_FAIXAS = EXPOENTE_MAXIMO << BITS_SUB_FAIXA
+PERCENTIS = (("p50", 0.50), ("p90", 0.90), ("p99", 0.99), ("p999", 0.999))
+
+
+def indice_faixa(valor):
+    """
+    Calcula a faixa do histograma para um valor em nanossegundos.
+
+    Valores abaixo de 16 têm faixa própria; os demais usam o número de bits
+    (expoente) e os 4 bits seguintes ao mais significativo (sub-faixa).
+
+    Args:
+        valor (int): Duração em nanossegundos.
+
+    Returns:
+        int: Índice da faixa.
+    """
+    if valor < LIMITE_LINEAR:
+        return valor
+    expoente = valor.bit_length()
+    if expoente >= EXPOENTE_MAXIMO:
+        return NUMERO_FAIXAS - 1
+    return ((expoente << BITS_SUB_FAIXA)
+            | ((valor >> (expoente - BITS_SUB_FAIXA - 1))
+               & (LIMITE_LINEAR - 1)))
+
+
+def limite_superior_faixa(indice):
+    """
+    Retorna o maior valor (ns) representado por uma faixa.
+
+    Args:
+        indice (int): Índice da faixa.
+
+    Returns:
+        int: Limite superior da faixa, em nanossegundos.
+    """
+    if indice < LIMITE_LINEAR:
+        return indice
+    expoente = indice >> BITS_SUB_FAIXA
+    mantissa = (indice & (LIMITE_LINEAR - 1)) | LIMITE_LINEAR
+    return ((mantissa + 1) << (expoente - BITS_SUB_FAIXA - 1)) - 1
+
+
+class HistogramaLatencia:
+    """
+    Histograma de latências com faixas log-lineares.
+
+    Atributos:
+        contagens (list): Quantidade de registros em cada faixa.
+    """
+
+    def __init__(self):
+        self.contagens = [0] * NUMERO_FAIXAS
+
+    def registrar(self, valor):
+        """
+        Registra uma latência.
+
+        Args:
+            valor (int): Duração em nanossegundos.
+        """
+        self.contagens[indice_faixa(valor)] += 1
+
+    @property
+    def total(self):
+        """
+        Retorna a quantidade de latências registradas.
+
+        Returns:
+            int: Total de registros.
+        """
+        return sum(self.contagens)
+
+    @property
+    def maximo(self):
+        """
+        Retorna o limite superior da maior faixa com registros.
+
+        Returns:
+            int | None: Latência máxima aproximada, em nanossegundos.
+        """
+        for indice in range(NUMERO_FAIXAS - 1, -1, -1):
+            if self.contagens[indice]:
+                return limite_superior_faixa(indice)
+        return None
+
+    def percentis(self):
+        """
+        Calcula p50, p90, p99 e p999 em uma única passada pelas faixas.
+
+        Returns:
+            dict: Percentis em nanossegundos (limite superior da faixa).
+        """
+        total = self.total
+        resultado = dict.fromkeys(nome for nome, _ in PERCENTIS)
+        if not total:
+            return resultado
+
+        alvos = iter(PERCENTIS)
+        nome, fracao = next(alvos)
+        acumulado = 0
+        for indice, contagem in enumerate(self.contagens):
+            acumulado += contagem
+            while acumulado >= fracao * total:
+                resultado[nome] = limite_superior_faixa(indice)
+                try:
+                    nome, fracao = next(alvos)
+                except StopIteration:
+                    return resultado
+        return resultado
+
+    def zerar(self):
+        """
+        Descarta todos os registros (a lista é reaproveitada, pois os
+        medidores guardam referência a ela).
+        """
+        self.contagens[:] = [0] * NUMERO_FAIXAS
+
+
+class EstatisticasFuncao:
+    """
+    Contadores de uma função medida.
+
+    Atributos:
+        nome (str): Nome qualificado da função.
+        erros (int): Chamadas que terminaram com exceção.
+        soma_ns (int): Soma das latências, em nanossegundos.
+        histograma (HistogramaLatencia): Latências das chamadas.
+    """
+
+    def __init__(self, nome):
+        self.nome = nome
+        self.erros = 0
+        self.soma_ns = 0
+        self.histograma = HistogramaLatencia()
+
+    @property
+    def chamadas(self):
+        """
+        Retorna o total de chamadas (cada chamada gera um registro no
+        histograma).
+
+        Returns:
+            int: Total de chamadas.
+        """
+        return self.histograma.total
+
+    def resumo(self):
+        """
+        Retorna os contadores e percentis da função.
+
+        Returns:
+            dict: chamadas, erros, p50, p90, p99, p999 e max (ns).
+        """
+        return {"chamadas": self.chamadas, "erros": self.erros,
+                **self.histograma.percentis(),
+                "max": self.histograma.maximo}
+
+
+# Estatísticas de todas as funções medidas, indexadas pelo nome.
+estatisticas: dict = {}
+
+
+def medir_latencia(func):
+    """
+    Decorator que mede chamadas, erros e latência da função decorada.
+
+    O registro é feito inline no envelope (o mesmo cálculo de
+    `indice_faixa`), sem chamadas de método, para manter a sobrecarga
+    abaixo de um microssegundo por chamada. Sob várias threads, os
+    contadores podem perder incrementos ocasionais.
+
+    Args:
+        func (function): A função a ser medida.
+
+    Returns:
+        function: A função envolvida pelo medidor.
+    """
+    metricas = estatisticas.setdefault(
+        func.__qualname__, EstatisticasFuncao(func.__qualname__))
+    contagens = metricas.histograma.contagens
+    relogio = time.perf_counter_ns
+
+    @functools.wraps(func)
+    def envelope(*args, **kwargs):
+        inicio = relogio()
+        try:
+            return func(*args, **kwargs)
+        except BaseException:
+            metricas.erros += 1
+            raise
+        finally:
+            duracao = relogio() - inicio
+            metricas.soma_ns += duracao
+            if duracao < LIMITE_LINEAR:
+                contagens[duracao] += 1
+            else:
+                expoente = duracao.bit_length()
+                contagens[
+                    (expoente << 4) | ((duracao >> (expoente - 5)) & 15)
+                    if expoente < EXPOENTE_MAXIMO else NUMERO_FAIXAS - 1
+                ] += 1
+
+    return envelope
+
+
+def resumo():
+    """
+    Retorna o resumo de todas as funções medidas.
+
+    Returns:
+        dict: Resumo de cada função, indexado pelo nome.
+    """
+    return {nome: metricas.resumo()
+            for nome, metricas in sorted(estatisticas.items())}
+
+
+def formatar_resumo():
+    """
+    Formata o resumo das métricas como tabela (latências em microssegundos).
+
+    Returns:
+        str: Tabela com uma linha por função medida.
+    """
+    linhas = [f"{'função':<34}{'chamadas':>10}{'erros':>8}{'p50':>10}"
+              f"{'p90':>10}{'p99':>10}{'p999':>10}{'máx':>10}"]
+    for nome, dados in resumo().items():
+        latencias = "".join(
+            f"{(dados[chave] or 0) / 1000:>10.1f}"
+            for chave in ("p50", "p90", "p99", "p999", "max"))
+        linhas.append(f"{nome:<34}{dados['chamadas']:>10}{dados['erros']:>8}"
+                      f"{latencias}")
+    return "\n".join(linhas)
+
+
+def imprimir_resumo():
+    """
+    Imprime o resumo das métricas (comando de despejo).
+    """
+    print(formatar_resumo())
+
+
+def despejar_json(caminho):
+    """
+    Grava o resumo das métricas em JSON.
+
+    Args:
+        caminho (Path): Arquivo de destino.
+    """
+    # pylint: disable-next=import-outside-toplevel
+    import json
+
+    with open(caminho, "w", encoding="utf-8") as arquivo:
+        json.dump({"data": datetime.now().isoformat(timespec="seconds"),
+                   "metricas": resumo()}, arquivo, ensure_ascii=False,
+                  indent=2)
+
+
+def iniciar_resumo_periodico(caminho, intervalo=60):
+    """
+    Acrescenta o resumo das métricas a um arquivo a cada `intervalo`
+    segundos, em uma thread daemon. Intervalos sem chamadas novas não geram
+    registro.
+
+    Args:
+        caminho (Path): Arquivo de log do resumo.
+        intervalo (float): Segundos entre dois resumos.
+
+    Returns:
+        threading.Event: Evento que encerra a thread quando acionado.
+    """
+    parar = threading.Event()
+
+    def executar():
+        ultimo_total = 0
+        while not parar.wait(intervalo):
+            total = sum(metricas.chamadas
+                        for metricas in estatisticas.values())
+            if total == ultimo_total:
+                continue
+            ultimo_total = total
+            data_hora = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            with open(caminho, "a", encoding="utf-8") as arquivo:
+                arquivo.write(f"[{data_hora}]\n{formatar_resumo()}\n\n")
+
+    threading.Thread(target=executar, name="resumo-metricas",
+                     daemon=True).start()
+    return parar
@@ -0,0 +1,213 @@
+"""
+Perfilamento sob demanda do processo do banco.
+
+O `Perfilador` liga e desliga o cProfile em tempo de execução, por um sinal
+(SIGUSR1, onde disponível) ou pelo comando oculto `p` do menu. Enquanto
+desligado, não há custo algum: nenhum hook de perfilamento fica instalado.
+
+Ao parar, grava em `diretorio`:
+
+    perfil-<data>.pstats   estatísticas do cProfile (pstats/snakeviz)
+    perfil-<data>.folded   pilhas colapsadas ("a;b;c 123"), consumidas por
+                           flamegraph.pl, speedscope e similares
+
+O cProfile registra apenas pares chamador/chamado, então as pilhas do
+arquivo .folded são reconstruídas a partir desse grafo, distribuindo o
+tempo próprio de cada função entre os caminhos na proporção das chamadas
+(com profundidade e fração mínima limitadas, para que o custo não cresça
+com o número de caminhos do grafo).
+
+Exemplo:
+
+    kill -USR1 <pid>   # inicia
+    kill -USR1 <pid>   # para e grava os arquivos
+"""
+import os
+import signal
+from datetime import datetime
+from pathlib import Path
+
+ROOT_PATH = Path(__file__).parent
+DIRETORIO_PERFIS = ROOT_PATH / "perfis"
+# Limites da reconstrução das pilhas (ver pilhas_colapsadas).
+PROFUNDIDADE_MAXIMA = 64
+FRACAO_MINIMA = 1e-3
+
+
+def _nome_funcao(funcao):
+    arquivo, linha, nome = funcao
+    if arquivo == "~":
+        # Funções embutidas: "<built-in method time.sleep>"
+        return nome.strip("<>")
+    return f"{os.path.basename(arquivo)}:{linha}:{nome}"
+
+
+def pilhas_colapsadas(estatisticas, profundidade_maxima=PROFUNDIDADE_MAXIMA,
+                      fracao_minima=FRACAO_MINIMA):
+    """
+    Reconstrói pilhas colapsadas a partir do grafo de chamadas do cProfile.
+
+    Os caminhos de cada função até as raízes são montados aresta a aresta
+    (chamador -> chamado) e memorizados por função e profundidade, de modo
+    que cada caminho é calculado uma única vez. Caminhos com mais de
+    `profundidade_maxima` quadros ou com menos de `fracao_minima` das
+    chamadas da função são truncados: a parcela deles fica em uma pilha que
+    começa na própria função, e o tempo total é preservado.
+
+    Args:
+        estatisticas (pstats.Stats): Estatísticas coletadas.
+        profundidade_maxima (int): Quadros máximos por pilha.
+        fracao_minima (float): Fração mínima das chamadas de uma função
+        para que um caminho seja mantido.
+
+    Returns:
+        dict: Tempo próprio (em microssegundos) de cada pilha, indexado pela
+        pilha no formato "raiz;...;função".
+    """
+    dados = estatisticas.stats  # type: ignore[attr-defined]
+    nomes = {funcao: _nome_funcao(funcao) for funcao in dados}
+    caminhos_memorizados: dict = {}
+
+    def caminhos(funcao, profundidade):
+        # Caminhos (pilha, fração das chamadas) da raiz até a função.
+        chave = (funcao, profundidade)
+        resultado = caminhos_memorizados.get(chave)
+        if resultado is not None:
+            return resultado
+
+        _, chamadas, _, _, chamadores = dados[funcao]
+        nome = nomes[funcao]
+        resultado = []
+        if chamadas and profundidade > 1:
+            for chamador, (_, chamadas_aresta, _, _) in chamadores.items():
+                if chamador == funcao or chamador not in dados:
+                    continue
+                parcela = chamadas_aresta / chamadas
+                if parcela < fracao_minima:
+                    continue
+                for pilha, fracao in caminhos(chamador, profundidade - 1):
+                    fracao *= parcela
+                    if fracao >= fracao_minima:
+                        resultado.append((f"{pilha};{nome}", fracao))
+
+        restante = 1.0 - sum(fracao for _, fracao in resultado)
+        if restante > 1e-9:
+            resultado.append((nome, restante))
+        caminhos_memorizados[chave] = resultado
+        return resultado
+
+    pilhas: dict = {}
+    for funcao, (_, _, tempo_proprio, _, _) in dados.items():
+        if not tempo_proprio:
+            continue
+        for pilha, fracao in caminhos(funcao, profundidade_maxima):
+            pilhas[pilha] = pilhas.get(pilha, 0) + tempo_proprio * fracao * 1e6
+
+    return {pilha: round(tempo) for pilha, tempo in pilhas.items()
+            if round(tempo) > 0}
+
+
+def gravar_pilhas_colapsadas(estatisticas, caminho):
+    """
+    Grava as pilhas colapsadas em um arquivo de texto.
+
+    Args:
+        estatisticas (pstats.Stats): Estatísticas coletadas.
+        caminho (Path): Arquivo de destino.
+    """
+    with open(caminho, "w", encoding="utf-8") as arquivo:
+        for pilha, tempo in sorted(pilhas_colapsadas(estatisticas).items()):
+            arquivo.write(f"{pilha} {tempo}\n")
+
+
+class Perfilador:
+    """
+    Liga e desliga o cProfile em tempo de execução.
+
+    Atributos:
+        diretorio (Path): Onde os perfis são gravados.
+    """
+
+    def __init__(self, diretorio=DIRETORIO_PERFIS):
+        self.diretorio = Path(diretorio)
+        self._perfil = None
+
+    @property
+    def ativo(self):
+        """
+        Indica se há um perfilamento em andamento.
+
+        Returns:
+            bool: True se o cProfile estiver ligado.
+        """
+        return self._perfil is not None
+
+    def iniciar(self):
+        """
+        Liga o cProfile na thread atual.
+        """
+        if self.ativo:
+            return
+        # pylint: disable-next=import-outside-toplevel
+        import cProfile
+
+        self._perfil = cProfile.Profile()
+        self._perfil.enable()
+
+    def parar(self):
+        """
+        Desliga o cProfile e grava os arquivos .pstats e .folded.
+
+        Returns:
+            tuple: Caminhos (pstats, folded) gravados, ou None se não havia
+            perfilamento em andamento.
+        """
+        if not self.ativo:
+            return None
+        # pylint: disable-next=import-outside-toplevel
+        import pstats
+
+        perfil, self._perfil = self._perfil, None
+        perfil.disable()
+
+        self.diretorio.mkdir(parents=True, exist_ok=True)
+        base = self.diretorio / (
+            f"perfil-{datetime.now().strftime('%Y%m%d-%H%M%S')}")
+        caminho_pstats = base.with_suffix(".pstats")
+        caminho_folded = base.with_suffix(".folded")
+
+        perfil.dump_stats(caminho_pstats)
+        gravar_pilhas_colapsadas(pstats.Stats(perfil), caminho_folded)
+        return caminho_pstats, caminho_folded
+
+    def alternar(self):
+        """
+        Inicia o perfilamento se estiver parado, ou o para e grava.
+
+        Returns:
+            tuple | None: Caminhos gravados ao parar; None ao iniciar.
+        """
+        if self.ativo:
+            return self.parar()
+        self.iniciar()
+        return None
+
+    def instalar_sinal(self, sinal=getattr(signal, "SIGUSR1", None)):
+        """
+        Alterna o perfilamento ao receber `sinal` (apenas na thread
+        principal e em sistemas com SIGUSR1).
+
+        Args:
+            sinal (int): Sinal que alterna o perfilamento.
+
+        Returns:
+            bool: True se o tratador foi instalado.
+        """
+        if sinal is None:
+            return False
+
+        def tratar(*_):
+            self.alternar()
+
+        signal.signal(sinal, tratar)
+        return True
@@ -0,0 +1,124 @@
+"""
+Ranking das contas por saldo, mantido a cada alteração de saldo.
+
+`RankingSaldos` é um observador de `Conta.observadores_saldo`: a cada
+notificação, a conta entra com o novo saldo em dois heaps (maiores e menores
+saldos), e a entrada anterior da conta passa a estar obsoleta. As entradas
+obsoletas são descartadas só quando aparecem no topo de um heap durante uma
+consulta (invalidação preguiçosa). Os heaps são reconstruídos em uma
+consulta quando as obsoletas passam a ser maioria e, para que a memória não
+cresça com o número de transações em uma sessão sem consultas, também em uma
+alteração de saldo quando passam de FATOR_COMPACTACAO_ESCRITA vezes o número
+de contas.
+
+Assim, cada alteração de saldo custa O(log n) amortizado (a reconstrução
+O(n) no caminho da transação ocorre no máximo uma vez a cada ~3n alterações
+sem consultas), e as consultas dos N maiores ou N menores saldos custam
+O((N + obsoletas) log n), sem ordenar todas as contas.
+
+Exemplo:
+
+    ranking = RankingSaldos()
+    Conta.observadores_saldo.append(ranking)
+    ...
+    ranking.maiores(10)
+"""
+from heapq import heapify, heappop, heappush
+from itertools import count
+
+# Entradas mínimas nos heaps antes de considerar uma reconstrução.
+MINIMO_COMPACTACAO = 1024
+# Entradas por conta que disparam a reconstrução em uma alteração de saldo
+# (nas consultas, bastam 2).
+FATOR_COMPACTACAO_ESCRITA = 4
+
+
+class RankingSaldos:
+    """
+    Observador de saldo que mantém os heaps dos maiores e menores saldos.
+
+    Atributos:
+        atuais (dict): (saldo, versão, conta) mais recente de cada conta,
+        indexado por (agência, número).
+    """
+
+    def __init__(self):
+        self.atuais: dict = {}
+        self._maiores: list = []
+        self._menores: list = []
+        self._versoes = count()
+
+    def __len__(self):
+        return len(self.atuais)
+
+    def __call__(self, conta):
+        chave = (conta.agencia, conta.numero)
+        saldo = conta.saldo
+        versao = next(self._versoes)
+        self.atuais[chave] = (saldo, versao, conta)
+        heappush(self._maiores, (-saldo, versao, chave))
+        heappush(self._menores, (saldo, versao, chave))
+        if len(self._maiores) > max(
+                MINIMO_COMPACTACAO,
+                FATOR_COMPACTACAO_ESCRITA * len(self.atuais)):
+            self._compactar()
+
+    def remover(self, conta):
+        """
+        Retira uma conta do ranking (as entradas nos heaps ficam obsoletas).
+
+        Args:
+            conta (Conta): Conta a retirar.
+        """
+        self.atuais.pop((conta.agencia, conta.numero), None)
+
+    def _compactar(self):
+        self._maiores = [(-saldo, versao, chave)
+                         for chave, (saldo, versao, _) in self.atuais.items()]
+        self._menores = [(saldo, versao, chave)
+                         for chave, (saldo, versao, _) in self.atuais.items()]
+        heapify(self._maiores)
+        heapify(self._menores)
+
+    def _primeiras(self, heap, quantidade):
+        # Retira do heap até achar `quantidade` entradas válidas, descartando
+        # as obsoletas, e devolve as válidas ao heap.
+        validas = []
+        while heap and len(validas) < quantidade:
+            entrada = heappop(heap)
+            atual = self.atuais.get(entrada[2])
+            if atual is not None and atual[1] == entrada[1]:
+                validas.append(entrada)
+        for entrada in validas:
+            heappush(heap, entrada)
+        return [self.atuais[entrada[2]][2] for entrada in validas]
+
+    def _compactar_se_necessario(self):
+        if len(self._maiores) > max(MINIMO_COMPACTACAO, 2 * len(self.atuais)):
+            self._compactar()
+
+    def maiores(self, quantidade):
+        """
+        Retorna as contas de maior saldo.
+
+        Args:
+            quantidade (int): Quantidade de contas.
+
+        Returns:
+            list: Contas em ordem decrescente de saldo.
+        """
+        self._compactar_se_necessario()
+        return self._primeiras(self._maiores, quantidade)
+
+    def menores(self, quantidade):
+        """
+        Retorna as contas de menor saldo (as mais próximas de zerar).
+
+        Args:
+            quantidade (int): Quantidade de contas.
+
+        Returns:
+            list: Contas em ordem crescente de saldo.
+        """
+        self._compactar_se_necessario()
+        return self._primeiras(self._menores, quantidade)
@@ -0,0 +1,342 @@
+"""
+Relatórios gerenciais: totais diários e mensais de depósitos e saques por
+agência.
+
+As transações de todas as contas são carregadas em colunas NumPy (agência,
+tipo, valor e instante), em uma única passagem pelos dicts dos históricos.
+Quem gera relatórios seguidos pode manter um `CacheColunas` e repassá-lo:
+só as transações acrescentadas desde o relatório anterior são convertidas.
+O dia local de cada transação é obtido por busca binária vetorizada nas
+meias-noites do fuso da agência, e os totais por (período, agência, tipo)
+saem de reduções agrupadas (`numpy.bincount`), sem laço Python por
+transação na agregação.
+
+A carga a frio continua limitada pela leitura dos dicts, um por transação:
+com 1 milhão de transações, ela custa mais que a própria agregação, e o
+relatório completo fica só algumas vezes mais rápido que um laço Python.
+Com o cache aquecido, o ganho passa de uma ordem de grandeza.
+
+As linhas do relatório são produzidas por um gerador e gravadas no CSV à
+medida que são montadas.
+
+O NumPy é importado apenas quando um relatório é gerado.
+
+Uso:
+    python relatorios.py --clientes 10000 --transacoes 1000000 \\
+        --periodo mes --saida relatorio.csv
+"""
+import argparse
+import csv
+from datetime import date, datetime, timedelta
+from itertools import chain
+from operator import itemgetter
+from pathlib import Path
+
+from fusos import fuso_agencia, zona
+
+CAMPOS = (
+    "periodo", "agencia",
+    "depositos_quantidade", "depositos_total", "depositos_media",
+    "saques_quantidade", "saques_total", "saques_media",
+)
+PERIODOS = ("dia", "mes")
+_EPOCA = date(1970, 1, 1).toordinal()
+# Registro lido de cada transação na carga das colunas.
+_CAMPOS_TRANSACAO = itemgetter("tipo", "valor", "instante")
+_TIPO_REGISTRO = [("tipo", "U8"), ("valor", "f8"), ("instante", "f8")]
+
+
+class CacheColunas:
+    """
+    Colunas NumPy das transações, mantidas entre um relatório e outro.
+
+    Os históricos só recebem acréscimos: a cada atualização, apenas as
+    transações acrescentadas desde a anterior são convertidas dos dicts e
+    anexadas ao fim das colunas (a ordem das linhas não importa para a
+    agregação). Se uma conta deixar o conjunto ou um histórico encolher, as
+    colunas são refeitas do zero.
+
+    Atributos:
+        _posicoes (dict): (histórico, transações já convertidas) de cada
+        conta, indexado pelo id do histórico.
+        _codigos (dict): Índice de cada agência, na ordem em que apareceu.
+        _colunas (dict): Colunas "agencia" (índice em `_codigos`), "saque",
+        "valor" e "instante".
+    """
+
+    def __init__(self):
+        self._posicoes: dict = {}
+        self._codigos: dict = {}
+        self._colunas: dict = {}
+        self.limpar()
+
+    def limpar(self):
+        """
+        Descarta as colunas convertidas.
+        """
+        # pylint: disable-next=import-outside-toplevel
+        import numpy as np
+
+        self._posicoes.clear()
+        self._codigos.clear()
+        self._colunas = {
+            "agencia": np.empty(0, dtype=np.intp),
+            "saque": np.empty(0, dtype=np.bool_),
+            "valor": np.empty(0, dtype=np.float64),
+            "instante": np.empty(0, dtype=np.float64),
+        }
+
+    def _pendentes(self, contas):
+        # Trechos ainda não convertidos: (agência, transações, início).
+        atuais = {id(conta.historico) for conta in contas}
+        if self._posicoes.keys() - atuais:
+            self.limpar()
+        pendentes = []
+        for conta in contas:
+            historico = conta.historico
+            registro = self._posicoes.get(id(historico))
+            inicio = registro[1] if registro else 0
+            tamanho = len(historico.transacoes)
+            if tamanho < inicio:
+                self.limpar()
+                return self._pendentes(contas)
+            if tamanho > inicio:
+                pendentes.append((conta.agencia, historico.transacoes, inicio))
+        return pendentes
+
+    def atualizar(self, contas):
+        """
+        Converte as transações acrescentadas e retorna as colunas.
+
+        Args:
+            contas (iterable): Contas do banco.
+
+        Returns:
+            tuple: (codigos, colunas): códigos das agências, em ordem
+            crescente, e dict com as colunas "agencia" (índice em
+            `codigos`), "saque" (bool), "valor" (float64) e "instante"
+            (float64). As colunas são compartilhadas com o cache e não
+            devem ser alteradas.
+        """
+        # pylint: disable-next=import-outside-toplevel
+        import numpy as np
+
+        contas = list(contas)
+        pendentes = self._pendentes(contas)
+        if pendentes:
+            for conta in contas:
+                self._codigos.setdefault(conta.agencia, len(self._codigos))
+            trechos = [transacoes if inicio == 0 else transacoes[inicio:]
+                       for _, transacoes, inicio in pendentes]
+            tamanhos = np.fromiter(map(len, trechos), dtype=np.int64,
+                                   count=len(trechos))
+            # Uma única passagem pelos dicts, com map + itemgetter (sem
+            # bytecode Python por transação), preenche um array estruturado;
+            # cada dict é lido uma vez, e não uma vez por coluna.
+            registros = np.fromiter(
+                map(_CAMPOS_TRANSACAO, chain.from_iterable(trechos)),
+                dtype=_TIPO_REGISTRO, count=int(tamanhos.sum()))
+            novas = {
+                "agencia": np.repeat(np.array(
+                    [self._codigos[agencia] for agencia, _, _ in pendentes],
+                    dtype=np.intp), tamanhos),
+                "saque": registros["tipo"] == "Saque",
+                "valor": registros["valor"],
+                "instante": registros["instante"],
+            }
+            self._colunas = {
+                nome: np.concatenate((coluna, novas[nome]))
+                for nome, coluna in self._colunas.items()}
+            for conta in contas:
+                historico = conta.historico
+                self._posicoes[id(historico)] = (historico,
+                                                 len(historico.transacoes))
+
+        codigos = sorted(self._codigos)
+        posicoes = {codigo: posicao for posicao, codigo in enumerate(codigos)}
+        ordem = np.fromiter(map(posicoes.__getitem__, self._codigos),
+                            dtype=np.intp, count=len(codigos))
+        return codigos, dict(self._colunas,
+                             agencia=ordem[self._colunas["agencia"]])
+
+
+def colunas_transacoes(contas, cache=None):
+    """
+    Carrega as transações das contas em colunas NumPy.
+
+    Args:
+        contas (iterable): Contas do banco.
+        cache (CacheColunas, optional): Cache das colunas, mantido pelo
+        chamador para que relatórios seguidos só convertam as transações
+        novas; por padrão, as colunas são convertidas do zero e não ficam
+        guardadas.
+
+    Returns:
+        tuple: (codigos, colunas): códigos das agências, em ordem crescente,
+        e dict com as colunas "agencia" (índice em `codigos`),
+        "saque" (bool), "valor" (float64) e "instante" (float64).
+    """
+    if cache is None:
+        cache = CacheColunas()
+    return cache.atualizar(contas)
+
+
+def _dias_locais(instantes, nome_fuso):
+    # Ordinal do dia local de cada instante: busca binária vetorizada nas
+    # meias-noites do fuso (em instantes UTC) entre o primeiro e o último dia.
+    # pylint: disable-next=import-outside-toplevel
+    import numpy as np
+
+    fuso = zona(nome_fuso)
+    primeiro = datetime.fromtimestamp(float(instantes.min()), fuso).date()
+    ultimo = datetime.fromtimestamp(float(instantes.max()), fuso).date()
+    meias_noites = np.array([
+        datetime.combine(primeiro + timedelta(days=deslocamento),
+                         datetime.min.time(), fuso).timestamp()
+        for deslocamento in range((ultimo - primeiro).days + 1)
+    ])
+    posicoes = np.searchsorted(meias_noites, instantes, side="right") - 1
+    return posicoes + primeiro.toordinal()
+
+
+def periodos_locais(codigos, colunas, periodo="dia"):
+    """
+    Calcula o período local de cada transação, no fuso da sua agência.
+
+    Args:
+        codigos (list): Códigos das agências.
+        colunas (dict): Colunas de `colunas_transacoes`.
+        periodo (str): "dia" (ordinal do dia) ou "mes" (meses desde
+        janeiro de 1970).
+
+    Returns:
+        numpy.ndarray: Período de cada transação (int64).
+    """
+    # pylint: disable-next=import-outside-toplevel
+    import numpy as np
+
+    dias = np.empty(len(colunas["instante"]), dtype=np.int64)
+    for indice, codigo in enumerate(codigos):
+        selecao = colunas["agencia"] == indice
+        if selecao.any():
+            dias[selecao] = _dias_locais(colunas["instante"][selecao],
+                                         fuso_agencia(codigo))
+    if periodo == "dia":
+        return dias
+    return (dias - _EPOCA).astype("datetime64[D]").astype(
+        "datetime64[M]").astype(np.int64)
+
+
+def _formatar_periodo(valor, periodo):
+    if periodo == "dia":
+        return date.fromordinal(valor).isoformat()
+    ano, mes = divmod(valor, 12)
+    return f"{1970 + ano:04d}-{mes + 1:02d}"
+
+
+def agregar(codigos, colunas, periodo="dia"):
+    """
+    Gera as linhas do relatório, uma por (período, agência) com movimento,
+    em ordem de período e agência.
+
+    Args:
+        codigos (list): Códigos das agências.
+        colunas (dict): Colunas de `colunas_transacoes`.
+        periodo (str): "dia" ou "mes".
+
+    Yields:
+        tuple: Valores dos CAMPOS de uma linha.
+
+    Raises:
+        ValueError: Se o período não for "dia" nem "mes".
+    """
+    # pylint: disable-next=import-outside-toplevel
+    import numpy as np
+
+    if periodo not in PERIODOS:
+        raise ValueError(f"Período inválido: {periodo!r}")
+    if colunas["valor"].size == 0:
+        return
+
+    periodos = periodos_locais(codigos, colunas, periodo)
+    primeiro = int(periodos.min())
+    numero_periodos = int(periodos.max()) - primeiro + 1
+    numero_agencias = len(codigos)
+
+    # Chave compacta de cada transação: (período, agência, tipo).
+    chaves = ((periodos - primeiro) * numero_agencias
+              + colunas["agencia"]) * 2 + colunas["saque"]
+    tamanho = numero_periodos * numero_agencias * 2
+    quantidades = np.bincount(chaves, minlength=tamanho).reshape(-1, 2)
+    totais = np.bincount(chaves, weights=colunas["valor"],
+                         minlength=tamanho).reshape(-1, 2)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        medias = np.where(quantidades > 0, totais / quantidades, 0.0)
+
+    # Os grupos já estão em ordem de período e agência (códigos ordenados).
+    for grupo in np.flatnonzero(quantidades.sum(axis=1)).tolist():
+        indice_periodo, indice_agencia = divmod(grupo, numero_agencias)
+        yield (
+            _formatar_periodo(primeiro + indice_periodo, periodo),
+            codigos[indice_agencia],
+            int(quantidades[grupo, 0]), round(float(totais[grupo, 0]), 2),
+            round(float(medias[grupo, 0]), 2),
+            int(quantidades[grupo, 1]), round(float(totais[grupo, 1]), 2),
+            round(float(medias[grupo, 1]), 2),
+        )
+
+
+def gravar_relatorio(contas, caminho, periodo="dia", cache=None):
+    """
+    Gera o relatório de depósitos e saques por período e agência e o grava
+    em CSV.
+
+    Args:
+        contas (iterable): Contas do banco.
+        caminho (Path): Arquivo CSV de destino.
+        periodo (str): "dia" ou "mes".
+        cache (CacheColunas, optional): Cache das colunas, repassado a
+        `colunas_transacoes`.
+
+    Returns:
+        int: Quantidade de linhas gravadas (sem o cabeçalho).
+    """
+    codigos, colunas = colunas_transacoes(contas, cache)
+    quantidade = 0
+    with open(caminho, "w", encoding="utf-8", newline="") as arquivo:
+        escritor = csv.writer(arquivo)
+        escritor.writerow(CAMPOS)
+        for linha in agregar(codigos, colunas, periodo):
+            escritor.writerow(linha)
+            quantidade += 1
+    return quantidade
+
+
+def main():
+    """
+    Gera o relatório de um banco populado com dados sintéticos
+    (gerador_dados).
+    """
+    # pylint: disable-next=import-outside-toplevel
+    from gerador_dados import GeradorDados, popular_banco
+
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clientes", type=int, default=10_000)
+    parser.add_argument("--transacoes", type=int, default=1_000_000)
+    parser.add_argument("--agencias", nargs="+", default=["0001"])
+    parser.add_argument("--periodo", choices=PERIODOS, default="dia")
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--saida", type=Path, default=Path("relatorio.csv"))
+    argumentos = parser.parse_args()
+
+    _, contas = popular_banco(
+        GeradorDados(argumentos.semente, agencias=tuple(argumentos.agencias)),
+        argumentos.clientes, argumentos.transacoes)
+    linhas = gravar_relatorio(contas, argumentos.saida, argumentos.periodo)
+    print(f"{linhas} linhas gravadas em {argumentos.saida}")
+
+
+if __name__ == "__main__":
+    main()
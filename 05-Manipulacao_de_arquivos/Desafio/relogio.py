@@ -0,0 +1,202 @@
+"""
+Relógio injetável do sistema bancário.
+
+Todo acesso à data e hora no domínio passa pelo relógio atual
+(`relogio_atual()`), que pode ser trocado por um `RelogioSimulado` para
+testar o limite diário e a virada do dia sem esperar meias-noites reais.
+
+O `RelogioReal` guarda em cache a data do dia e os carimbos já formatados do
+segundo corrente, de modo que cada transação faz no máximo uma consulta
+barata ao relógio do sistema (`time.time()`), sem `datetime.now()` nem
+`strftime` repetidos.
+
+Exemplo:
+
+    relogio = RelogioSimulado(datetime(2024, 1, 1, 9, 0))
+    with usando_relogio(relogio):
+        ...
+        relogio.avancar(dias=1)
+"""
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+
+FORMATO_HISTORICO = "%d/%m/%Y %H:%M:%S"
+FORMATO_LOG = "%Y-%m-%d %H:%M:%S"
+
+
+class Relogio(ABC):
+    """
+    Classe abstrata que fornece a data e hora ao domínio.
+    """
+
+    @abstractmethod
+    def agora(self):
+        """
+        Retorna a data e hora atuais.
+
+        Returns:
+            datetime: Data e hora atuais.
+        """
+
+    def instante(self):
+        """
+        Retorna o instante atual em UTC.
+
+        Returns:
+            float: Segundos desde a época Unix.
+        """
+        return self.agora().timestamp()
+
+    def hoje(self):
+        """
+        Retorna a data atual.
+
+        Returns:
+            date: Data atual.
+        """
+        return self.agora().date()
+
+    def carimbo(self, formato=FORMATO_HISTORICO):
+        """
+        Retorna a data e hora atuais formatadas.
+
+        Args:
+            formato (str): Formato do strftime.
+
+        Returns:
+            str: Data e hora formatadas.
+        """
+        return self.agora().strftime(formato)
+
+
+class RelogioReal(Relogio):
+    """
+    Relógio do sistema, com cache da data do dia e dos carimbos do segundo
+    corrente.
+    """
+
+    def __init__(self):
+        self._hoje = None
+        self._fim_do_dia = 0.0
+        self._carimbos: dict = {}
+
+    def agora(self):
+        return datetime.now()
+
+    def instante(self):
+        return time.time()
+
+    def hoje(self):
+        if time.time() >= self._fim_do_dia:
+            agora = datetime.now()
+            self._hoje = agora.date()
+            amanha = datetime.combine(self._hoje + timedelta(days=1),
+                                      datetime.min.time())
+            self._fim_do_dia = amanha.timestamp()
+        return self._hoje
+
+    def carimbo(self, formato=FORMATO_HISTORICO):
+        segundo = int(time.time())
+        em_cache = self._carimbos.get(formato)
+        if em_cache is None or em_cache[0] != segundo:
+            em_cache = self._carimbos[formato] = (
+                segundo, datetime.fromtimestamp(segundo).strftime(formato))
+        return em_cache[1]
+
+
+class RelogioSimulado(Relogio):
+    """
+    Relógio controlado pelo programa: o tempo só passa quando `avancar` ou
+    `definir` são chamados. Datas sem fuso são tratadas como UTC.
+
+    Atributos:
+        atual (datetime): Data e hora simuladas.
+    """
+
+    def __init__(self, inicio=None):
+        self._carimbos: dict = {}
+        self.definir(inicio or datetime(2000, 1, 1))
+
+    def agora(self):
+        return self.atual
+
+    def instante(self):
+        return self._instante
+
+    def carimbo(self, formato=FORMATO_HISTORICO):
+        texto = self._carimbos.get(formato)
+        if texto is None:
+            texto = self._carimbos[formato] = self.atual.strftime(formato)
+        return texto
+
+    def definir(self, momento):
+        """
+        Leva o relógio para um momento específico.
+
+        Args:
+            momento (datetime): Nova data e hora.
+        """
+        self.atual = momento
+        if momento.tzinfo is None:
+            momento = momento.replace(tzinfo=timezone.utc)
+        self._instante = momento.timestamp()
+        self._carimbos.clear()
+
+    def avancar(self, dias=0, horas=0, minutos=0, segundos=0):
+        """
+        Avança o relógio.
+
+        Args:
+            dias (int): Dias a avançar.
+            horas (int): Horas a avançar.
+            minutos (int): Minutos a avançar.
+            segundos (int): Segundos a avançar.
+        """
+        self.definir(self.atual + timedelta(days=dias, hours=horas,
+                                            minutes=minutos,
+                                            seconds=segundos))
+
+
+_relogio: Relogio = RelogioReal()
+
+
+def relogio_atual():
+    """
+    Retorna o relógio usado pelo domínio.
+
+    Returns:
+        Relogio: Relógio atual.
+    """
+    return _relogio
+
+
+def definir_relogio(relogio):
+    """
+    Troca o relógio usado pelo domínio.
+
+    Args:
+        relogio (Relogio): Novo relógio.
+
+    Returns:
+        Relogio: O relógio anterior.
+    """
+    global _relogio  # pylint: disable=global-statement
+    anterior, _relogio = _relogio, relogio
+    return anterior
+
+
+@contextmanager
+def usando_relogio(relogio):
+    """
+    Usa `relogio` no domínio dentro do bloco `with` e restaura o anterior.
+
+    Args:
+        relogio (Relogio): Relógio a usar.
+    """
+    anterior = definir_relogio(relogio)
+    try:
+        yield relogio
+    finally:
+        definir_relogio(anterior)
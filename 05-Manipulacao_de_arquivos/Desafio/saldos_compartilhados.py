@@ -0,0 +1,281 @@
+"""
+Tabela de saldos em memória compartilhada.
+
+O processo dono das contas espelha o saldo de cada conta em um bloco de
+`multiprocessing.shared_memory`, um slot por conta. Outros processos anexam
+o mesmo bloco e respondem consultas de saldo e listagens lendo a memória
+diretamente, sem IPC e sem pickling.
+
+Cada slot é protegido por um contador de versão no estilo seqlock: o escritor
+torna a versão ímpar antes de alterar o slot e par depois. O leitor repete a
+leitura enquanto a versão estiver ímpar ou mudar durante a leitura, por no
+máximo PRAZO_LEITURA_S segundos: se o escritor morrer no meio de uma
+escrita, a leitura falha em vez de girar para sempre.
+
+O menu publica os saldos de todas as contas no bloco NOME_PADRAO; executado
+diretamente, este módulo é um processo leitor que consulta esse bloco.
+
+Exemplo (processo escritor):
+
+    tabela = TabelaSaldos(capacidade=100_000)
+    Conta.observadores_saldo.append(tabela.publicar)
+
+Exemplo (processo leitor):
+
+    leitor = LeitorSaldos(tabela.nome)
+    leitor.saldo("0001", 42)
+
+Uso (com o menu em execução):
+    python saldos_compartilhados.py --agencia 0001 --numero 42
+    python saldos_compartilhados.py
+"""
+import struct
+import time
+from multiprocessing import resource_tracker, shared_memory
+
+CABECALHO = struct.Struct("<QQ")  # capacidade, quantidade de slots em uso
+VERSAO = struct.Struct("<Q")
+DADOS_SLOT = struct.Struct("<qI4xd")  # número, agência, saldo
+TAMANHO_SLOT = VERSAO.size + DADOS_SLOT.size
+CAPACIDADE_PADRAO = 1_000_000
+# Bloco publicado pelo menu.
+NOME_PADRAO = "saldos_banco"
+# Tempo máximo de uma leitura com o slot em escrita.
+PRAZO_LEITURA_S = 1.0
+
+
+def _deslocamento(slot):
+    return CABECALHO.size + slot * TAMANHO_SLOT
+
+
+def _remover_bloco(nome):
+    # Remove um bloco deixado por um escritor que terminou sem fechá-lo.
+    try:
+        memoria = shared_memory.SharedMemory(name=nome)
+    except FileNotFoundError:
+        return
+    memoria.close()
+    memoria.unlink()
+
+
+class TabelaSaldos:
+    """
+    Lado escritor da tabela de saldos. Deve haver um único escritor por
+    tabela: o processo dono das contas. Com `substituir`, um bloco de mesmo
+    nome deixado por um escritor anterior é removido antes da criação.
+
+    Atributos:
+        nome (str): Nome do bloco de memória compartilhada.
+        capacidade (int): Quantidade máxima de contas espelhadas.
+        slots (dict): Slot de cada conta, indexado por (agência, número).
+    """
+
+    def __init__(self, capacidade=CAPACIDADE_PADRAO, nome=None,
+                 substituir=False):
+        self.capacidade = capacidade
+        if substituir and nome:
+            _remover_bloco(nome)
+        self._memoria = shared_memory.SharedMemory(
+            name=nome, create=True, size=_deslocamento(capacidade))
+        self.nome = self._memoria.name
+        self.slots: dict = {}
+        CABECALHO.pack_into(self._memoria.buf, 0, capacidade, 0)
+
+    def espelhar(self, contas):
+        """
+        Publica o saldo atual de um conjunto de contas.
+
+        Args:
+            contas (iterable): Contas a espelhar.
+        """
+        for conta in contas:
+            self.publicar(conta)
+
+    def publicar(self, conta):
+        """
+        Publica o saldo de uma conta, reservando um slot se necessário.
+
+        Pode ser registrado diretamente em `Conta.observadores_saldo`.
+
+        Args:
+            conta (Conta): Conta cujo saldo foi alterado.
+        """
+        chave = (conta.agencia, conta.numero)
+        slot = self.slots.get(chave)
+
+        if slot is None:
+            slot = len(self.slots)
+            if slot >= self.capacidade:
+                raise RuntimeError(
+                    f"Tabela de saldos cheia ({self.capacidade} contas).")
+            self.slots[chave] = slot
+            self._escrever(slot, conta)
+            # Só expõe o novo slot aos leitores depois de preenchido.
+            CABECALHO.pack_into(
+                self._memoria.buf, 0, self.capacidade, len(self.slots))
+            return
+
+        self._escrever(slot, conta)
+
+    def _escrever(self, slot, conta):
+        buffer = self._memoria.buf
+        deslocamento = _deslocamento(slot)
+        versao = VERSAO.unpack_from(buffer, deslocamento)[0]
+
+        VERSAO.pack_into(buffer, deslocamento, versao + 1)
+        DADOS_SLOT.pack_into(buffer, deslocamento + VERSAO.size,
+                             conta.numero, int(conta.agencia), conta.saldo)
+        VERSAO.pack_into(buffer, deslocamento, versao + 2)
+
+    def fechar(self):
+        """
+        Libera o bloco de memória compartilhada.
+        """
+        self._memoria.close()
+        self._memoria.unlink()
+
+
+class LeitorSaldos:
+    """
+    Lado leitor da tabela de saldos, para uso em qualquer processo.
+
+    Atributos:
+        nome (str): Nome do bloco de memória compartilhada.
+    """
+
+    def __init__(self, nome):
+        self.nome = nome
+        try:
+            # O bloco pertence ao escritor: o leitor não deve removê-lo ao
+            # sair (parâmetro disponível a partir do Python 3.13).
+            self._memoria = shared_memory.SharedMemory(name=nome, track=False)
+        except TypeError:
+            self._memoria = shared_memory.SharedMemory(name=nome)
+            # Antes do 3.13, anexar registra o bloco no resource_tracker do
+            # leitor, que o removeria ao sair: desfaz o registro.
+            resource_tracker.unregister(
+                self._memoria._name,  # pylint: disable=protected-access
+                "shared_memory")
+        self._slots: dict = {}
+
+    @property
+    def quantidade(self):
+        """
+        Retorna a quantidade de contas publicadas.
+
+        Returns:
+            int: Slots em uso.
+        """
+        return CABECALHO.unpack_from(self._memoria.buf, 0)[1]
+
+    def _ler(self, slot):
+        """
+        Lê um slot de forma consistente (protocolo seqlock).
+
+        Returns:
+            tuple: (número, agência, saldo).
+
+        Raises:
+            TimeoutError: Se o slot continuar em escrita por mais de
+            PRAZO_LEITURA_S segundos (escritor interrompido no meio de uma
+            escrita).
+        """
+        buffer = self._memoria.buf
+        deslocamento = _deslocamento(slot)
+        prazo = None
+
+        while True:
+            versao = VERSAO.unpack_from(buffer, deslocamento)[0]
+            if not versao & 1:
+                dados = DADOS_SLOT.unpack_from(buffer,
+                                               deslocamento + VERSAO.size)
+                if VERSAO.unpack_from(buffer, deslocamento)[0] == versao:
+                    return dados
+            # Só consulta o relógio quando a primeira tentativa falha.
+            if prazo is None:
+                prazo = time.monotonic() + PRAZO_LEITURA_S
+            elif time.monotonic() > prazo:
+                raise TimeoutError(
+                    f"Slot {slot} da tabela {self.nome} em escrita há mais "
+                    f"de {PRAZO_LEITURA_S} s.")
+            # Cede o processador ao escritor.
+            time.sleep(0)
+
+    def _indexar_novos_slots(self):
+        for slot in range(len(self._slots), self.quantidade):
+            numero, agencia, _ = self._ler(slot)
+            self._slots[(f"{agencia:04d}", numero)] = slot
+
+    def saldo(self, agencia, numero):
+        """
+        Consulta o saldo de uma conta.
+
+        Args:
+            agencia (str): Agência da conta.
+            numero (int): Número da conta.
+
+        Returns:
+            float | None: Saldo publicado, ou None se a conta não estiver na
+            tabela.
+        """
+        chave = (agencia, numero)
+        if chave not in self._slots:
+            self._indexar_novos_slots()
+            if chave not in self._slots:
+                return None
+
+        return self._ler(self._slots[chave])[2]
+
+    def listar(self):
+        """
+        Percorre todas as contas publicadas.
+
+        Yields:
+            tuple: (agência, número, saldo) de cada conta.
+        """
+        for slot in range(self.quantidade):
+            numero, agencia, saldo = self._ler(slot)
+            yield f"{agencia:04d}", numero, saldo
+
+    def fechar(self):
+        """
+        Desanexa o bloco de memória compartilhada deste processo.
+        """
+        self._memoria.close()
+
+
+def main():
+    """
+    Consulta os saldos publicados pelo menu.
+    """
+    # pylint: disable-next=import-outside-toplevel
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--nome", default=NOME_PADRAO)
+    parser.add_argument("--agencia")
+    parser.add_argument("--numero", type=int)
+    argumentos = parser.parse_args()
+
+    try:
+        leitor = LeitorSaldos(argumentos.nome)
+    except FileNotFoundError:
+        parser.exit(1, f"Tabela {argumentos.nome} não encontrada: o menu "
+                       "está em execução?\n")
+    try:
+        if argumentos.numero is not None:
+            saldo = leitor.saldo(argumentos.agencia or "0001",
+                                 argumentos.numero)
+            print("Conta não encontrada." if saldo is None
+                  else f"R$ {saldo:.2f}")
+        else:
+            for agencia, numero, saldo in leitor.listar():
+                print(f"{agencia} {numero:>10} R$ {saldo:>14.2f}")
+    finally:
+        leitor.fechar()
+
+
+if __name__ == "__main__":
+    main()
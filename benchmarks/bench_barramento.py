@@ -0,0 +1,110 @@
+"""
+Benchmark do barramento de eventos (barramento_eventos.py).
+
+Mede a latência da publicação de um evento (o acréscimo no caminho de
+`Transacao.registrar`) em cenários com assinantes rápidos e com um
+assinante lento, para cada política de fila cheia, e conta os eventos
+processados e descartados por assinante.
+
+Os eventos são publicados em um laço sem pausas (teste de estresse): como
+as threads dos assinantes só recebem o GIL a cada intervalo de troca do
+interpretador, até assinantes rápidos descartam eventos com a fila cheia.
+No menu, o registro das transações espera pela entrada do usuário e as
+filas são esvaziadas entre uma transação e outra.
+
+Uso:
+    python benchmarks/bench_barramento.py --eventos 200000
+"""
+import argparse
+import time
+
+from comum import cronometrar, gravar_json, metadados
+
+from barramento_eventos import (BLOQUEAR, DESCARTAR_ANTIGOS, DESCARTAR_NOVOS,
+                                BarramentoEventos, EventoTransacao)
+
+
+def rapido(_evento):
+    """
+    Assinante que apenas recebe o evento.
+    """
+
+
+def lento(_evento):
+    """
+    Assinante que leva 1 ms por evento (por exemplo, uma notificação
+    externa).
+    """
+    time.sleep(0.001)
+
+
+CENARIOS = {
+    "sem_assinantes": [],
+    "um_rapido": [("rapido", rapido, DESCARTAR_NOVOS)],
+    "tres_rapidos": [(f"rapido_{indice}", rapido, DESCARTAR_NOVOS)
+                     for indice in range(3)],
+    "lento_descartar_novos": [("rapido", rapido, DESCARTAR_NOVOS),
+                              ("lento", lento, DESCARTAR_NOVOS)],
+    "lento_descartar_antigos": [("rapido", rapido, DESCARTAR_NOVOS),
+                                ("lento", lento, DESCARTAR_ANTIGOS)],
+    "lento_bloquear": [("rapido", rapido, DESCARTAR_NOVOS),
+                       ("lento", lento, BLOQUEAR)],
+}
+
+
+def medir(assinaturas, numero_eventos, capacidade, espera_maxima):
+    """
+    Publica os eventos em um barramento com as assinaturas do cenário.
+
+    Returns:
+        dict: Latência da publicação e estatísticas dos assinantes.
+    """
+    barramento = BarramentoEventos()
+    for nome, funcao, politica in assinaturas:
+        barramento.assinar(nome, funcao, capacidade=capacidade,
+                           politica=politica, espera_maxima=espera_maxima)
+
+    eventos = [(EventoTransacao(indice, "Deposito", 10.0, "0001", 1,
+                                float(indice)),)
+               for indice in range(numero_eventos)]
+    publicacao = cronometrar(barramento.publicar, eventos)
+    barramento.encerrar()
+
+    return {
+        "publicacao": publicacao,
+        "assinantes": {assinante.nome: assinante.estatisticas()
+                       for assinante in barramento.assinantes},
+    }
+
+
+def main():
+    """
+    Executa o benchmark.
+    """
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--eventos", type=int, default=200_000)
+    parser.add_argument("--capacidade", type=int, default=1024)
+    parser.add_argument("--espera-maxima", type=float, default=0.002,
+                        help="espera da política BLOQUEAR, em segundos")
+    parser.add_argument("--saida", help="arquivo JSON de resultados")
+    argumentos = parser.parse_args()
+
+    resultados = {}
+    for nome, assinaturas in CENARIOS.items():
+        # Com um assinante lento bloqueando, cada publicação pode esperar
+        # `espera_maxima`: o cenário usa menos eventos.
+        eventos = (argumentos.eventos // 100 if nome == "lento_bloquear"
+                   else argumentos.eventos)
+        resultados[nome] = medir(assinaturas, eventos, argumentos.capacidade,
+                                 argumentos.espera_maxima)
+
+    gravar_json({
+        "metadados": metadados() | vars(argumentos),
+        "resultados": resultados,
+    }, argumentos.saida)
+
+
+if __name__ == "__main__":
+    main()
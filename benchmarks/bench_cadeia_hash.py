@@ -0,0 +1,127 @@
+"""
+Benchmark da cadeia de hashes dos históricos (cadeia_hash.py).
+
+Popula o banco com o gerador de dados sintéticos e mede:
+
+    * o custo do hash no caminho de `Historico.adicionar_transacao`
+      (`calcular_hash` isolado e `Deposito.registrar` completo);
+    * a verificação de todas as contas, em transações por segundo,
+      sequencial e com 1, 2, ... e `os.cpu_count()` processos;
+    * a detecção: altera uma transação de `--adulteracoes` contas e confere
+      se exatamente elas foram apontadas, no elo alterado.
+
+Uso:
+    python benchmarks/bench_cadeia_hash.py --clientes 100000 \\
+        --transacoes 5000000
+"""
+import argparse
+import os
+import random
+import time
+from datetime import datetime
+
+from comum import cronometrar, gravar_json, metadados, silenciar_saida
+
+import desafio_sistema_bancario as banco
+from cadeia_hash import HASH_INICIAL, calcular_hash, verificar_contas
+from gerador_dados import GeradorDados, popular_banco
+from relogio import RelogioSimulado, usando_relogio
+
+
+def medir_registro(chamadas):
+    """
+    Mede `Deposito.registrar` em uma conta real.
+
+    Returns:
+        float: Segundos por chamada.
+    """
+    with usando_relogio(RelogioSimulado(datetime(2024, 1, 1, 9, 0))), \
+            silenciar_saida():
+        cliente = banco.PessoaFisica("Cliente", "01-01-1990", "00000000000",
+                                     "Rua A, 1")
+        conta = banco.ContaCorrente.nova_conta(cliente, 1)
+        cliente.adicionar_conta(conta)
+        deposito = banco.Deposito(10)
+        inicio = time.perf_counter()
+        for _ in range(chamadas):
+            deposito.registrar(conta)
+        return (time.perf_counter() - inicio) / chamadas
+
+
+def adulterar(contas, quantidade, semente):
+    """
+    Altera o valor de uma transação de `quantidade` contas.
+
+    Returns:
+        dict: Posição alterada de cada conta, indexada por (agência, número).
+    """
+    aleatorio = random.Random(semente)
+    com_transacoes = [conta for conta in contas if conta.historico.transacoes]
+    adulteradas = {}
+    for conta in aleatorio.sample(com_transacoes,
+                                  min(quantidade, len(com_transacoes))):
+        transacoes = conta.historico.transacoes
+        posicao = aleatorio.randrange(len(transacoes))
+        transacoes[posicao]["valor"] += 0.01
+        adulteradas[(conta.agencia, conta.numero)] = posicao
+    return adulteradas
+
+
+def main():
+    """
+    Executa o benchmark.
+    """
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clientes", type=int, default=100_000)
+    parser.add_argument("--transacoes", type=int, default=5_000_000)
+    parser.add_argument("--adulteracoes", type=int, default=100)
+    parser.add_argument("--chamadas-registro", type=int, default=200_000)
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--saida", help="arquivo JSON de resultados")
+    argumentos = parser.parse_args()
+
+    hash_isolado = cronometrar(
+        calcular_hash, [(HASH_INICIAL, "Deposito", 123.45, 1_704_067_200.5)]
+        * argumentos.chamadas_registro)
+    registro = medir_registro(argumentos.chamadas_registro)
+
+    inicio = time.perf_counter()
+    _, contas = popular_banco(GeradorDados(argumentos.semente),
+                              argumentos.clientes, argumentos.transacoes)
+    carga = time.perf_counter() - inicio
+
+    resultados = {
+        "calcular_hash": hash_isolado,
+        "registrar_us": registro * 1e6,
+        "carga_s": carga,
+        "sequencial": verificar_contas(contas, paralelo=False),
+        "paralelo": {},
+    }
+    for processos in sorted({1, 2, os.cpu_count() or 1}):
+        resultados["paralelo"][processos] = verificar_contas(
+            contas, max_workers=processos)
+
+    adulteradas = adulterar(contas, argumentos.adulteracoes,
+                            argumentos.semente)
+    verificacao = verificar_contas(contas)
+    apontadas = {(quebra["agencia"], quebra["numero"]): quebra["posicao"]
+                 for quebra in verificacao["quebras"]}
+    resultados["deteccao"] = {
+        "adulteradas": len(adulteradas),
+        "apontadas": len(apontadas),
+        "elos_corretos": apontadas == adulteradas,
+    }
+    for resultado in (resultados["sequencial"],
+                      *resultados["paralelo"].values()):
+        del resultado["quebras"]
+
+    gravar_json({
+        "metadados": metadados() | vars(argumentos),
+        "resultados": resultados,
+    }, argumentos.saida)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+"""
+Benchmark dos caminhos críticos do sistema bancário
+(05-Manipulacao_de_arquivos/Desafio/desafio_sistema_bancario.py).
+
+Para cada escala (por padrão 1 mil, 100 mil e 1 milhão de clientes, cada um
+com uma conta corrente e um histórico sintético gerado por `gerador_dados`),
+mede:
+
+    * filtrar_cliente
+    * Cliente.realizar_transacao (com a quantidade de transações registradas)
+    * ContaCorrente.sacar (com a quantidade de saques registrados)
+    * Historico.transacoes_do_dia
+    * Historico.gerar_relatorio
+    * exibir_extrato (renderização do extrato)
+    * log_transacao (sobrecarga do decorador)
+
+Os resultados são gravados em JSON. Com --comparar, imprime a variação de
+cada métrica em relação a uma execução anterior.
+
+Uso:
+    python benchmarks/bench_caminhos_criticos.py --saida atual.json
+    python benchmarks/bench_caminhos_criticos.py --escalas 1000 \\
+        --comparar anterior.json
+"""
+import argparse
+import builtins
+import json
+import random
+import tempfile
+from datetime import datetime, time
+from pathlib import Path
+
+from comum import cronometrar, gravar_json, metadados, silenciar_saida
+
+import desafio_sistema_bancario as banco
+from gerador_dados import FIM_PADRAO, GeradorDados, popular_banco
+from relogio import RelogioSimulado, usando_relogio
+
+ESCALAS_PADRAO = "1000,100000,1000000"
+# Início das chamadas medidas: depois do fim padrão do gerador de dados.
+INICIO_MEDICAO = datetime(2025, 1, 1, 12, 0)
+# Dia consultado em transacoes_do_dia: o último dia do período gerado, para
+# que a consulta percorra transações de fato (e não um dia sem movimento).
+DIA_CONSULTA = datetime.combine(FIM_PADRAO, time(12, 0))
+
+
+def medir_escala(numero_clientes, argumentos):
+    """
+    Executa todas as medições para uma escala.
+
+    Returns:
+        dict: Métricas de cada caminho medido.
+    """
+    clientes, contas = popular_banco(
+        GeradorDados(argumentos.semente, expoente_zipf=argumentos.zipf),
+        numero_clientes, numero_clientes * argumentos.transacoes)
+    aleatorio = random.Random(argumentos.semente)
+    amostra = [aleatorio.randrange(numero_clientes)
+               for _ in range(argumentos.chamadas)]
+    # filtrar_cliente percorre a lista inteira: limita as chamadas.
+    amostra_busca = amostra[:max(1, argumentos.chamadas *
+                                 1000 // numero_clientes)]
+    resultados = {}
+
+    resultados["filtrar_cliente"] = cronometrar(
+        banco.filtrar_cliente,
+        [(clientes[i].cpf, clientes) for i in amostra_busca])
+    encontradas: list = []
+    with usando_relogio(RelogioSimulado(DIA_CONSULTA)):
+        resultados["Historico.transacoes_do_dia"] = cronometrar(
+            lambda historico: encontradas.append(
+                len(historico.transacoes_do_dia())),
+            [(contas[i].historico,) for i in amostra])
+    resultados["Historico.transacoes_do_dia"]["transacoes_encontradas"] = sum(
+        encontradas)
+    resultados["Historico.gerar_relatorio"] = cronometrar(
+        lambda historico: list(historico.gerar_relatorio("saque")),
+        [(contas[i].historico,) for i in amostra])
+
+    # Cada chamada medida cai em um dia novo, depois do histórico gerado:
+    # assim os limites diários de transações e de saques não transformam as
+    # chamadas em recusas.
+    relogio = RelogioSimulado(INICIO_MEDICAO)
+
+    def no_dia_seguinte(metodo, registradas):
+        def chamar(*argumentos):
+            relogio.avancar(dias=1)
+            registradas.append(metodo(*argumentos))
+        return chamar
+
+    with usando_relogio(relogio), silenciar_saida():
+        # Depósitos antes dos saques, para que haja saldo.
+        registradas: list = []
+        resultados["Cliente.realizar_transacao"] = cronometrar(
+            no_dia_seguinte(banco.Cliente.realizar_transacao, registradas),
+            [(clientes[i], contas[i], banco.Deposito(10)) for i in amostra])
+        resultados["Cliente.realizar_transacao"]["registradas"] = sum(
+            registradas)
+        registradas = []
+        resultados["ContaCorrente.sacar"] = cronometrar(
+            no_dia_seguinte(banco.ContaCorrente.sacar, registradas),
+            [(contas[i], 1) for i in amostra])
+        resultados["ContaCorrente.sacar"]["registradas"] = sum(registradas)
+
+        with tempfile.TemporaryDirectory() as diretorio:
+            # Mantém o log.txt do repositório intacto.
+            caminho_original = banco.ROOT_PATH
+            entrada_original = builtins.input
+            banco.ROOT_PATH = Path(diretorio)
+
+            def renderizar_extrato(cliente):
+                builtins.input = lambda *_: cliente.cpf
+                banco.exibir_extrato([cliente])
+
+            def sem_operacao():
+                return None
+
+            try:
+                resultados["exibir_extrato"] = cronometrar(
+                    renderizar_extrato, [(clientes[i],) for i in amostra])
+
+                base = cronometrar(sem_operacao, [()] * argumentos.chamadas)
+                decorada = cronometrar(banco.log_transacao(sem_operacao),
+                                       [()] * argumentos.chamadas)
+                decorada["sobrecarga_media_ns"] = (
+                    decorada["media_ns"] - base["media_ns"])
+                resultados["log_transacao"] = decorada
+            finally:
+                builtins.input = entrada_original
+                banco.ROOT_PATH = caminho_original
+
+    return resultados
+
+
+def comparar(atual, anterior):
+    """
+    Imprime a variação da latência média entre duas execuções.
+    """
+    print(f"{'escala':>10}  {'caminho':<30}{'anterior':>14}{'atual':>14}"
+          f"{'variação':>10}")
+    for escala, metricas in atual["resultados"].items():
+        for caminho, valores in metricas.items():
+            base = anterior["resultados"].get(escala, {}).get(caminho)
+            if not base or not base["media_ns"]:
+                continue
+            variacao = valores["media_ns"] / base["media_ns"] - 1
+            print(f"{escala:>10}  {caminho:<30}{base['media_ns']:>14,.0f}"
+                  f"{valores['media_ns']:>14,.0f}{variacao:>+10.1%}")
+
+
+def main():
+    """
+    Executa o benchmark para as escalas informadas.
+    """
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--escalas", default=ESCALAS_PADRAO,
+                        help="quantidades de clientes, separadas por vírgula")
+    parser.add_argument("--transacoes", type=int, default=10,
+                        help="média de transações por conta no histórico")
+    parser.add_argument("--zipf", type=float, default=1.1,
+                        help="expoente de Zipf da distribuição entre contas")
+    parser.add_argument("--chamadas", type=int, default=1000,
+                        help="chamadas medidas por caminho")
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--saida", help="arquivo JSON de resultados")
+    parser.add_argument("--comparar", help="JSON de uma execução anterior")
+    argumentos = parser.parse_args()
+
+    resultados = {
+        "metadados": metadados() | {
+            "transacoes_por_conta": argumentos.transacoes,
+            "expoente_zipf": argumentos.zipf,
+            "chamadas": argumentos.chamadas,
+            "semente": argumentos.semente,
+        },
+        "resultados": {},
+    }
+    for escala in argumentos.escalas.split(","):
+        resultados["resultados"][escala] = medir_escala(
+            int(escala), argumentos)
+
+    gravar_json(resultados, argumentos.saida)
+
+    if argumentos.comparar:
+        with open(argumentos.comparar, "r", encoding="utf-8") as arquivo:
+            comparar(resultados, json.load(arquivo))
+
+
+if __name__ == "__main__":
+    main()
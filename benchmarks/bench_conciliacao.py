@@ -0,0 +1,122 @@
+"""
+Benchmark da conciliação de saldos (conciliacao.py).
+
+Duas medidas:
+
+    * ponta a ponta: popula o banco com o gerador de dados sintéticos,
+      altera o saldo de `--divergencias` contas e mede a carga dos
+      históricos em colunas NumPy, a conciliação e a soma das duas (o
+      custo de `conciliar_contas` a partir dos dicts dos históricos),
+      conferindo se exatamente as contas alteradas foram apontadas;
+    * redução agrupada: mede `conciliar` sobre `--linhas` transações
+      sintéticas já em colunas (por padrão, 100 milhões).
+
+Uso:
+    python benchmarks/bench_conciliacao.py --transacoes 1000000 \\
+        --linhas 100000000
+"""
+import argparse
+import random
+import time
+
+import numpy as np
+from comum import gravar_json, metadados
+
+from conciliacao import colunas_historicos, conciliar
+from gerador_dados import GeradorDados, popular_banco
+
+
+def medir_ponta_a_ponta(clientes, transacoes, divergencias, semente):
+    """
+    Concilia um banco populado com divergências conhecidas.
+
+    Returns:
+        dict: Tempos de carga, de conciliação e total, e contas apontadas.
+    """
+    _, contas = popular_banco(GeradorDados(semente), clientes, transacoes)
+    alteradas = set(random.Random(semente).sample(range(len(contas)),
+                                                  divergencias))
+    for indice in alteradas:
+        contas[indice]._saldo += 1  # pylint: disable=protected-access
+
+    inicio = time.perf_counter()
+    indices, valores, saldos = colunas_historicos(contas)
+    carga = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    divergentes, _ = conciliar(indices, valores, saldos)
+    conciliacao = time.perf_counter() - inicio
+
+    if set(divergentes.tolist()) != alteradas:
+        raise RuntimeError("Divergências apontadas diferem das inseridas.")
+
+    return {
+        "transacoes": len(valores),
+        "contas": len(contas),
+        "carga_s": carga,
+        "conciliacao_s": conciliacao,
+        "total_s": carga + conciliacao,
+        "transacoes_por_segundo": len(valores) / (carga + conciliacao),
+        "divergentes": len(divergentes),
+    }
+
+
+def medir_reducao(linhas, contas, semente):
+    """
+    Mede a redução agrupada sobre colunas sintéticas.
+
+    Returns:
+        dict: Tempo e vazão da conciliação.
+    """
+    aleatorio = np.random.default_rng(semente)
+    indices = aleatorio.integers(0, contas, size=linhas, dtype=np.intp)
+    valores = aleatorio.integers(-500, 1000, size=linhas).astype(np.float64)
+    saldos = np.bincount(indices, weights=valores, minlength=contas)
+    saldos[::1000] += 1
+
+    inicio = time.perf_counter()
+    divergentes, _ = conciliar(indices, valores, saldos)
+    duracao = time.perf_counter() - inicio
+
+    return {
+        "linhas": linhas,
+        "contas": contas,
+        "conciliacao_s": duracao,
+        "transacoes_por_segundo": linhas / duracao,
+        "divergentes": len(divergentes),
+    }
+
+
+def main():
+    """
+    Executa o benchmark.
+    """
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clientes", type=int, default=10_000)
+    parser.add_argument("--transacoes", type=int, default=1_000_000)
+    parser.add_argument("--divergencias", type=int, default=25)
+    parser.add_argument("--linhas", type=int, default=100_000_000)
+    parser.add_argument("--contas-linhas", type=int, default=1_000_000,
+                        help="contas da medida de redução agrupada")
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--saida", help="arquivo JSON de resultados")
+    argumentos = parser.parse_args()
+
+    gravar_json({
+        "metadados": metadados() | vars(argumentos) | {
+            "numpy": np.__version__},
+        "resultados": {
+            "ponta_a_ponta": medir_ponta_a_ponta(
+                argumentos.clientes, argumentos.transacoes,
+                argumentos.divergencias, argumentos.semente),
+            "reducao_agrupada": medir_reducao(
+                argumentos.linhas, argumentos.contas_linhas,
+                argumentos.semente),
+        },
+    }, argumentos.saida)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""
+Benchmark do fechamento do dia (fechamento_dia.fechar_dia).
+
+Cria `--contas` contas correntes repartidas em `--agencias` agências, faz um
+depósito e um saque no dia em uma fração das contas e mede a vazão (contas
+por segundo) do fechamento no próprio processo e com 1, 2, ... processos.
+Cada rodada confere os totais da tabela gravada com os do fechamento. Ao
+final, faz novas transações no dia seguinte e fecha de novo o dia medido: o
+saldo total de fechamento não pode mudar.
+
+Uso:
+    python benchmarks/bench_fechamento.py --contas 1000000 --agencias 8
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import datetime
+
+from comum import gravar_json, metadados, silenciar_saida
+
+import desafio_sistema_bancario as banco
+from agencias import Agencia
+from fechamento_dia import TabelaFechamento, caminho_fechamento, fechar_dia
+from relogio import RelogioSimulado, usando_relogio
+
+
+def criar_agencias(numero_contas, numero_agencias, diretorio):
+    """
+    Cria as agências e suas contas. As contas de uma agência compartilham um
+    titular, para que a memória seja ocupada pelas contas e não pelos
+    clientes.
+
+    Returns:
+        list: Agências criadas.
+    """
+    agencias = [Agencia(f"{indice + 1:04d}", diretorio)
+                for indice in range(numero_agencias)]
+    for indice, agencia in enumerate(agencias):
+        titular = banco.PessoaFisica(f"Titular {indice}", "01-01-1990",
+                                     f"{indice:011d}", "Rua A, 1")
+        for numero in range(indice + 1, numero_contas + 1, numero_agencias):
+            agencia.contas[numero] = banco.ContaCorrente.nova_conta(
+                titular, numero, agencia.codigo)
+    return agencias
+
+
+def movimentar(agencias, fracao_ativa, semente):
+    """
+    Faz um depósito e um saque em uma fração das contas.
+
+    Returns:
+        int: Transações realizadas.
+    """
+    aleatorio = random.Random(semente)
+    transacoes = 0
+    with silenciar_saida():
+        for agencia in agencias:
+            contas = list(agencia)
+            for conta in aleatorio.sample(
+                    contas, int(len(contas) * fracao_ativa)):
+                banco.Deposito(100).registrar(conta)
+                banco.Saque(40).registrar(conta)
+                transacoes += 2
+    return transacoes
+
+
+def medir(agencias, instante, diretorio, processos):
+    """
+    Executa um fechamento e confere o resultado.
+
+    Returns:
+        dict: Duração, vazão e totais do fechamento.
+    """
+    inicio = time.perf_counter()
+    resumos = fechar_dia(agencias, instante, diretorio,
+                         max_workers=processos, paralelo=bool(processos))
+    duracao = time.perf_counter() - inicio
+
+    contas = sum(resumo["contas"] for resumo in resumos.values())
+    transacoes = sum(resumo["transacoes"] for resumo in resumos.values())
+    agencia = agencias[0]
+    tabela = TabelaFechamento.carregar(caminho_fechamento(
+        agencia.codigo, agencia.contas[1].historico.fronteiras.dia(instante),
+        diretorio))
+    if tabela.totais() != resumos[agencia.codigo]:
+        raise RuntimeError("Tabela gravada difere dos totais do fechamento.")
+
+    return {
+        "processos": processos,
+        "duracao_s": duracao,
+        "contas_por_segundo": contas / duracao if duracao else 0,
+        "contas": contas,
+        "transacoes_no_dia": transacoes,
+    }
+
+
+def main():
+    """
+    Executa o benchmark.
+    """
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--contas", type=int, default=1_000_000)
+    parser.add_argument("--agencias", type=int, default=8)
+    parser.add_argument("--fracao-ativa", type=float, default=0.05,
+                        help="fração das contas que transaciona no dia")
+    parser.add_argument("--processos", type=int, nargs="+",
+                        default=sorted({0, 1, 2, os.cpu_count() or 1}),
+                        help="processos de cada rodada (0: no próprio "
+                             "processo)")
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--saida", help="arquivo JSON de resultados")
+    argumentos = parser.parse_args()
+
+    relogio = RelogioSimulado(datetime(2024, 1, 1, 15, 0))
+    with tempfile.TemporaryDirectory() as diretorio, usando_relogio(relogio):
+        inicio = time.perf_counter()
+        agencias = criar_agencias(argumentos.contas, argumentos.agencias,
+                                  os.path.join(diretorio, "agencias"))
+        criacao = time.perf_counter() - inicio
+        transacoes = movimentar(agencias, argumentos.fracao_ativa,
+                                argumentos.semente)
+
+        dia_fechado = relogio.instante()
+        rodadas = []
+        for processos in argumentos.processos:
+            # Todas as rodadas fecham o mesmo dia: como os contadores já
+            # foram passados para o dia seguinte, cada conta reconta o dia
+            # fechado a partir do histórico.
+            rodadas.append(medir(
+                agencias, dia_fechado,
+                os.path.join(diretorio, "fechamentos"), processos))
+
+        # Fechamento atrasado: depois de novas transações no dia seguinte,
+        # o dia já fechado mantém os saldos daquele dia.
+        saldo_total = sum(resumo["saldo_total"] for resumo in fechar_dia(
+            agencias, dia_fechado, os.path.join(diretorio, "fechamentos"),
+            paralelo=False).values())
+        relogio.avancar(dias=1)
+        movimentar(agencias, argumentos.fracao_ativa, argumentos.semente)
+        atrasado = sum(resumo["saldo_total"] for resumo in fechar_dia(
+            agencias, dia_fechado, os.path.join(diretorio, "fechamentos"),
+            paralelo=False).values())
+        if abs(atrasado - saldo_total) > 0.005:
+            raise RuntimeError("Fechamento atrasado difere do fechamento "
+                               "no dia.")
+
+    gravar_json({
+        "metadados": metadados() | vars(argumentos),
+        "resultados": {
+            "criacao_contas_s": criacao,
+            "transacoes": transacoes,
+            "rodadas": rodadas,
+        },
+    }, argumentos.saida)
+
+
+if __name__ == "__main__":
+    main()
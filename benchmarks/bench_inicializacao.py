@@ -0,0 +1,150 @@
+"""
+Benchmark de inicialização do menu do sistema bancário
+(05-Manipulacao_de_arquivos/Desafio/desafio_sistema_bancario.py).
+
+Cada execução inicia um novo interpretador e mede:
+
+    * tempo até o primeiro prompt do menu;
+    * tempo para processar um comando roteirizado (por padrão `m`, o resumo
+      das métricas) até o prompt seguinte.
+
+A mediana de cada medida é comparada com o orçamento; se algum orçamento for
+excedido, o script termina com código 1, para uso em CI.
+
+Uso:
+    python benchmarks/bench_inicializacao.py --execucoes 10 --saida atual.json
+"""
+import argparse
+import os
+import queue
+import subprocess
+import sys
+import threading
+import time
+
+from comum import DESAFIO_PATH, gravar_json, metadados, percentil
+
+MARCADOR_PROMPT = "Digite a opção desejada".encode("utf-8")
+ORCAMENTO_PROMPT_MS = 150
+ORCAMENTO_COMANDO_MS = 50
+PRAZO_S = 30
+
+
+def _ler_saida(fluxo, fila):
+    for bloco in iter(lambda: os.read(fluxo.fileno(), 4096), b""):
+        fila.put(bloco)
+    fila.put(None)
+
+
+def _aguardar_prompt(fila, saida, desde, prazo):
+    # Acumula a saída até aparecer um prompt a partir da posição `desde`;
+    # retorna a posição logo após esse prompt.
+    while (posicao := saida.find(MARCADOR_PROMPT, desde)) < 0:
+        bloco = fila.get(timeout=max(0.0, prazo - time.monotonic()))
+        if bloco is None:
+            raise RuntimeError("O menu terminou antes de exibir o prompt:\n"
+                               + saida.decode("utf-8", "replace"))
+        saida.extend(bloco)
+    return posicao + len(MARCADOR_PROMPT)
+
+
+def medir_execucao(comando):
+    """
+    Inicia o menu, executa `comando` e sai.
+
+    Returns:
+        tuple: Segundos até o primeiro prompt e segundos do comando.
+    """
+    inicio = time.perf_counter()
+    processo = subprocess.Popen(  # pylint: disable=consider-using-with
+        [sys.executable, "-u", str(DESAFIO_PATH /
+                                   "desafio_sistema_bancario.py")],
+        cwd=DESAFIO_PATH, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT)
+    fila: queue.Queue = queue.Queue()
+    threading.Thread(target=_ler_saida, args=(processo.stdout, fila),
+                     daemon=True).start()
+    saida = bytearray()
+    prazo = time.monotonic() + PRAZO_S
+
+    try:
+        posicao = _aguardar_prompt(fila, saida, 0, prazo)
+        primeiro_prompt = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        processo.stdin.write(f"{comando}\n".encode("utf-8"))
+        processo.stdin.flush()
+        _aguardar_prompt(fila, saida, posicao, prazo)
+        duracao_comando = time.perf_counter() - inicio
+
+        processo.stdin.write(b"q\n")
+        processo.stdin.flush()
+        processo.wait(timeout=PRAZO_S)
+    finally:
+        if processo.poll() is None:
+            processo.kill()
+            processo.wait()
+
+    return primeiro_prompt, duracao_comando
+
+
+def resumir(tempos, orcamento_ms):
+    """
+    Resume uma série de tempos (em segundos) em milissegundos.
+
+    Returns:
+        dict: Mediana, p90, máximo, orçamento e se a mediana o respeita.
+    """
+    ordenados = sorted(tempo * 1000 for tempo in tempos)
+    mediana = percentil(ordenados, 0.50)
+    return {
+        "mediana_ms": mediana,
+        "p90_ms": percentil(ordenados, 0.90),
+        "max_ms": ordenados[-1],
+        "orcamento_ms": orcamento_ms,
+        "dentro_do_orcamento": mediana <= orcamento_ms,
+    }
+
+
+def main():
+    """
+    Executa o benchmark e aplica os orçamentos.
+    """
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--execucoes", type=int, default=10)
+    parser.add_argument("--comando", default="m",
+                        help="opção do menu executada em cada execução")
+    parser.add_argument("--orcamento-prompt-ms", type=float,
+                        default=ORCAMENTO_PROMPT_MS)
+    parser.add_argument("--orcamento-comando-ms", type=float,
+                        default=ORCAMENTO_COMANDO_MS)
+    parser.add_argument("--saida", help="arquivo JSON de resultados")
+    argumentos = parser.parse_args()
+
+    medicoes = [medir_execucao(argumentos.comando)
+                for _ in range(argumentos.execucoes)]
+    resultados = {
+        "metadados": metadados() | {"execucoes": argumentos.execucoes,
+                                    "comando": argumentos.comando},
+        "resultados": {
+            "primeiro_prompt": resumir(
+                [prompt for prompt, _ in medicoes],
+                argumentos.orcamento_prompt_ms),
+            "comando": resumir(
+                [comando for _, comando in medicoes],
+                argumentos.orcamento_comando_ms),
+        },
+    }
+    gravar_json(resultados, argumentos.saida)
+
+    estourados = [nome for nome, medida in resultados["resultados"].items()
+                  if not medida["dentro_do_orcamento"]]
+    if estourados:
+        print(f"Orçamento excedido: {', '.join(estourados)}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
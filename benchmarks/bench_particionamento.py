@@ -0,0 +1,106 @@
+"""
+Benchmark do modo particionado (livro_particionado).
+
+Mede a vazão de depósitos e saques roteados para 1, 2, 4, ... partições, até
+o número de núcleos da máquina, e compara com a execução em um único
+interpretador.
+
+Uso:
+    python benchmarks/bench_particionamento.py [--clientes N] [--lote N]
+"""
+import argparse
+import os
+import time
+
+from comum import silenciar_saida
+from livro_particionado import LivroParticionado, _aplicar
+
+AGENCIA = "0001"
+
+
+def gerar_operacoes(numero_clientes):
+    """
+    Gera as operações de carga: um depósito e um saque por conta.
+    """
+    operacoes = []
+    for indice in range(numero_clientes):
+        cpf = f"{indice:011d}"
+        operacoes.append(("deposito", cpf, AGENCIA, indice + 1, 200))
+        operacoes.append(("saque", cpf, AGENCIA, indice + 1, 50))
+    return operacoes
+
+
+def preparar_cadastro(numero_clientes):
+    """
+    Gera as operações de cadastro de clientes e contas.
+    """
+    clientes = [("cliente", f"{indice:011d}", f"Cliente {indice}",
+                 "01-01-1990", "Rua A, 1")
+                for indice in range(numero_clientes)]
+    contas = [("conta", f"{indice:011d}", AGENCIA, indice + 1)
+              for indice in range(numero_clientes)]
+    return clientes, contas
+
+
+def medir_sequencial(numero_clientes, operacoes):
+    """
+    Executa a mesma carga em um único interpretador, sem roteamento.
+    """
+    clientes, contas = {}, {}
+    cadastro_clientes, cadastro_contas = preparar_cadastro(numero_clientes)
+    with silenciar_saida():
+        for operacao in cadastro_clientes + cadastro_contas:
+            _aplicar(clientes, contas, operacao)
+
+        inicio = time.perf_counter()
+        for operacao in operacoes:
+            _aplicar(clientes, contas, operacao)
+        return time.perf_counter() - inicio
+
+
+def medir_particionado(numero_particoes, numero_clientes, operacoes,
+                       tamanho_lote):
+    """
+    Executa a carga no livro particionado, em lotes.
+    """
+    cadastro_clientes, cadastro_contas = preparar_cadastro(numero_clientes)
+    with LivroParticionado(numero_particoes) as livro:
+        livro.executar(cadastro_clientes)
+        livro.executar(cadastro_contas)
+
+        inicio = time.perf_counter()
+        for posicao in range(0, len(operacoes), tamanho_lote):
+            livro.executar(operacoes[posicao:posicao + tamanho_lote])
+        return time.perf_counter() - inicio
+
+
+def main():
+    """
+    Executa o benchmark e imprime a vazão por número de partições.
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clientes", type=int, default=50_000)
+    parser.add_argument("--lote", type=int, default=10_000)
+    argumentos = parser.parse_args()
+
+    operacoes = gerar_operacoes(argumentos.clientes)
+    total = len(operacoes)
+    nucleos = os.cpu_count() or 1
+
+    tempo = medir_sequencial(argumentos.clientes, operacoes)
+    print(f"{'modo':<16}{'partições':>10}{'ops/s':>14}{'aceleração':>12}")
+    print(f"{'sequencial':<16}{1:>10}{total / tempo:>14,.0f}{1:>12.2f}")
+    base = total / tempo
+
+    numero_particoes = 1
+    while numero_particoes <= nucleos:
+        tempo = medir_particionado(numero_particoes, argumentos.clientes,
+                                   operacoes, argumentos.lote)
+        vazao = total / tempo
+        print(f"{'particionado':<16}{numero_particoes:>10}{vazao:>14,.0f}"
+              f"{vazao / base:>12.2f}")
+        numero_particoes *= 2
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Benchmark do ranking de saldos (ranking_saldos.RankingSaldos).
+
+Registra `--contas` contas no ranking, aplica `--alteracoes` alterações de
+saldo aleatórias e mede:
+
+    * o custo de cada notificação de saldo no observador;
+    * as consultas dos `--top` maiores e menores saldos;
+    * a ordenação completa das contas, como referência.
+
+As consultas são conferidas contra a ordenação completa.
+
+Uso:
+    python benchmarks/bench_ranking.py --contas 1000000 --top 10
+"""
+import argparse
+import random
+import time
+
+from comum import cronometrar, gravar_json, metadados
+
+from ranking_saldos import RankingSaldos
+
+
+class ContaSimulada:  # pylint: disable=too-few-public-methods
+    """
+    Conta mínima com os atributos lidos pelo ranking.
+    """
+    __slots__ = ("agencia", "numero", "saldo")
+
+    def __init__(self, agencia, numero, saldo):
+        self.agencia = agencia
+        self.numero = numero
+        self.saldo = saldo
+
+
+def main():
+    """
+    Executa o benchmark.
+    """
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--contas", type=int, default=1_000_000)
+    parser.add_argument("--alteracoes", type=int, default=1_000_000)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--consultas", type=int, default=1_000)
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--saida", help="arquivo JSON de resultados")
+    argumentos = parser.parse_args()
+
+    aleatorio = random.Random(argumentos.semente)
+    ranking = RankingSaldos()
+    contas = [ContaSimulada("0001", numero, 0)
+              for numero in range(argumentos.contas)]
+    for conta in contas:
+        ranking(conta)
+
+    def alterar(conta, valor):
+        conta.saldo = max(0, conta.saldo + valor)
+        ranking(conta)
+
+    alteracoes = cronometrar(alterar, [
+        (aleatorio.choice(contas), aleatorio.randint(-500, 1000))
+        for _ in range(argumentos.alteracoes)])
+
+    # Intercala consultas e alterações, como no uso real.
+    tempos_consultas = []
+    for _ in range(argumentos.consultas):
+        alterar(aleatorio.choice(contas), aleatorio.randint(-500, 1000))
+        inicio = time.perf_counter_ns()
+        ranking.maiores(argumentos.top)
+        ranking.menores(argumentos.top)
+        tempos_consultas.append(time.perf_counter_ns() - inicio)
+    tempos_consultas.sort()
+
+    inicio = time.perf_counter()
+    ordenadas = sorted(contas, key=lambda conta: conta.saldo)
+    ordenacao = time.perf_counter() - inicio
+
+    saldos = [conta.saldo for conta in ranking.maiores(argumentos.top)]
+    if (saldos != [conta.saldo for conta in ordenadas[::-1][:argumentos.top]]
+            or [conta.saldo for conta in ranking.menores(argumentos.top)]
+            != [conta.saldo for conta in ordenadas[:argumentos.top]]):
+        raise RuntimeError("Ranking difere da ordenação completa.")
+
+    gravar_json({
+        "metadados": metadados() | vars(argumentos),
+        "resultados": {
+            "alteracoes": alteracoes,
+            "consulta_maiores_e_menores_p50_ns":
+                tempos_consultas[len(tempos_consultas) // 2],
+            "consulta_maiores_e_menores_max_ns": tempos_consultas[-1],
+            "ordenacao_completa_s": ordenacao,
+        },
+    }, argumentos.saida)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+Benchmark dos relatórios gerenciais (relatorios.py).
+
+Popula o banco com o gerador de dados sintéticos e compara, para o
+relatório diário e o mensal:
+
+    * a carga das colunas NumPy a partir dos históricos, a frio (cache
+      vazio) e depois de `--novas` transações acrescentadas (cache
+      aquecido, convertendo só as novas);
+    * a agregação vetorizada (`relatorios.agregar`);
+    * um laço Python sobre os dicts dos históricos, como referência.
+
+As linhas das duas abordagens são conferidas entre si.
+
+Uso:
+    python benchmarks/bench_relatorios.py --transacoes 1000000 \\
+        --agencias 0001 0002 0003
+"""
+import argparse
+import random
+import time
+from datetime import datetime
+
+from comum import gravar_json, metadados
+
+import desafio_sistema_bancario as banco
+from fusos import fronteiras_agencia
+from gerador_dados import GeradorDados, popular_banco
+from relatorios import CacheColunas, agregar, colunas_transacoes
+from relogio import RelogioSimulado, usando_relogio
+
+
+def agregar_em_laco(contas, periodo):
+    """
+    Calcula o relatório com um laço Python sobre os históricos.
+
+    Returns:
+        list: Linhas no mesmo formato de `relatorios.agregar`.
+    """
+    grupos: dict = {}
+    for conta in contas:
+        fronteiras = fronteiras_agencia(conta.agencia)
+        for transacao in conta.historico.transacoes:
+            dia = fronteiras.dia(transacao["instante"])
+            chave = (dia.isoformat() if periodo == "dia"
+                     else f"{dia.year:04d}-{dia.month:02d}", conta.agencia)
+            grupo = grupos.setdefault(chave, [0, 0.0, 0, 0.0])
+            deslocamento = 2 if transacao["tipo"] == "Saque" else 0
+            grupo[deslocamento] += 1
+            grupo[deslocamento + 1] += transacao["valor"]
+
+    linhas = []
+    for (rotulo, agencia), (depositos, total_depositos, saques,
+                            total_saques) in sorted(grupos.items()):
+        linhas.append((
+            rotulo, agencia,
+            depositos, round(total_depositos, 2),
+            round(total_depositos / depositos, 2) if depositos else 0.0,
+            saques, round(total_saques, 2),
+            round(total_saques / saques, 2) if saques else 0.0,
+        ))
+    return linhas
+
+
+def acrescentar_transacoes(contas, quantidade, semente):
+    """
+    Acrescenta `quantidade` depósitos a contas sorteadas.
+    """
+    aleatorio = random.Random(semente)
+    with usando_relogio(RelogioSimulado(datetime(2024, 6, 1, 12, 0))):
+        for conta in aleatorio.choices(contas, k=quantidade):
+            conta.historico.adicionar_transacao(
+                banco.Deposito(round(aleatorio.uniform(1, 500), 2)))
+
+
+def _iguais(vetorizadas, em_laco):
+    # Os totais podem diferir no último centavo pela ordem das somas.
+    return len(vetorizadas) == len(em_laco) and all(
+        a[:2] == b[:2] and a[2] == b[2] and a[5] == b[5]
+        and all(abs(x - y) <= 0.011 for x, y in zip(a[3:5] + a[6:],
+                                                     b[3:5] + b[6:]))
+        for a, b in zip(vetorizadas, em_laco))
+
+
+def main():
+    """
+    Executa o benchmark.
+    """
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clientes", type=int, default=10_000)
+    parser.add_argument("--transacoes", type=int, default=1_000_000)
+    parser.add_argument("--agencias", nargs="+",
+                        default=["0001", "0002", "0003"])
+    parser.add_argument("--dias", type=int, default=90)
+    parser.add_argument("--novas", type=int, default=10_000)
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--saida", help="arquivo JSON de resultados")
+    argumentos = parser.parse_args()
+
+    _, contas = popular_banco(
+        GeradorDados(argumentos.semente, agencias=tuple(argumentos.agencias),
+                     dias=argumentos.dias),
+        argumentos.clientes, argumentos.transacoes)
+
+    cache = CacheColunas()
+    inicio = time.perf_counter()
+    colunas_transacoes(contas, cache)
+    carga_fria = time.perf_counter() - inicio
+
+    acrescentar_transacoes(contas, argumentos.novas, argumentos.semente)
+    inicio = time.perf_counter()
+    codigos, colunas = colunas_transacoes(contas, cache)
+    carga = time.perf_counter() - inicio
+
+    resultados = {"carga_colunas_fria_s": carga_fria,
+                  "carga_colunas_aquecida_s": carga}
+    for periodo in ("dia", "mes"):
+        inicio = time.perf_counter()
+        vetorizadas = list(agregar(codigos, colunas, periodo))
+        vetorizada = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        em_laco = agregar_em_laco(contas, periodo)
+        laco = time.perf_counter() - inicio
+
+        if not _iguais(vetorizadas, em_laco):
+            raise RuntimeError(f"Relatório por {periodo} difere do laço.")
+        resultados[periodo] = {
+            "linhas": len(vetorizadas),
+            "agregacao_s": vetorizada,
+            "laco_python_s": laco,
+            "aceleracao_agregacao": laco / vetorizada,
+            "aceleracao_com_carga": laco / (vetorizada + carga),
+            "aceleracao_com_carga_fria": laco / (vetorizada + carga_fria),
+        }
+
+    gravar_json({
+        "metadados": metadados() | vars(argumentos),
+        "resultados": resultados,
+    }, argumentos.saida)
+
+
+if __name__ == "__main__":
+    main()
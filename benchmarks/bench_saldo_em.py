@@ -0,0 +1,112 @@
+"""
+Benchmark das consultas de saldo em um instante (Historico.saldo_em).
+
+Monta o histórico de uma conta com `--transacoes` transações, uma por
+minuto, e mede:
+
+    * a primeira consulta, que soma o histórico inteiro para criar os marcos
+      de saldo;
+    * as consultas seguintes, em instantes aleatórios (busca binária nos
+      marcos e no máximo INTERVALO_MARCOS_SALDO transações);
+    * a reprodução do histórico inteiro, como referência.
+
+Uma amostra das consultas é conferida contra a reprodução completa.
+
+Uso:
+    python benchmarks/bench_saldo_em.py --transacoes 2000000
+"""
+import argparse
+import random
+import time
+
+from comum import cronometrar, gravar_json, metadados
+
+import desafio_sistema_bancario as banco
+
+INICIO = 1_704_067_200.0  # 2024-01-01T00:00:00Z
+
+
+def montar_historico(numero_transacoes, semente):
+    """
+    Cria um histórico com depósitos e saques alternados ao acaso.
+
+    Returns:
+        Historico: Histórico montado.
+    """
+    aleatorio = random.Random(semente)
+    historico = banco.Historico()
+    historico.restaurar(
+        {"tipo": "Saque" if aleatorio.random() < 0.4 else "Deposito",
+         "valor": aleatorio.randint(1, 500),
+         "instante": INICIO + 60 * indice}
+        for indice in range(numero_transacoes))
+    return historico
+
+
+def reproduzir(historico, instante):
+    """
+    Calcula o saldo em um instante percorrendo o histórico inteiro.
+
+    Returns:
+        float | int: Saldo no instante.
+    """
+    saldo = 0
+    for transacao in historico.transacoes:
+        if transacao["instante"] > instante:
+            break
+        if transacao["tipo"] == "Saque":
+            saldo -= transacao["valor"]
+        else:
+            saldo += transacao["valor"]
+    return saldo
+
+
+def main():
+    """
+    Executa o benchmark.
+    """
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--transacoes", type=int, default=2_000_000)
+    parser.add_argument("--consultas", type=int, default=10_000)
+    parser.add_argument("--conferencias", type=int, default=20,
+                        help="consultas conferidas com a reprodução completa")
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--saida", help="arquivo JSON de resultados")
+    argumentos = parser.parse_args()
+
+    historico = montar_historico(argumentos.transacoes, argumentos.semente)
+    aleatorio = random.Random(argumentos.semente)
+    fim = INICIO + 60 * argumentos.transacoes
+    instantes = [(aleatorio.uniform(INICIO, fim),)
+                 for _ in range(argumentos.consultas)]
+
+    inicio = time.perf_counter()
+    historico.saldo_em(fim)
+    primeira = time.perf_counter() - inicio
+
+    consultas = cronometrar(historico.saldo_em, instantes)
+    reproducoes = cronometrar(
+        lambda instante: reproduzir(historico, instante),
+        instantes[:argumentos.conferencias])
+
+    divergentes = sum(
+        historico.saldo_em(instante) != reproduzir(historico, instante)
+        for instante, in instantes[:argumentos.conferencias])
+    if divergentes:
+        raise RuntimeError(f"{divergentes} consultas divergem da reprodução.")
+
+    gravar_json({
+        "metadados": metadados() | vars(argumentos) | {
+            "intervalo_marcos": banco.INTERVALO_MARCOS_SALDO},
+        "resultados": {
+            "primeira_consulta_s": primeira,
+            "consultas": consultas,
+            "reproducao_completa": reproducoes,
+        },
+    }, argumentos.saida)
+
+
+if __name__ == "__main__":
+    main()
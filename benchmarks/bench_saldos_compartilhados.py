@@ -0,0 +1,176 @@
+"""
+Benchmark da tabela de saldos em memória compartilhada
+(saldos_compartilhados.py).
+
+Publica `--contas` contas em uma `TabelaSaldos` e mede:
+
+    * o custo de `TabelaSaldos.publicar`, o observador de saldo registrado
+      pelo menu, a cada alteração de saldo;
+    * um processo leitor independente (outro interpretador, como
+      `python saldos_compartilhados.py`) fazendo `--consultas` consultas de
+      saldo e uma listagem completa, enquanto o escritor continua publicando
+      alterações.
+
+Ao final, confere os saldos lidos na listagem de um processo leitor com os
+publicados.
+
+Uso:
+    python benchmarks/bench_saldos_compartilhados.py --contas 1000000
+"""
+import argparse
+import json
+import random
+import subprocess
+import sys
+import time
+
+from comum import cronometrar, gravar_json, metadados
+
+from saldos_compartilhados import LeitorSaldos, TabelaSaldos
+
+
+class ContaSimulada:  # pylint: disable=too-few-public-methods
+    """
+    Conta mínima com os atributos lidos pela tabela.
+    """
+    __slots__ = ("agencia", "numero", "saldo")
+
+    def __init__(self, agencia, numero, saldo):
+        self.agencia = agencia
+        self.numero = numero
+        self.saldo = saldo
+
+
+def ler(nome, numero_contas, consultas, semente, conferir):
+    """
+    Lado leitor, executado em um processo separado: consulta saldos ao
+    acaso e lista a tabela, e imprime os resultados em JSON (com os saldos
+    listados, se `conferir`).
+    """
+    aleatorio = random.Random(semente)
+    leitor = LeitorSaldos(nome)
+    try:
+        consultadas = cronometrar(leitor.saldo, [
+            ("0001", aleatorio.randint(1, numero_contas))
+            for _ in range(consultas)])
+        inicio = time.perf_counter()
+        listadas = sum(1 for _ in leitor.listar())
+        listagem = time.perf_counter() - inicio
+        resultados = {
+            "consultas": consultadas,
+            "listagem_s": listagem,
+            "contas_listadas": listadas,
+        }
+        if conferir:
+            resultados["saldos"] = {numero: saldo
+                                    for _, numero, saldo in leitor.listar()}
+    finally:
+        leitor.fechar()
+    print(json.dumps(resultados))
+
+
+def executar_leitor(nome, argumentos, ao_aguardar=None):
+    """
+    Executa o leitor em outro interpretador.
+
+    Args:
+        ao_aguardar (function, optional): Chamada repetidamente enquanto o
+        leitor não termina. Sem ela, o leitor também devolve os saldos
+        listados (a saída só é lida ao final, então com ela deve ser
+        pequena).
+
+    Returns:
+        dict: Resultados impressos pelo leitor.
+    """
+    # pylint: disable-next=consider-using-with
+    processo = subprocess.Popen(
+        [sys.executable, __file__, "--leitor", nome,
+         "--contas", str(argumentos.contas),
+         "--consultas", str(argumentos.consultas),
+         "--semente", str(argumentos.semente)]
+        + ([] if ao_aguardar else ["--conferir"]),
+        stdout=subprocess.PIPE)
+    while ao_aguardar is not None and processo.poll() is None:
+        ao_aguardar()
+    saida, _ = processo.communicate()
+    if processo.returncode:
+        raise RuntimeError(f"Leitor terminou com código "
+                           f"{processo.returncode}.")
+    return json.loads(saida)
+
+
+def main():
+    """
+    Executa o benchmark.
+    """
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--contas", type=int, default=1_000_000)
+    parser.add_argument("--publicacoes", type=int, default=1_000_000)
+    parser.add_argument("--consultas", type=int, default=1_000_000)
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--saida", help="arquivo JSON de resultados")
+    parser.add_argument("--leitor", help=argparse.SUPPRESS)
+    parser.add_argument("--conferir", action="store_true",
+                        help=argparse.SUPPRESS)
+    argumentos = parser.parse_args()
+
+    if argumentos.leitor:
+        ler(argumentos.leitor, argumentos.contas, argumentos.consultas,
+            argumentos.semente, argumentos.conferir)
+        return
+
+    aleatorio = random.Random(argumentos.semente)
+    contas = [ContaSimulada("0001", numero, 0.0)
+              for numero in range(1, argumentos.contas + 1)]
+    tabela = TabelaSaldos(capacidade=argumentos.contas)
+    try:
+        inicio = time.perf_counter()
+        tabela.espelhar(contas)
+        espelhamento = time.perf_counter() - inicio
+
+        def alterar(conta, valor):
+            conta.saldo += valor
+            tabela.publicar(conta)
+
+        publicacoes = cronometrar(alterar, [
+            (aleatorio.choice(contas), aleatorio.randint(-500, 1000))
+            for _ in range(argumentos.publicacoes)])
+
+        publicadas_em_paralelo = 0
+
+        def publicar_ao_acaso():
+            nonlocal publicadas_em_paralelo
+            for _ in range(1000):
+                alterar(aleatorio.choice(contas), 1.0)
+            publicadas_em_paralelo += 1000
+
+        concorrente = executar_leitor(tabela.nome, argumentos,
+                                      publicar_ao_acaso)
+
+        # Sem escritas em andamento, a listagem do leitor deve conferir com
+        # os saldos publicados.
+        saldos = executar_leitor(tabela.nome, argumentos)["saldos"]
+        divergentes = sum(saldos.get(str(conta.numero)) != conta.saldo
+                          for conta in contas)
+    finally:
+        tabela.fechar()
+
+    gravar_json({
+        "metadados": metadados() | vars(argumentos),
+        "resultados": {
+            "espelhamento_s": espelhamento,
+            "publicar": publicacoes,
+            "leitor_com_escritas": concorrente,
+            "publicacoes_durante_leitura": publicadas_em_paralelo,
+            "saldos_divergentes": divergentes,
+        },
+    }, argumentos.saida)
+
+    if divergentes:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
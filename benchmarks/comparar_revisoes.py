@@ -0,0 +1,362 @@
+"""
+Comparação de desempenho entre as revisões do sistema bancário.
+
+Executa a mesma carga determinística (depósitos, saques e extratos sobre um
+conjunto de contas) em cada geração do sistema, chamando as funções centrais
+de cada uma com input() e print() substituídos, e imprime lado a lado a
+vazão, o pico de memória e os percentis de latência.
+
+Revisões comparadas:
+
+    v1        01-fundamentos_estrutura_de_dados/desafio-sistema-bancario.py
+    v2        01-fundamentos_estrutura_de_dados/desafio02-sistema_bancario.py
+    rev3      01-fundamentos_estrutura_de_dados/
+              desafio_sistema_bancario_rev3.py
+    poo_rev01 02-Programacao_Orientada_a_objetos/09-Desafio/
+              01_desafio_sistema_bancario_POO_rev01.py
+    poo       02-Programacao_Orientada_a_objetos/09-Desafio/
+              01_desafio_sistema_bancario_poo.py
+    decor     03-Decoradores_Iteradoes_Geradores/Desafio/
+              01_desafio_sistema_bancario.py
+    data_hora 04-Data_hora/Desafio/01_desafio_sistema_bancario.py
+    arquivos  05-Manipulacao_de_arquivos/Desafio/desafio_sistema_bancario.py
+
+A v1 não tem funções: o script inteiro é executado com as respostas do menu
+simuladas, e a latência de cada operação é o intervalo entre dois menus. A v1
+e a v2 têm uma única conta (estado em variáveis soltas), então toda a carga
+incide sobre ela.
+
+Uso:
+    python benchmarks/comparar_revisoes.py [--contas N] [--operacoes N]
+        [--saida resultados.json]
+"""
+import argparse
+import builtins
+import importlib.util
+import random
+import runpy
+import tempfile
+import time
+import tracemalloc
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from pathlib import Path
+
+from comum import REPO_PATH, gravar_json, metadados, percentil
+
+FUNDAMENTOS = REPO_PATH / "01-fundamentos_estrutura_de_dados"
+POO = REPO_PATH / "02-Programacao_Orientada_a_objetos" / "09-Desafio"
+
+
+def gerar_carga(numero_contas, numero_operacoes, semente):
+    """
+    Gera a carga determinística: 50% depósitos, 40% saques, 10% extratos.
+
+    Returns:
+        list: Tuplas (índice da conta, tipo, valor).
+    """
+    aleatorio = random.Random(semente)
+    carga = []
+    for _ in range(numero_operacoes):
+        sorteio = aleatorio.random()
+        tipo = ("deposito" if sorteio < 0.5
+                else "saque" if sorteio < 0.9 else "extrato")
+        carga.append((aleatorio.randrange(numero_contas), tipo,
+                      round(aleatorio.uniform(1, 600), 2)))
+    return carga
+
+
+def carregar_modulo(nome, caminho):
+    """
+    Importa um arquivo de revisão (os nomes têm hífens e não são pacotes).
+    """
+    especificacao = importlib.util.spec_from_file_location(nome, caminho)
+    modulo = importlib.util.module_from_spec(especificacao)
+    especificacao.loader.exec_module(modulo)
+    return modulo
+
+
+@contextmanager
+def terminal_simulado(entrada):
+    """
+    Substitui input() pela função informada e descarta os print().
+    """
+    entrada_original, saida_original = builtins.input, builtins.print
+    builtins.input = entrada
+    builtins.print = lambda *args, **kwargs: None
+    try:
+        yield
+    finally:
+        builtins.input, builtins.print = entrada_original, saida_original
+
+
+class Revisao(ABC):
+    """
+    Adaptador que aplica a carga às funções centrais de uma revisão.
+
+    Subclasses implementam `preparar` (cria as contas) e `aplicar` (executa
+    uma operação).
+    """
+
+    def __init__(self, nome, caminho):
+        self.nome = nome
+        self.caminho = caminho
+
+    @abstractmethod
+    def preparar(self, numero_contas):
+        """
+        Cria as contas usadas pela carga.
+        """
+
+    @abstractmethod
+    def aplicar(self, indice, tipo, valor):
+        """
+        Executa uma operação da carga.
+        """
+
+    def entrada(self, prompt=""):
+        return ""
+
+    def executar(self, carga):
+        """
+        Executa a carga e retorna a latência de cada operação (ns).
+        """
+        latencias = []
+        with terminal_simulado(self.entrada):
+            for indice, tipo, valor in carga:
+                inicio = time.perf_counter_ns()
+                self.aplicar(indice, tipo, valor)
+                latencias.append(time.perf_counter_ns() - inicio)
+        return latencias
+
+
+class RevisaoScript(Revisao):
+    """
+    v1: script sem funções, dirigido pelas respostas do menu.
+    """
+
+    def preparar(self, numero_contas):
+        pass
+
+    def aplicar(self, indice, tipo, valor):
+        """
+        Não usado: o script é executado inteiro por `executar`.
+        """
+
+    def executar(self, carga):
+        respostas = []
+        for _, tipo, valor in carga:
+            if tipo == "deposito":
+                respostas += [("d", True), (str(valor), False)]
+            elif tipo == "saque":
+                respostas += [("s", True), (str(valor), False)]
+            else:
+                respostas.append(("e", True))
+        respostas.append(("q", True))
+
+        proxima = iter(respostas)
+        marcas = []
+
+        def entrada(prompt=""):
+            resposta, inicia_operacao = next(proxima)
+            if inicia_operacao:
+                marcas.append(time.perf_counter_ns())
+            return resposta
+
+        with terminal_simulado(entrada):
+            runpy.run_path(str(self.caminho))
+
+        return [fim - inicio for inicio, fim in zip(marcas, marcas[1:])]
+
+
+class RevisaoFuncional(Revisao):
+    """
+    v2: funções puras sobre saldo e extrato em string.
+    """
+
+    def preparar(self, numero_contas):
+        self.modulo = carregar_modulo(self.nome, self.caminho)
+        self.saldo, self.extrato = 0, ""
+
+    def aplicar(self, indice, tipo, valor):
+        if tipo == "deposito":
+            self.saldo, self.extrato = self.modulo.depositar(
+                self.saldo, valor, self.extrato)
+        elif tipo == "saque":
+            self.saldo, self.extrato = self.modulo.sacar(
+                saldo=self.saldo, valor=valor, extrato=self.extrato,
+                limite=500, numero_saques=0, limite_saques=3)
+        else:
+            self.modulo.exibir_extrato(self.saldo, extrato=self.extrato)
+
+
+class RevisaoDicionarios(Revisao):
+    """
+    rev3: contas em dicionários com Decimal e extrato em string.
+
+    As funções reabrem o menu recursivamente ao terminar; o menu é
+    substituído por uma função vazia durante a medição.
+    """
+
+    def preparar(self, numero_contas):
+        self.modulo = carregar_modulo(self.nome, self.caminho)
+        self.modulo.menu_conta = lambda conta: None
+        self.modulo.menu_principal = lambda: None
+        self.contas = []
+        for indice in range(numero_contas):
+            usuario = {"nome": f"Cliente {indice}", "cpf": f"{indice:011d}",
+                       "data_nascimento": "01/01/1990", "endereco": "Rua A",
+                       "contas": []}
+            self.contas.append({
+                "agencia": self.modulo.AGENCIA,
+                "numero_conta": indice + 1,
+                "titular": usuario,
+                "saldo": self.modulo.Decimal(0.0),
+                "limite_saque": self.modulo.Decimal(500.0),
+                "numero_saques": 0,
+                "extrato": "",
+                "limite_saques_por_dia": 3,
+            })
+
+    def entrada(self, prompt=""):
+        # "Deseja continuar operando na conta?"
+        return "n"
+
+    def aplicar(self, indice, tipo, valor):
+        conta = self.contas[indice]
+        if tipo == "deposito":
+            self.modulo.depositar(conta, valor)
+        elif tipo == "saque":
+            self.modulo.sacar(conta, valor)
+        else:
+            self.modulo.exibir_extrato(conta)
+
+
+class RevisaoObjetos(Revisao):
+    """
+    Revisões orientadas a objetos (09-Desafio, 03, 04 e 05).
+    """
+
+    def preparar(self, numero_contas):
+        self.modulo = carregar_modulo(self.nome, self.caminho)
+        if hasattr(self.modulo, "ROOT_PATH"):
+            # A revisão 05 grava log.txt: redireciona para um temporário.
+            self._temporario = tempfile.TemporaryDirectory()
+            self.modulo.ROOT_PATH = Path(self._temporario.name)
+
+        self.clientes, self.contas = [], []
+        for indice in range(numero_contas):
+            cliente = self.modulo.PessoaFisica(
+                f"Cliente {indice}", 19900101, f"{indice:011d}", "Rua A")
+            conta = self.modulo.ContaCorrente.nova_conta(
+                cliente=cliente, numero=indice + 1)
+            cliente.adicionar_conta(conta)
+            self.clientes.append(cliente)
+            self.contas.append(conta)
+        self._cpf = ""
+
+    def entrada(self, prompt=""):
+        return self._cpf
+
+    def aplicar(self, indice, tipo, valor):
+        cliente, conta = self.clientes[indice], self.contas[indice]
+        if tipo == "deposito":
+            cliente.realizar_transacao(conta, self.modulo.Deposito(valor))
+        elif tipo == "saque":
+            cliente.realizar_transacao(conta, self.modulo.Saque(valor))
+        else:
+            self._cpf = cliente.cpf
+            self.modulo.exibir_extrato([cliente])
+
+
+REVISOES = [
+    RevisaoScript("v1", FUNDAMENTOS / "desafio-sistema-bancario.py"),
+    RevisaoFuncional("v2", FUNDAMENTOS / "desafio02-sistema_bancario.py"),
+    RevisaoDicionarios(
+        "rev3", FUNDAMENTOS / "desafio_sistema_bancario_rev3.py"),
+    RevisaoObjetos(
+        "poo_rev01", POO / "01_desafio_sistema_bancario_POO_rev01.py"),
+    RevisaoObjetos("poo", POO / "01_desafio_sistema_bancario_poo.py"),
+    RevisaoObjetos("decor", REPO_PATH / "03-Decoradores_Iteradoes_Geradores"
+                   / "Desafio" / "01_desafio_sistema_bancario.py"),
+    RevisaoObjetos("data_hora", REPO_PATH / "04-Data_hora" / "Desafio"
+                   / "01_desafio_sistema_bancario.py"),
+    RevisaoObjetos("arquivos", REPO_PATH / "05-Manipulacao_de_arquivos"
+                   / "Desafio" / "desafio_sistema_bancario.py"),
+]
+
+
+def medir(revisao, numero_contas, carga):
+    """
+    Mede uma revisão: uma passada cronometrada e outra com tracemalloc.
+
+    Returns:
+        dict: Vazão, percentis de latência e pico de memória.
+    """
+    revisao.preparar(numero_contas)
+    inicio = time.perf_counter()
+    latencias = revisao.executar(carga)
+    duracao = time.perf_counter() - inicio
+
+    tracemalloc.start()
+    revisao.preparar(numero_contas)
+    revisao.executar(carga)
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    latencias.sort()
+    return {
+        "ops_por_segundo": len(carga) / duracao,
+        "p50_ns": percentil(latencias, 0.50),
+        "p90_ns": percentil(latencias, 0.90),
+        "p99_ns": percentil(latencias, 0.99),
+        "pico_memoria_bytes": pico,
+    }
+
+
+def main():
+    """
+    Executa a comparação e imprime a tabela de resultados.
+    """
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--contas", type=int, default=1000)
+    parser.add_argument("--operacoes", type=int, default=20_000)
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--revisoes", help="nomes separados por vírgula")
+    parser.add_argument("--saida", help="arquivo JSON de resultados")
+    argumentos = parser.parse_args()
+
+    carga = gerar_carga(argumentos.contas, argumentos.operacoes,
+                        argumentos.semente)
+    selecionadas = (argumentos.revisoes.split(",") if argumentos.revisoes
+                    else [revisao.nome for revisao in REVISOES])
+
+    resultados = {}
+    print(f"{'revisão':<12}{'ops/s':>12}{'p50 µs':>10}{'p90 µs':>10}"
+          f"{'p99 µs':>10}{'pico MiB':>10}")
+    for revisao in REVISOES:
+        if revisao.nome not in selecionadas:
+            continue
+        metricas = medir(revisao, argumentos.contas, carga)
+        resultados[revisao.nome] = metricas
+        print(f"{revisao.nome:<12}{metricas['ops_por_segundo']:>12,.0f}"
+              f"{metricas['p50_ns'] / 1000:>10.1f}"
+              f"{metricas['p90_ns'] / 1000:>10.1f}"
+              f"{metricas['p99_ns'] / 1000:>10.1f}"
+              f"{metricas['pico_memoria_bytes'] / 2**20:>10.2f}")
+
+    if argumentos.saida:
+        gravar_json({
+            "metadados": metadados() | {
+                "contas": argumentos.contas,
+                "operacoes": argumentos.operacoes,
+                "semente": argumentos.semente,
+            },
+            "resultados": resultados,
+        }, argumentos.saida)
+
+
+if __name__ == "__main__":
+    main()
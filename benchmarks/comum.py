@@ -0,0 +1,111 @@
+"""
+Utilitários compartilhados pelos benchmarks.
+
+Os módulos do sistema bancário ficam em diretórios de lições que não são
+pacotes Python; importar este módulo adiciona o diretório da revisão atual
+(05-Manipulacao_de_arquivos/Desafio) ao `sys.path`.
+"""
+import json
+import os
+import platform
+import sys
+import time
+from contextlib import contextmanager, redirect_stdout
+from datetime import datetime
+from pathlib import Path
+
+REPO_PATH = Path(__file__).resolve().parent.parent
+DESAFIO_PATH = REPO_PATH / "05-Manipulacao_de_arquivos" / "Desafio"
+
+if str(DESAFIO_PATH) not in sys.path:
+    sys.path.insert(0, str(DESAFIO_PATH))
+
+
+@contextmanager
+def silenciar_saida():
+    """
+    Descarta as mensagens impressas pelo domínio durante a medição.
+    """
+    with open(os.devnull, "w", encoding="utf-8") as nulo:
+        with redirect_stdout(nulo):
+            yield
+
+
+def percentil(valores_ordenados, fracao):
+    """
+    Retorna o percentil de uma lista já ordenada (método do vizinho mais
+    próximo).
+
+    Args:
+        valores_ordenados (list): Valores em ordem crescente.
+        fracao (float): Percentil entre 0 e 1 (por exemplo, 0.99).
+
+    Returns:
+        O valor do percentil, ou 0 se a lista estiver vazia.
+    """
+    if not valores_ordenados:
+        return 0
+    posicao = min(len(valores_ordenados) - 1,
+                  int(fracao * len(valores_ordenados)))
+    return valores_ordenados[posicao]
+
+
+def cronometrar(funcao, chamadas):
+    """
+    Mede a latência de cada chamada de `funcao`.
+
+    Args:
+        funcao (function): Função medida.
+        chamadas (iterable): Tuplas de argumentos, uma por chamada.
+
+    Returns:
+        dict: Número de chamadas, média, p50, p90, p99 e máximo (em
+        nanossegundos) e vazão em operações por segundo.
+    """
+    tempos = []
+    for argumentos in chamadas:
+        inicio = time.perf_counter_ns()
+        funcao(*argumentos)
+        tempos.append(time.perf_counter_ns() - inicio)
+
+    tempos.sort()
+    total = sum(tempos)
+    return {
+        "chamadas": len(tempos),
+        "media_ns": total / len(tempos) if tempos else 0,
+        "p50_ns": percentil(tempos, 0.50),
+        "p90_ns": percentil(tempos, 0.90),
+        "p99_ns": percentil(tempos, 0.99),
+        "max_ns": tempos[-1] if tempos else 0,
+        "ops_por_segundo": len(tempos) / (total / 1e9) if total else 0,
+    }
+
+
+def metadados():
+    """
+    Descreve o ambiente da execução, para acompanhar os resultados em JSON.
+
+    Returns:
+        dict: Versão do Python, plataforma, núcleos e data da execução.
+    """
+    return {
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "nucleos": os.cpu_count(),
+        "data": datetime.now().isoformat(timespec="seconds"),
+    }
+
+
+def gravar_json(resultados, caminho=None):
+    """
+    Grava os resultados em JSON no arquivo informado, ou na saída padrão.
+
+    Args:
+        resultados (dict): Resultados do benchmark.
+        caminho (str, optional): Arquivo de destino.
+    """
+    texto = json.dumps(resultados, ensure_ascii=False, indent=2)
+    if caminho:
+        Path(caminho).write_text(texto + "\n", encoding="utf-8")
+    else:
+        print(texto)
@@ -0,0 +1,128 @@
+"""
+Simulação do limite diário de transações com relógio simulado.
+
+Cria as contas e, para cada dia simulado, faz `--tentativas` transações em
+uma fração das contas por meio de Cliente.realizar_transacao, alternando
+depósito e saque (um depósito seguido de um saque do mesmo valor). Em cada
+conta-dia, exatamente as duas primeiras transações devem ser aceitas e as
+demais recusadas; na virada do dia os limites, inclusive o de saques diários da
+conta corrente, devem ser liberados. O relógio é um `RelogioSimulado`,
+avançado um dia por vez, sem esperar meias-noites reais.
+
+Por padrão, só 1% das contas transaciona a cada dia (`--fracao-ativa`), para
+que um ano de 100 mil contas rode em segundos; a fração, as contas ativas por
+dia e o total de contas-dia verificadas saem nos resultados, junto com a
+vazão.
+
+Termina com código 1 se alguma conta-dia violar o limite.
+
+Uso:
+    python benchmarks/simular_limite_diario.py --contas 100000 --dias 365
+"""
+import argparse
+import random
+import sys
+import time
+from datetime import datetime
+
+from comum import gravar_json, metadados, silenciar_saida
+
+import desafio_sistema_bancario as banco
+from relogio import RelogioSimulado, usando_relogio
+
+LIMITE_DIARIO = 2
+
+
+def criar_contas(numero_contas):
+    """
+    Cria um cliente com uma conta corrente para cada conta simulada.
+
+    Returns:
+        list: Pares (cliente, conta).
+    """
+    pares = []
+    for indice in range(numero_contas):
+        cliente = banco.PessoaFisica(f"Cliente {indice}", "01-01-1990",
+                                     f"{indice:011d}", "Rua A, 1")
+        conta = banco.ContaCorrente.nova_conta(cliente, indice + 1)
+        cliente.adicionar_conta(conta)
+        pares.append((cliente, conta))
+    return pares
+
+
+def simular(pares, dias, tentativas, fracao_ativa, semente):
+    """
+    Executa a simulação.
+
+    Returns:
+        dict: Totais de transações aceitas, recusadas e violações do
+        limite, e as contas-dia verificadas.
+    """
+    aleatorio = random.Random(semente)
+    relogio = RelogioSimulado(datetime(2024, 1, 1, 9, 0))
+    ativas_por_dia = max(1, int(len(pares) * fracao_ativa))
+    aceitas = recusadas = violacoes = 0
+    esperados = [tentativa < LIMITE_DIARIO for tentativa in range(tentativas)]
+
+    with usando_relogio(relogio), silenciar_saida():
+        for _ in range(dias):
+            for cliente, conta in aleatorio.sample(pares, ativas_por_dia):
+                resultados = [
+                    bool(cliente.realizar_transacao(
+                        conta, banco.Saque(10) if tentativa % 2
+                        else banco.Deposito(10)))
+                    for tentativa in range(tentativas)]
+                aceitas_no_dia = sum(resultados)
+                aceitas += aceitas_no_dia
+                recusadas += tentativas - aceitas_no_dia
+                violacoes += resultados != esperados
+            relogio.avancar(dias=1)
+
+    return {"aceitas": aceitas, "recusadas": recusadas,
+            "violacoes": violacoes, "contas_ativas_por_dia": ativas_por_dia,
+            "contas_dias": ativas_por_dia * dias}
+
+
+def main():
+    """
+    Executa a simulação e verifica o limite diário.
+    """
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--contas", type=int, default=100_000)
+    parser.add_argument("--dias", type=int, default=365)
+    parser.add_argument("--tentativas", type=int, default=3,
+                        help="transações tentadas por conta ativa no dia")
+    parser.add_argument("--fracao-ativa", type=float, default=0.01,
+                        help="fração das contas que transaciona a cada dia")
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--saida", help="arquivo JSON de resultados")
+    argumentos = parser.parse_args()
+
+    inicio = time.perf_counter()
+    pares = criar_contas(argumentos.contas)
+    criacao = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    totais = simular(pares, argumentos.dias, argumentos.tentativas,
+                     argumentos.fracao_ativa, argumentos.semente)
+    duracao = time.perf_counter() - inicio
+    transacoes = totais["aceitas"] + totais["recusadas"]
+
+    gravar_json({
+        "metadados": metadados() | vars(argumentos),
+        "resultados": totais | {
+            "fracao_ativa": argumentos.fracao_ativa,
+            "criacao_contas_s": criacao,
+            "simulacao_s": duracao,
+            "transacoes_por_segundo": transacoes / duracao if duracao else 0,
+        },
+    }, argumentos.saida)
+
+    if totais["violacoes"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+Simulação de um reinício do sistema bancário (desafio_sistema_bancario
+.gravar_banco e .carregar_banco).
+
+Cria `--clientes` clientes com uma conta corrente cada, em `--agencias`
+agências, e registra transações por `--dias` dias simulados com o log de
+eventos ligado. Grava os clientes e os snapshots das agências e, depois do
+snapshot, registra mais um dia de transações (como se o processo caísse
+antes de gravar de novo). Em seguida recarrega o banco do disco e confere,
+para cada conta, o saldo e os contadores do dia e, para cada cliente, a
+posição consolidada.
+
+Termina com código 1 se algum valor não sobreviver ao reinício.
+
+Uso:
+    python benchmarks/simular_reinicio.py --clientes 10000 --dias 30
+"""
+import argparse
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from comum import gravar_json, metadados, silenciar_saida
+
+import desafio_sistema_bancario as banco
+from agencias import Agencia
+from fonte_eventos import LogEventos
+from relogio import RelogioSimulado, usando_relogio
+
+
+def criar_banco(numero_clientes, codigos, diretorio):
+    """
+    Cria os clientes, um por conta, distribuídos entre as agências.
+
+    Returns:
+        tuple: (clientes, agencias).
+    """
+    agencias = {codigo: Agencia(codigo, diretorio) for codigo in codigos}
+    clientes = []
+    for indice in range(numero_clientes):
+        cliente = banco.PessoaFisica(f"Cliente {indice}", "01-01-1990",
+                                     f"{indice:011d}", "Rua A, 1")
+        conta = agencias[codigos[indice % len(codigos)]].abrir_conta(
+            cliente, banco.ContaCorrente)
+        cliente.adicionar_conta(conta)
+        clientes.append(cliente)
+    return clientes, agencias
+
+
+def movimentar(clientes, relogio, dias, aleatorio):
+    """
+    Registra até duas transações por cliente em cada dia simulado.
+    """
+    for _ in range(dias):
+        relogio.avancar(dias=1)
+        for cliente in clientes:
+            conta = cliente.contas[0]
+            for _ in range(aleatorio.randint(0, 2)):
+                valor = round(aleatorio.uniform(1, 300), 2)
+                transacao = (banco.Saque(valor) if aleatorio.random() < 0.4
+                             else banco.Deposito(valor))
+                cliente.realizar_transacao(conta, transacao)
+
+
+def estado(clientes):
+    """
+    Resume o estado observável das contas e dos clientes.
+
+    Returns:
+        dict: Saldo e contadores do dia de cada conta e posição de cada
+        cliente, indexados por CPF.
+    """
+    resumo = {}
+    for cliente in clientes:
+        conta = cliente.contas[0]
+        uso = conta.historico.uso_do_dia()
+        resumo[cliente.cpf] = (
+            round(conta.saldo, 2), uso.quantidade, uso.saques_quantidade,
+            round(uso.depositos, 2), round(uso.saques, 2),
+            round(cliente.posicao_consolidada()["saldo_total"], 2))
+    return resumo
+
+
+def main():
+    """
+    Executa a simulação.
+    """
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clientes", type=int, default=10_000)
+    parser.add_argument("--agencias", nargs="+",
+                        default=["0001", "0002", "0003"])
+    parser.add_argument("--dias", type=int, default=30)
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--saida", help="arquivo JSON de resultados")
+    argumentos = parser.parse_args()
+
+    aleatorio = random.Random(argumentos.semente)
+    relogio = RelogioSimulado(datetime(2024, 1, 1, 9, 0))
+    with tempfile.TemporaryDirectory() as temporario, \
+            usando_relogio(relogio), silenciar_saida():
+        diretorio = Path(temporario) / "agencias"
+        diretorio_eventos = Path(temporario) / "eventos"
+        log_eventos = LogEventos(diretorio_eventos)
+        banco.Transacao.observadores_registro.append(log_eventos)
+        try:
+            clientes, agencias = criar_banco(
+                argumentos.clientes, argumentos.agencias, diretorio)
+            movimentar(clientes, relogio, argumentos.dias, aleatorio)
+            banco.gravar_banco(clientes, agencias, diretorio)
+            # Transações depois do último snapshot: só o log as conhece.
+            movimentar(clientes, relogio, 1, aleatorio)
+        finally:
+            banco.Transacao.observadores_registro.remove(log_eventos)
+            log_eventos.fechar()
+        esperado = estado(clientes)
+
+        inicio = time.perf_counter()
+        clientes, agencias = banco.carregar_banco(diretorio,
+                                                  diretorio_eventos)
+        carga = time.perf_counter() - inicio
+        obtido = estado(clientes)
+
+    divergentes = sum(esperado[cpf] != obtido.get(cpf) for cpf in esperado)
+    gravar_json({
+        "metadados": metadados() | vars(argumentos),
+        "resultados": {
+            "clientes_recarregados": len(obtido),
+            "contas_recarregadas": sum(map(len, agencias.values())),
+            "divergentes": divergentes,
+            "carga_s": carga,
+        },
+    }, argumentos.saida)
+
+    if divergentes or len(obtido) != len(esperado):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()